@@ -1,10 +1,17 @@
 import streamlit as st
 import time
+import queue
+import uuid
+import weakref
 from datetime import datetime
 from config import Config
 from core.brain import JarvisBrain
-from core.voice import VoiceInterface
+from core.resources import get_voice, shared, release_shared
+from core.sessions import SESSION_ID
+from core.turns import TurnExecutor
+from core.tts_worker import PRIORITY_URGENT, PRIORITY_LOW
 from core.personality import JarvisPersonality
+from utils.transcript import Transcript
 
 # Page configuration
 st.set_page_config(
@@ -62,13 +69,126 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def message_html(message):
+    """Build the HTML for one chat message in the JARVIS style"""
+    role_class = "user-message" if message['role'] == 'user' else "assistant-message"
+    role_icon = "👤" if message['role'] == 'user' else "🤖"
+    
+    return f"""
+    <div class="chat-message {role_class}">
+        <strong>{role_icon} {message['role'].title()}</strong>
+        <small style="color: #888;">({message['timestamp'].strftime('%H:%M:%S')})</small>
+        <p>{message['content']}</p>
+    </div>
+    """
+
+def sentence_speaker(voice):
+    """Speak each finished sentence of a reply, cutting off any earlier reply with the first"""
+    barge_in = [True]
+    
+    def speak(sentence):
+        voice.speak(sentence, async_mode=True, barge_in=barge_in[0])
+        barge_in[0] = False
+    
+    return speak
+
+def browser_session_id() -> str:
+    """The conversation id for this browser session
+    
+    Each browser session gets its own conversation, kept in the page URL
+    (?session=...) so a reload resumes it; with APP_SHARED_SESSION every
+    tab continues the one Config.SESSION_ID conversation instead.
+    """
+    if Config.APP_SHARED_SESSION:
+        return Config.SESSION_ID
+    session_id = st.experimental_get_query_params().get('session', [''])[0]
+    if not SESSION_ID.fullmatch(session_id):
+        session_id = uuid.uuid4().hex
+        st.experimental_set_query_params(session=session_id)
+    return session_id
+
+class TabLifetime:
+    """Kept only in st.session_state, so it is collected when Streamlit drops the browser session"""
+
+def close_tab(jarvis, turns, voice, handle_voice_command):
+    """Release what one browser session held: its turns, listeners and scheduler reference"""
+    turns.shutdown()
+    voice.stop_hands_free(handle_voice_command)
+    unregister_voice = release_shared(f'reminder_voice:{jarvis.session_id}')
+    if unregister_voice is not None:
+        unregister_voice()
+    jarvis.close()
+
 # Initialize session state
 if 'jarvis' not in st.session_state:
     try:
         Config.validate()
-        st.session_state.jarvis = JarvisBrain()
-        st.session_state.voice = VoiceInterface()
-        st.session_state.messages = []
+        # One conversation (history, memory and reminders) per browser session
+        st.session_state.jarvis = JarvisBrain(session_id=browser_session_id())
+        # One voice for the whole process (there is one set of speakers and one
+        # microphone); the engine and recognizer load on first use
+        st.session_state.voice = get_voice()
+        # Turns and voice capture run off the script thread, so reruns never block on them
+        st.session_state.turns = TurnExecutor(st.session_state.jarvis)
+        st.session_state.pending_turns = []
+        st.session_state.listening = None
+        # Keep a capped, pre-rendered transcript; older pages come back from the memory store
+        memory = st.session_state.jarvis.memory
+        st.session_state.messages = Transcript(
+            message_html,
+            limit=Config.UI_TRANSCRIPT_LIMIT,
+            page_size=Config.UI_PAGE_SIZE,
+            archive=(
+                lambda before, count: memory.store.get_messages(memory.session_id, before=before, limit=count)
+            ) if memory.store is not None else None
+        )
+        # Pick up where the persisted conversation left off
+        st.session_state.messages.extend(
+            {
+                'role': message.role,
+                'content': message.content,
+                'timestamp': datetime.fromtimestamp(message.created)
+            }
+            for message in memory.conversation_history
+        )
+        
+        # Reminders and hands-free turns happen on background threads;
+        # their messages are queued here and shown on the next run
+        inbox = queue.Queue()
+        jarvis = st.session_state.jarvis
+        voice = st.session_state.voice
+        turns = st.session_state.turns
+        
+        def deliver_reminder(text, task):
+            inbox.put({'role': 'assistant', 'content': f"⏰ {text}", 'timestamp': datetime.now()})
+        
+        def speak_reminder(text, task):
+            if Config.VOICE_ENABLED:
+                voice.speak(text, async_mode=True, priority=PRIORITY_URGENT)
+        
+        def register_reminder_voice():
+            # On the scheduler itself, so the voice outlives the tab that registered it
+            scheduler, personality = jarvis.scheduler, jarvis.personality
+            listener = lambda task: speak_reminder(personality.reminder(task['description']), task)
+            scheduler.add_listener(listener)
+            return lambda: scheduler.remove_listener(listener)
+        
+        def handle_voice_command(text):
+            # Queued behind any typed turn, so the brain only ever handles one at a time
+            inbox.put({'role': 'user', 'content': text, 'timestamp': datetime.now()})
+            turn = turns.submit(text, on_sentence=sentence_speaker(voice))
+            turn.wait()
+            if turn.text:
+                inbox.put({'role': 'assistant', 'content': turn.text, 'timestamp': datetime.now()})
+        
+        # Each tab shows the reminder; the shared voice says it once per conversation,
+        # however many tabs have it open
+        jarvis.on_reminder(deliver_reminder)
+        shared(f'reminder_voice:{jarvis.session_id}', register_reminder_voice)
+        st.session_state.inbox = inbox
+        st.session_state.handle_voice_command = handle_voice_command
+        st.session_state.lifetime = TabLifetime()
+        weakref.finalize(st.session_state.lifetime, close_tab, jarvis, turns, voice, handle_voice_command)
         st.session_state.initialized = True
     except ValueError as e:
         st.session_state.initialized = False
@@ -86,12 +206,23 @@ with st.sidebar:
         voice_enabled = st.checkbox("Enable Voice", value=Config.VOICE_ENABLED)
         
         if voice_enabled:
-            if st.button("🎙️ Voice Input"):
-                with st.spinner("Listening..."):
-                    text = st.session_state.voice.listen()
-                    if text:
-                        st.session_state.voice_input = text
-                        st.rerun()
+            speech_stats = st.session_state.voice.get_metrics()
+            st.caption(
+                f"Speech queue: {speech_stats['queue_depth']} | "
+                f"latency p50: {speech_stats.get('latency_p50_ms', 0):.0f} ms"
+            )
+            hands_free = st.toggle(
+                "👂 Hands-free",
+                help=f"Listen continuously; start commands with \"{', '.join(Config.LISTEN_WAKE_WORDS) or 'anything'}\""
+            )
+            if hands_free:
+                if not st.session_state.voice.start_hands_free(st.session_state.handle_voice_command):
+                    st.warning("Hands-free listening needs a microphone and speech recognition")
+            else:
+                st.session_state.voice.stop_hands_free(st.session_state.handle_voice_command)
+            
+            if st.button("🎙️ Voice Input", disabled=st.session_state.listening is not None):
+                st.session_state.listening = st.session_state.turns.run_blocking(st.session_state.voice.listen)
         
         # Memory stats
         st.subheader("🧠 Memory Status")
@@ -110,7 +241,9 @@ with st.sidebar:
         
         # Clear conversation
         if st.button("🗑️ Clear Conversation"):
-            st.session_state.messages = []
+            st.session_state.turns.cancel_all()
+            st.session_state.pending_turns = []
+            st.session_state.messages.clear()
             st.session_state.jarvis.memory.clear()
             st.rerun()
     
@@ -140,22 +273,43 @@ if not st.session_state.messages:
         'timestamp': datetime.now()
     })
     if Config.VOICE_ENABLED:
-        st.session_state.voice.speak(greeting, async_mode=True)
+        st.session_state.voice.speak(greeting, async_mode=True, priority=PRIORITY_LOW)
+
+# Show reminders and hands-free turns from since the last run
+while not st.session_state.inbox.empty():
+    st.session_state.messages.append(st.session_state.inbox.get_nowait())
+
+# Move finished turns into the transcript, in the order they were sent
+while st.session_state.pending_turns and st.session_state.pending_turns[0]['turn'].done:
+    entry = st.session_state.pending_turns.pop(0)
+    turn = entry['turn']
+    st.session_state.messages.append(entry['user'])
+    if turn.status == 'error':
+        content = f"❌ {turn.error}"
+    elif turn.status == 'cancelled':
+        content = f"{turn.text} …" if turn.text else ''
+    else:
+        content = turn.text
+    if content:
+        st.session_state.messages.append({
+            'role': 'assistant',
+            'content': content,
+            'timestamp': datetime.fromtimestamp(turn.finished)
+        })
 
 # Display chat messages
 chat_container = st.container()
 with chat_container:
-    for message in st.session_state.messages:
-        role_class = "user-message" if message['role'] == 'user' else "assistant-message"
-        role_icon = "👤" if message['role'] == 'user' else "🤖"
-        
-        st.markdown(f"""
-        <div class="chat-message {role_class}">
-            <strong>{role_icon} {message['role'].title()}</strong> 
-            <small style="color: #888;">({message['timestamp'].strftime('%H:%M:%S')})</small>
-            <p>{message['content']}</p>
-        </div>
-        """, unsafe_allow_html=True)
+    if st.session_state.messages.has_earlier and st.button("⬆️ Show earlier messages"):
+        st.session_state.messages.show_earlier()
+    # One block for the whole page of history, built from each message's cached HTML
+    st.markdown(st.session_state.messages.html(), unsafe_allow_html=True)
+    
+    # Turns still being answered, refreshed by the poll loop below
+    reply_placeholders = []
+    for entry in st.session_state.pending_turns:
+        st.markdown(message_html(entry['user']), unsafe_allow_html=True)
+        reply_placeholders.append((entry, st.empty()))
 
 # Proactive suggestions
 suggestion = st.session_state.jarvis.get_proactive_suggestions()
@@ -163,50 +317,45 @@ if suggestion and len(st.session_state.messages) > 2:
     with st.expander("💡 Proactive Suggestion"):
         st.info(suggestion)
 
-# Input area
+# Input area; st.chat_input pins itself to the bottom and can't sit inside columns
+user_input = st.chat_input("Speak to JARVIS...")
 col1, col2 = st.columns([6, 1])
 
 with col1:
-    # Check for voice input
-    user_input = st.session_state.get('voice_input', '')
-    if user_input:
-        st.session_state.pop('voice_input')
-    else:
-        user_input = st.chat_input("Speak to JARVIS...")
+    # Check for voice input captured in the background
+    listening = st.session_state.listening
+    if listening is not None and listening.done():
+        st.session_state.listening = None
+        try:
+            user_input = listening.result() or user_input
+        except Exception as e:
+            st.warning(f"🎤 {e}")
+    elif listening is not None:
+        st.caption("🎤 Listening...")
 
 with col2:
     if Config.VOICE_ENABLED:
-        if st.button("🎤", help="Voice Input"):
-            with st.spinner("Listening..."):
-                text = st.session_state.voice.listen()
-                if text:
-                    user_input = text
+        if st.button("🎤", help="Voice Input", disabled=st.session_state.listening is not None):
+            st.session_state.listening = st.session_state.turns.run_blocking(st.session_state.voice.listen)
+            st.rerun()
+    if st.session_state.pending_turns and st.button("⏹️", help="Stop"):
+        st.session_state.turns.cancel_all()
+        st.session_state.voice.stop()
+        st.rerun()
 
 # Process input
 if user_input:
-    # Add user message
-    st.session_state.messages.append({
-        'role': 'user',
-        'content': user_input,
-        'timestamp': datetime.now()
+    # Hand the message to the background executor; it is sent exactly once,
+    # and this and later runs only watch its progress
+    turn = st.session_state.turns.submit(
+        user_input,
+        on_sentence=sentence_speaker(st.session_state.voice) if Config.VOICE_ENABLED else None
+    )
+    st.session_state.pending_turns.append({
+        'turn': turn,
+        'user': {'role': 'user', 'content': user_input, 'timestamp': datetime.now()},
+        'thinking': JarvisPersonality.thinking()
     })
-    
-    # Show thinking indicator
-    with st.spinner(JarvisPersonality.thinking()):
-        # Process with JARVIS brain
-        response = st.session_state.jarvis.process_message(user_input)
-        
-        # Add assistant response
-        st.session_state.messages.append({
-            'role': 'assistant',
-            'content': response['message'],
-            'timestamp': datetime.now()
-        })
-        
-        # Speak response if voice enabled
-        if Config.VOICE_ENABLED:
-            st.session_state.voice.speak(response['message'], async_mode=True)
-    
     st.rerun()
 
 # Footer
@@ -215,4 +364,20 @@ st.markdown("""
 <div style='text-align: center; color: #888;'>
     <small>JARVIS v1.0 | Powered by Bhindi AI | Created with ❤️</small>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Poll background work until something finishes; any interaction interrupts
+# this loop with a fresh run, which picks the same turns up again
+if st.session_state.pending_turns or st.session_state.listening is not None:
+    while True:
+        for entry, placeholder in reply_placeholders:
+            turn = entry['turn']
+            placeholder.markdown(message_html({
+                'role': 'assistant',
+                'content': turn.text or (entry['thinking'] if turn.status == 'running' else "⏳ Queued..."),
+                'timestamp': datetime.fromtimestamp(turn.started or turn.submitted)
+            }), unsafe_allow_html=True)
+        listening = st.session_state.listening
+        if any(entry['turn'].done for entry in st.session_state.pending_turns) or (listening is not None and listening.done()):
+            st.rerun()
+        time.sleep(0.1)
\ No newline at end of file
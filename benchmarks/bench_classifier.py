@@ -0,0 +1,81 @@
+"""Compare the compiled classifier with the previous keyword scans
+
+Usage: python benchmarks/bench_classifier.py [utterances] [workers]
+"""
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import classify_message, classify_batch
+
+TEMPLATES = [
+    "Remind me to {x} at {h} pm",
+    "Search for {x}",
+    "What is the weather like in {x}?",
+    "What time is it in {x}",
+    "Schedule a meeting about {x} tomorrow",
+    "Tell me about {x}",
+    "Send mail to {x} about the report",
+    "Please calculate {h} times {h}",
+    "Run the {x} backup now",
+    "I had a long day working on {x}",
+]
+TOPICS = ['quantum computing', 'paris', 'the budget', 'mom', 'python tutorials', 'the launch', 'bob']
+
+def legacy_classify(message: str):
+    """Previous detect_intent + extract_agent_needed, kept for comparison"""
+    message_lower = message.lower()
+    intents = {
+        'schedule': ['remind', 'schedule', 'set alarm', 'wake me', 'meeting'],
+        'search': ['search', 'find', 'look up', 'what is', 'who is', 'google'],
+        'weather': ['weather', 'temperature', 'forecast'],
+        'time': ['time', 'date', 'what day'],
+        'task': ['do', 'execute', 'perform', 'run', 'create'],
+        'question': ['?', 'how', 'why', 'when', 'where', 'what', 'who'],
+    }
+    intent = 'general'
+    for name, keywords in intents.items():
+        if any(keyword in message_lower for keyword in keywords):
+            intent = name
+            break
+    
+    message_lower = message.lower()
+    agent_keywords = {
+        'perplexity': ['search', 'find', 'look up', 'google'],
+        'bhindi-scheduler-v2': ['remind', 'schedule', 'alarm', 'meeting'],
+        'open-weather': ['weather', 'temperature', 'forecast'],
+        'google-gmail': ['email', 'send mail', 'gmail'],
+        'calculator': ['calculate', 'math', 'compute'],
+        'time': ['time', 'date', 'timezone'],
+    }
+    agents = [a for a, keywords in agent_keywords.items() if any(k in message_lower for k in keywords)]
+    return intent, agents
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(42)
+    corpus = [
+        rng.choice(TEMPLATES).format(x=rng.choice(TOPICS), h=rng.randint(1, 12))
+        for _ in range(count)
+    ]
+    
+    for name, classify in [('legacy', legacy_classify), ('compiled', classify_message)]:
+        start = time.perf_counter()
+        for message in corpus:
+            classify(message)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>9}: {elapsed:.2f}s for {count} utterances "
+              f"({count / elapsed:,.0f}/s, {elapsed / count * 1e6:.2f}us each)")
+    
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    start = time.perf_counter()
+    classify_batch(corpus, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"{'batch':>9}: {elapsed:.2f}s for {count} utterances incl. time parsing "
+          f"({count / elapsed:,.0f}/s, workers={workers})")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
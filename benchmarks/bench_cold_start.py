@@ -0,0 +1,79 @@
+"""Measure cold start: time to the first rendered page of app.py in a fresh process
+
+Each trial runs in a new interpreter, so imports are counted. The page is
+rendered with Streamlit's AppTest; component timings show what a new
+browser session pays before anything is drawn.
+
+Usage: python benchmarks/bench_cold_start.py [trials]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Prefixes the trial's result line; other output (e.g. speech engine errors) can follow it
+MARKER = 'COLD_START_RESULT '
+
+TRIAL = """
+import json, sys, time
+start = time.perf_counter()
+timings = {}
+sys.path.insert(0, ROOT)
+
+t = time.perf_counter()
+from core.brain import JarvisBrain
+from core.voice import VoiceInterface
+timings['import'] = time.perf_counter() - t
+
+t = time.perf_counter()
+JarvisBrain()
+timings['brain'] = time.perf_counter() - t
+
+t = time.perf_counter()
+voice = VoiceInterface()
+timings['voice'] = time.perf_counter() - t
+
+t = time.perf_counter()
+voice.listener
+timings['listener_first_use'] = time.perf_counter() - t
+
+from streamlit.testing.v1 import AppTest
+t = time.perf_counter()
+app = AppTest.from_file(ROOT + '/app.py', default_timeout=60).run()
+timings['first_page'] = time.perf_counter() - t
+timings['process_to_page'] = time.perf_counter() - start
+timings['errors'] = [str(e.value) for e in app.exception]
+print(MARKER + json.dumps(timings), flush=True)
+"""
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cache = tempfile.mkdtemp(prefix='jarvis-cold-')
+    env = dict(
+        os.environ, BHINDI_API_KEY='bench', SESSION_MEMORY='false', LOCAL_SCHEDULER='false',
+        TTS_CACHE_DIR=os.path.join(cache, 'tts'), CACHE_BACKEND='none'
+    )
+    results = []
+    for _ in range(trials):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', f"ROOT = {ROOT!r}\nMARKER = {MARKER!r}\n" + TRIAL],
+            env=env, cwd=cache, capture_output=True, text=True, check=True
+        ).stdout
+        line = next(line for line in output.splitlines() if line.startswith(MARKER))
+        timings = json.loads(line[len(MARKER):])
+        timings['wall'] = time.perf_counter() - start
+        if timings['errors']:
+            print(f"❌ app raised: {timings['errors']}")
+        results.append(timings)
+    
+    for key in ('import', 'brain', 'voice', 'listener_first_use', 'first_page', 'process_to_page', 'wall'):
+        samples = [r[key] * 1000 for r in results]
+        print(f"{key:>18}: median {statistics.median(samples):8.1f}ms  min {min(samples):8.1f}ms")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Compare per-turn latency of pooled vs unpooled Bhindi calls
+
+Usage: python benchmarks/bench_http_pool.py [turns]
+"""
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from benchmarks.stub_server import start_stub_server
+from utils.bhindi_client import BhindiClient
+
+class UnpooledClient(BhindiClient):
+    """Previous behaviour: a fresh connection for every request"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run(client: BhindiClient, turns: int):
+    samples = []
+    for i in range(turns):
+        start = time.perf_counter()
+        # Bypass the response cache the clients share, so every turn makes a request
+        client.search_web(f"query {i}", use_cache=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server, base_url = start_stub_server()
+    
+    try:
+        for name, client in [
+            ('unpooled', UnpooledClient(api_key='bench', base_url=base_url)),
+            ('pooled', BhindiClient(api_key='bench', base_url=base_url)),
+        ]:
+            run(client, 10)  # warm up
+            samples = run(client, turns)
+            print(f"{name:>9}: p50={statistics.median(samples):.2f}ms "
+                  f"p99={percentile(samples, 99):.2f}ms over {turns} turns")
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
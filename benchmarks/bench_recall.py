@@ -0,0 +1,60 @@
+"""Time recall index inserts and top-k queries as the index grows
+
+Usage: python benchmarks/bench_recall.py [messages] [queries]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.recall import SemanticRecall
+
+TOPICS = ['meeting', 'flight', 'groceries', 'weather', 'python', 'gym', 'dentist', 'budget',
+          'birthday', 'report', 'movie', 'train', 'coffee', 'invoice', 'garden', 'laptop']
+VERBS = ['remind me about', 'what do you know about', 'cancel the', 'move the', 'tell me more about',
+         'I forgot the', 'how is the', 'book the', 'check on the', 'summarise the']
+PLACES = ['today', 'tomorrow', 'next week', 'this evening', 'on friday', 'at the office', 'at home']
+
+def utterance(rng: random.Random, i: int) -> str:
+    return f"{rng.choice(VERBS)} {rng.choice(TOPICS)} {rng.choice(PLACES)} number {i}"
+
+def percentile(samples, pct):
+    return sorted(samples)[int(len(samples) * pct / 100) - 1]
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(42)
+    recall = SemanticRecall()
+
+    checkpoints = sorted({n for n in (1000, 10000, total // 2, total) if n <= total})
+    inserted = 0
+    print(f"{'messages':>9} {'insert p50':>11} {'insert p99':>11} {'query p50':>10} {'query p99':>10}")
+    for checkpoint in checkpoints:
+        insert_times = []
+        while inserted < checkpoint:
+            text = utterance(rng, inserted)
+            start = time.perf_counter()
+            recall.add('user', text)
+            insert_times.append(time.perf_counter() - start)
+            inserted += 1
+
+        query_times = []
+        for _ in range(queries):
+            text = f"{rng.choice(VERBS)} {rng.choice(TOPICS)}"
+            start = time.perf_counter()
+            recall.query(text, k=3)
+            query_times.append(time.perf_counter() - start)
+
+        print(f"{checkpoint:>9} {statistics.median(insert_times) * 1e6:>9.1f}us "
+              f"{percentile(insert_times, 99) * 1e6:>9.1f}us "
+              f"{statistics.median(query_times) * 1e3:>8.2f}ms {percentile(query_times, 99) * 1e3:>8.2f}ms")
+
+    hits = recall.query('remind me about the dentist tomorrow', k=3)
+    print("sample recall:", [h['content'] for h in hits])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Measure how chat turns hold up when the Bhindi API misbehaves
+
+The stub injects faults: random 503s and stalls, a full outage, and a
+slow upstream. Each scenario compares the old single-attempt behaviour
+with the request policy (deadline, retries, hedging, circuit breaker and
+stale answers from the cache).
+
+Usage: python benchmarks/bench_resilience.py [turns]
+"""
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_server import start_stub_server
+from config import Config
+from utils.bhindi_client import BhindiClient
+from utils.cache import MemoryCache
+from utils.resilience import CircuitBreaker, deadline
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def policy(retries: int, hedge: bool, breaker_failures: int):
+    Config.RETRY_ATTEMPTS = retries
+    Config.HEDGE_CHAT = hedge
+    return CircuitBreaker(breaker_failures, Config.BREAKER_RESET)
+
+def run_turns(client: BhindiClient, turns: int, turn_deadline: float, prefix: str):
+    samples, ok = [], 0
+    for i in range(turns):
+        start = time.perf_counter()
+        with deadline(turn_deadline):
+            result = client.chat(f"{prefix} {i}", use_cache=False)
+        samples.append((time.perf_counter() - start) * 1000)
+        ok += result.get('success', True) is not False
+    return samples, ok
+
+def flaky(turns: int):
+    print(f"Flaky upstream: 20ms, 10% 503s, 3% stall 2s; {turns} turns, 5s deadline")
+    policies = [
+        ('single attempt', 0, False),
+        ('retries', Config.RETRY_ATTEMPTS, False),
+        ('retries + hedge', Config.RETRY_ATTEMPTS, True),
+    ]
+    for name, retries, hedge in policies:
+        server, base_url = start_stub_server(latency=0.02, fail_rate=0.10, slow_rate=0.03, slow_delay=2.0, seed=7)
+        try:
+            client = BhindiClient(base_url=base_url, cache=None, breaker=policy(retries, hedge, 10 ** 6))
+            run_turns(client, 30, 5, 'warmup')  # fills the latency window the hedge works from
+            samples, ok = run_turns(client, turns, 5, name)
+            print(
+                f"{name:>16}: success {ok / turns:6.1%}  p50 {statistics.median(samples):7.1f}ms  "
+                f"p99 {percentile(samples, 99):7.1f}ms  max {max(samples):7.1f}ms  "
+                f"upstream calls {server.request_count}  hedged {client.hedged}"
+            )
+        finally:
+            server.shutdown()
+
+def outage(turns: int):
+    print(f"\nOutage: every request fails; {turns} turns")
+    for name, breaker_failures in [('no breaker', 10 ** 6), ('breaker', Config.BREAKER_FAILURES)]:
+        server, base_url = start_stub_server()
+        try:
+            cache = MemoryCache(stale_ttl=3600)
+            client = BhindiClient(base_url=base_url, cache=cache, breaker=policy(Config.RETRY_ATTEMPTS, False, breaker_failures))
+            # Answer one question while healthy and let the answer expire
+            Config.CACHE_TTL_CHAT = 0.01
+            client.chat("what is the weather like")
+            time.sleep(0.02)
+            
+            server.down = True
+            before = server.request_count
+            samples, _ = run_turns(client, turns, Config.TURN_DEADLINE, 'outage')
+            start = time.perf_counter()
+            stale = client.chat("what is the weather like")
+            stale_ms = (time.perf_counter() - start) * 1000
+            print(
+                f"{name:>16}: mean {statistics.mean(samples):7.1f}ms  max {max(samples):7.1f}ms  "
+                f"upstream calls {server.request_count - before}  breaker {client.breaker.state}  "
+                f"cached question answered: {bool(stale.get('stale'))} in {stale_ms:.1f}ms"
+            )
+        finally:
+            server.shutdown()
+
+def slow_upstream():
+    print("\nSlow upstream: every reply takes 3s")
+    server, base_url = start_stub_server(slow_rate=1.0, slow_delay=3.0)
+    try:
+        client = BhindiClient(base_url=base_url, cache=None, breaker=policy(0, False, 10 ** 6))
+        for turn_deadline in (0, 1.0):
+            samples, ok = run_turns(client, 3, turn_deadline, 'slow')
+            label = f"deadline {turn_deadline:.0f}s" if turn_deadline else 'no deadline'
+            print(f"{label:>16}: turn takes {statistics.median(samples):7.1f}ms  success {ok}/3")
+    finally:
+        server.shutdown()
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    flaky(turns)
+    outage(40)
+    slow_upstream()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Fire thousands of local reminders and report how late they fire
+
+Usage: python benchmarks/bench_scheduler.py [reminders] [spread_seconds]
+"""
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.memory import SessionMemory
+from core.scheduler import LocalScheduler
+from utils.bhindi_client import BhindiClient
+from utils.time_parser import Schedule
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    spread = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    rng = random.Random(7)
+    scheduler = LocalScheduler(SessionMemory(), BhindiClient(api_key='bench'))
+
+    lateness = []
+    done = threading.Event()
+    def on_fire(task):
+        lateness.append(time.time() - task['due_at'])
+        if len(lateness) == total:
+            done.set()
+    scheduler.add_listener(on_fire)
+
+    start = time.perf_counter()
+    base = time.time() + 0.5
+    for i in range(total):
+        due = datetime.fromtimestamp(base + rng.random() * spread)
+        scheduler.add(f"Reminder: item {i}", Schedule('* * * * *', False, due, 'once'), {'success': True})
+    added = time.perf_counter() - start
+
+    done.wait(spread + 10)
+    scheduler.stop()
+    lateness.sort()
+    print(f"scheduled {total} reminders in {added * 1e3:.1f}ms ({added / total * 1e6:.1f}us each)")
+    print(f"fired {len(lateness)}/{total}")
+    if lateness:
+        print(f"lateness p50 {statistics.median(lateness) * 1e3:.2f}ms, "
+              f"p99 {lateness[int(len(lateness) * 0.99) - 1] * 1e3:.2f}ms, max {lateness[-1] * 1e3:.2f}ms")
+    sys.exit(0 if len(lateness) == total else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Drive the API server with many concurrent sessions against the stub Bhindi API
+
+Event loop lag (how late a 10ms timer fires) shows whether request
+handling blocks the loop. Set BENCH_MEMORY=1 to persist session memory
+and recall to a temporary directory, as a real deployment does.
+
+Usage: python benchmarks/bench_server.py [sessions] [turns_per_session] [stub_latency_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_server import start_stub_server
+
+stub, base_url = start_stub_server(
+    latency=float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.02, chunk_delay=0.001
+)
+# Config reads the environment on import, so point it at the stub first
+memory_dir = tempfile.mkdtemp(prefix='jarvis-server-') if os.environ.get('BENCH_MEMORY') == '1' else None
+os.environ.update({
+    'BHINDI_API_KEY': 'bench', 'BHINDI_BASE_URL': base_url, 'CACHE_BACKEND': 'none',
+    'SESSION_MEMORY': 'true' if memory_dir else 'false', 'LOCAL_SCHEDULER': 'false',
+    'MEMORY_DB_PATH': os.path.join(memory_dir or '.', 'memory.sqlite3'),
+    'RECALL_DIR': os.path.join(memory_dir or '.', 'recall')
+})
+
+import aiohttp
+from aiohttp import web
+from server import create_app
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def http_session(client: aiohttp.ClientSession, url: str, session_id: str, turns: int, samples: list):
+    for i in range(turns):
+        start = time.perf_counter()
+        async with client.post(f"{url}/sessions/{session_id}/chat", json={'message': f"tell me about item {i}"}) as r:
+            assert (await r.json())['success']
+        samples.append(time.perf_counter() - start)
+
+async def ws_session(client: aiohttp.ClientSession, url: str, session_id: str, turns: int,
+                     samples: list, first_chunk: list):
+    async with client.ws_connect(f"{url}/sessions/{session_id}/ws") as ws:
+        for i in range(turns):
+            start = time.perf_counter()
+            await ws.send_json({'message': f"tell me about item {i}"})
+            first = None
+            while True:
+                event = await ws.receive_json()
+                if event['type'] == 'chunk' and first is None:
+                    first = time.perf_counter() - start
+                if event['type'] == 'done':
+                    break
+            samples.append(time.perf_counter() - start)
+            first_chunk.append(first)
+
+async def loop_lag(lags: list):
+    """Record how late a 10ms sleep wakes up; blocking work on the loop shows up here"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+def report(name: str, samples: list, elapsed: float):
+    print(f"{name:>5}: {len(samples)} turns in {elapsed:.2f}s = {len(samples) / elapsed:.0f} turns/s, "
+          f"p50={statistics.median(samples) * 1e3:.1f}ms p99={percentile(samples, 99) * 1e3:.1f}ms")
+
+async def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    runner = web.AppRunner(create_app(max_sessions=sessions * 2))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    
+    lags = []
+    monitor = asyncio.create_task(loop_lag(lags))
+    connector = aiohttp.TCPConnector(limit=sessions)
+    async with aiohttp.ClientSession(connector=connector) as client:
+        samples = []
+        start = time.perf_counter()
+        await asyncio.gather(*(http_session(client, url, f"http-{s}", turns, samples) for s in range(sessions)))
+        report('http', samples, time.perf_counter() - start)
+        
+        samples, first_chunk = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            ws_session(client, url, f"ws-{s}", turns, samples, first_chunk) for s in range(sessions)
+        ))
+        report('ws', samples, time.perf_counter() - start)
+        print(f"       first chunk p50={statistics.median(first_chunk) * 1e3:.1f}ms")
+        print(f"loop lag: p50={statistics.median(lags) * 1e3:.1f}ms p99={percentile(lags, 99) * 1e3:.1f}ms "
+              f"max={max(lags) * 1e3:.1f}ms")
+        monitor.cancel()
+        
+        async with client.get(f"{url}/health") as r:
+            print(f"pool: {await r.json()}")
+    
+    await runner.cleanup()
+    stub.shutdown()
+
+if __name__ == '__main__':
+    asyncio.run(main())
\ No newline at end of file
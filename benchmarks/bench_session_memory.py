@@ -0,0 +1,73 @@
+"""Measure the memory and threads each extra Streamlit session costs
+
+Sessions are set up the way app.py does it (brain, voice, turn executor,
+transcript) and each says one line, once with the process-wide shared
+components and once with per-session copies as before. Speech uses a
+SilentEngine, so no audio device is needed.
+
+Usage: python benchmarks/bench_session_memory.py [sessions]
+"""
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.update({'BHINDI_API_KEY': 'bench', 'SESSION_MEMORY': 'false', 'LOCAL_SCHEDULER': 'false'})
+
+from core.brain import JarvisBrain
+from core.resources import shared, get_voice, clear_shared
+from core.turns import TurnExecutor
+from core.tts_worker import SilentEngine
+from core.voice import VoiceInterface
+from utils.agent_registry import AgentRegistry
+from utils.bhindi_client import BhindiClient, AsyncBhindiClient, get_shared_session
+from utils.transcript import Transcript
+
+def shared_session():
+    voice = get_voice()
+    return JarvisBrain(), voice
+
+def separate_session():
+    agents = AgentRegistry()
+    brain = JarvisBrain(
+        bhindi=BhindiClient(session=get_shared_session(), agents=agents),
+        bhindi_async=AsyncBhindiClient(agents=agents)
+    )
+    return brain, VoiceInterface(engine_factory=SilentEngine)
+
+def open_session(factory):
+    brain, voice = factory()
+    turns = TurnExecutor(brain)
+    transcript = Transcript(lambda message: message['content'])
+    voice.speak("Good evening, sir.", async_mode=True).wait(5)
+    voice.listener
+    return brain, voice, turns, transcript
+
+def measure(factory, sessions: int):
+    clear_shared()
+    shared('voice', lambda: VoiceInterface(engine_factory=SilentEngine))
+    kept = [open_session(factory)]
+    gc.collect()
+    tracemalloc.start()
+    threads = threading.active_count()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(sessions):
+        kept.append(open_session(factory))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / sessions, (threading.active_count() - threads) / sessions, kept
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    results = {}
+    for name, factory in [('separate', separate_session), ('shared', shared_session)]:
+        per_session, threads, _ = measure(factory, sessions)
+        results[name] = per_session
+        print(f"{name:>9}: {per_session / 1024:7.1f} KiB and {threads:.1f} threads per added session")
+    print(f"shared sessions use {1 - results['shared'] / results['separate']:.0%} less Python memory")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""Measure upstream calls saved by coalescing identical in-flight requests
+
+Bursts of callers (threads, then asyncio tasks) ask the same few searches
+at the same moment with an empty cache, and then register the same agent,
+with and without single-flight coalescing.
+
+Usage: python benchmarks/bench_singleflight.py [callers] [bursts]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BHINDI_API_KEY', 'bench')
+
+from benchmarks.stub_server import start_stub_server
+from utils.agent_registry import AgentRegistry
+from utils.bhindi_client import BhindiClient, AsyncBhindiClient
+from utils.cache import MemoryCache
+
+QUERIES = 4
+
+class NoFlight:
+    """Previous behaviour: every caller makes its own request"""
+    
+    shared = 0
+    
+    def do(self, key, fn):
+        return fn()
+
+class AsyncNoFlight(NoFlight):
+    async def do(self, key, fn):
+        return await fn()
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def fresh(client):
+    """Empty the cache and agent registry, as at the start of a peak"""
+    client.cache = MemoryCache()
+    client.agents = AgentRegistry()
+    return client
+
+def thread_burst(pool: ThreadPoolExecutor, client: BhindiClient, callers: int, call):
+    barrier = threading.Barrier(callers)
+    
+    def one(i):
+        barrier.wait()
+        start = time.perf_counter()
+        call(client, i)
+        return (time.perf_counter() - start) * 1000
+    
+    return list(pool.map(one, range(callers)))
+
+async def task_burst(client: AsyncBhindiClient, callers: int, call):
+    async def one(i):
+        start = time.perf_counter()
+        await call(client, i)
+        return (time.perf_counter() - start) * 1000
+    
+    return await asyncio.gather(*(one(i) for i in range(callers)))
+
+def report(name, server, before, samples, bursts, client):
+    print(
+        f"{name:>28}: upstream calls per burst {(server.request_count - before) / bursts:6.1f}  "
+        f"p50 {statistics.median(samples):6.1f}ms  p99 {percentile(samples, 99):6.1f}ms  shared {client.flights.shared}"
+    )
+
+def run_threads(base_url, server, callers, bursts):
+    searches = lambda client, i: client.search_web(f"weather in city {i % QUERIES}")
+    registrations = lambda client, i: client.ensure_agent('perplexity')
+    with ThreadPoolExecutor(callers) as pool:
+        for workload, call in [('search', searches), ('agent', registrations)]:
+            for coalesce in (False, True):
+                client = BhindiClient(base_url=base_url)
+                if not coalesce:
+                    client.flights = NoFlight()
+                samples, before = [], server.request_count
+                for _ in range(bursts):
+                    samples += thread_burst(pool, fresh(client), callers, call)
+                report(f"threads {workload} {'single-flight' if coalesce else 'separate'}", server, before, samples, bursts, client)
+
+async def run_tasks(base_url, server, callers, bursts):
+    async def searches(client, i):
+        return await client.search_web(f"weather in city {i % QUERIES}")
+    
+    async def registrations(client, i):
+        return await client.ensure_agent('perplexity')
+    
+    for workload, call in [('search', searches), ('agent', registrations)]:
+        for coalesce in (False, True):
+            client = AsyncBhindiClient(base_url=base_url)
+            if not coalesce:
+                client.flights = AsyncNoFlight()
+            samples, before = [], server.request_count
+            for _ in range(bursts):
+                samples += await task_burst(fresh(client), callers, call)
+            report(f"asyncio {workload} {'single-flight' if coalesce else 'separate'}", server, before, samples, bursts, client)
+            await client.aclose()
+
+def main():
+    callers = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    bursts = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    server, base_url = start_stub_server(latency=0.05)
+    try:
+        print(f"{callers} simultaneous callers, {QUERIES} distinct searches, {bursts} bursts, 50ms upstream")
+        run_threads(base_url, server, callers, bursts)
+        asyncio.run(run_tasks(base_url, server, callers, bursts))
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Time cold and cached parsing of schedule phrases
+
+Correctness is covered by the phrase table in tests/test_time_parser.py.
+
+Usage: python benchmarks/bench_time_parser.py [iterations]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.time_parser import parse_schedule, _parse_spec
+
+# Wednesday 15 May 2024, 10:30
+NOW = datetime(2024, 5, 15, 10, 30)
+
+# One or two phrases of each kind the parser handles
+PHRASES = [
+    "remind me at 3:45 pm",
+    "Schedule a meeting tomorrow at 10 AM",
+    "remind me tonight",
+    "remind me to buy 2 apples",
+    "in 10 minutes",
+    "in a week",
+    "remind me daily",
+    "every 2 hours",
+    "every monday at 9am",
+    "weekdays at 7am",
+    "every weekend",
+    "wednesday at 9am",
+    "mon-fri at 9:15",
+    "every hour from 9am to 5pm on weekdays",
+    "every 30 minutes between 1pm and 3pm",
+    "schedule something",
+]
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    phrases = PHRASES * iterations
+    
+    _parse_spec.cache_clear()
+    start = time.perf_counter()
+    for phrase in phrases:
+        _parse_spec.cache_clear()
+        parse_schedule(phrase, NOW)
+    cold = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for phrase in phrases:
+        parse_schedule(phrase, NOW)
+    warm = time.perf_counter() - start
+    
+    print(f"    cold: {cold / len(phrases) * 1e6:.2f}us per phrase")
+    print(f"  cached: {warm / len(phrases) * 1e6:.2f}us per phrase")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
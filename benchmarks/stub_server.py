@@ -0,0 +1,114 @@
+"""Local stand-in for the Bhindi API, used by the benchmarks"""
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Tuple
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer Bhindi endpoints with canned JSON over keep-alive HTTP/1.1"""
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _reply(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _stream(self, text: str):
+        """Send text word by word as chunked server-sent events"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        words = text.split(' ')
+        events = [json.dumps({'delta': w + (' ' if i < len(words) - 1 else '')}) for i, w in enumerate(words)]
+        for event in events + ['[DONE]']:
+            data = f"data: {event}\n\n".encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+        self.wfile.write(b"0\r\n\r\n")
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        self.server.request_count += 1
+        
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        
+        # Injected faults: a whole outage, the next fail_next requests, then random 503s and stalls
+        with self.server.rng_lock:
+            roll = self.server.rng.random()
+            forced = self.server.fail_next > 0
+            self.server.fail_next -= forced
+        if self.server.down or forced or roll < self.server.fail_rate:
+            self._reply(503, {'success': False, 'error': 'Service unavailable'})
+            return
+        if roll < self.server.fail_rate + self.server.slow_rate:
+            time.sleep(self.server.slow_delay)
+        if self.server.not_json:
+            data = b'<html>Bad gateway</html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        
+        if self.path == '/chat' and payload.get('stream'):
+            self._stream(f"Echo: {payload.get('message', '')}. Streamed reply complete.")
+        elif self.path == '/chat':
+            self._reply(200, {'success': True, 'message': f"Echo: {payload.get('message', '')}"})
+        elif self.path == '/agents/add':
+            self._reply(200, {'success': True, 'agentId': payload.get('agentId')})
+        elif self.path == '/scheduler/create':
+            self._reply(200, {'success': True, 'id': f"sched-{self.server.request_count}"})
+        else:
+            self._reply(404, {'success': False, 'error': 'Not found'})
+
+class StubServer(ThreadingHTTPServer):
+    # Room for many clients connecting at once without dropped SYNs
+    request_queue_size = 256
+    
+    def handle_error(self, request, client_address):
+        # Clients that hit their deadline or lost a hedge hang up mid-reply
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def start_stub_server(latency: float = 0.0, port: int = 0, chunk_delay: float = 0.0,
+                      fail_rate: float = 0.0, slow_rate: float = 0.0, slow_delay: float = 0.0,
+                      seed: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub in a daemon thread and return it with its base URL
+    
+    fail_rate of requests get a 503 and slow_rate of them stall for
+    slow_delay seconds; set server.fail_next to fail that many requests,
+    server.down to fail every request, or server.not_json to answer with
+    an HTML page.
+    """
+    server = StubServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.chunk_delay = chunk_delay
+    server.fail_rate = fail_rate
+    server.slow_rate = slow_rate
+    server.slow_delay = slow_delay
+    server.down = False
+    server.fail_next = 0
+    server.not_json = False
+    server.rng = random.Random(seed)
+    server.rng_lock = threading.Lock()
+    server.request_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
\ No newline at end of file
@@ -8,17 +8,88 @@ class Config:
     BHINDI_API_KEY = os.getenv('BHINDI_API_KEY', '')
     BHINDI_BASE_URL = os.getenv('BHINDI_BASE_URL', 'https://api.bhindi.io')
     
+    # HTTP Transport
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    CHAT_TIMEOUT = float(os.getenv('CHAT_TIMEOUT', '30'))
+    AGENT_TIMEOUT = float(os.getenv('AGENT_TIMEOUT', '10'))
+    SCHEDULER_TIMEOUT = float(os.getenv('SCHEDULER_TIMEOUT', '10'))
+    
+    # Request Policy
+    TURN_DEADLINE = float(os.getenv('TURN_DEADLINE', '20'))  # seconds a whole turn may spend on Bhindi calls (0 = none)
+    RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', '2'))  # extra tries for chat after a transient failure
+    RETRY_BACKOFF = float(os.getenv('RETRY_BACKOFF', '0.25'))  # base of the jittered exponential backoff
+    HEDGE_CHAT = os.getenv('HEDGE_CHAT', 'false').lower() == 'true'  # send a second chat request when the first is slow
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '95'))  # chat latency percentile that triggers the hedge
+    BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', '5'))  # consecutive failures that open the circuit breaker
+    BREAKER_RESET = float(os.getenv('BREAKER_RESET', '30'))  # seconds before a probe call is let through
+    
+    # Agent Registration
+    AGENT_REGISTRATION_TTL = float(os.getenv('AGENT_REGISTRATION_TTL', '1800'))
+    AGENT_MAX_RETRIES = int(os.getenv('AGENT_MAX_RETRIES', '2'))
+    AGENT_RETRY_BACKOFF = float(os.getenv('AGENT_RETRY_BACKOFF', '0.5'))
+    
+    # Local Scheduler
+    LOCAL_SCHEDULER = os.getenv('LOCAL_SCHEDULER', 'true').lower() == 'true'  # fire reminders in-process
+    SCHEDULER_SYNC_INTERVAL = float(os.getenv('SCHEDULER_SYNC_INTERVAL', '60'))
+    
+    # Response Cache
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')  # memory, sqlite or none
+    CACHE_PATH = os.getenv('CACHE_PATH', '.cache/responses.sqlite3')
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '512'))
+    CACHE_TTL_CHAT = float(os.getenv('CACHE_TTL_CHAT', '300'))
+    CACHE_TTL_SEARCH = float(os.getenv('CACHE_TTL_SEARCH', '60'))
+    CACHE_STALE_TTL = float(os.getenv('CACHE_STALE_TTL', '3600'))  # expired answers kept for use while Bhindi is down
+    CACHE_DISABLED_INTENTS = [
+        intent.strip() for intent in os.getenv('CACHE_DISABLED_INTENTS', 'task').split(',') if intent.strip()
+    ]
+    
     # Assistant Settings
     ASSISTANT_NAME = os.getenv('ASSISTANT_NAME', 'JARVIS')
     VOICE_ENABLED = os.getenv('VOICE_ENABLED', 'true').lower() == 'true'
     VOICE_RATE = int(os.getenv('VOICE_RATE', '180'))
     VOICE_VOLUME = float(os.getenv('VOICE_VOLUME', '0.9'))
+    TTS_QUEUE_SIZE = int(os.getenv('TTS_QUEUE_SIZE', '32'))
+    TTS_MERGE_CHARS = int(os.getenv('TTS_MERGE_CHARS', '120'))  # merge short queued utterances up to this length
+    TTS_AUDIO_CACHE = os.getenv('TTS_AUDIO_CACHE', 'true').lower() == 'true'  # pre-render canned phrases
+    TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', '.cache/tts')
+    SPEECH_BACKENDS = [
+        name.strip() for name in os.getenv('SPEECH_BACKENDS', 'google,whisper,sphinx').split(',') if name.strip()
+    ]  # tried in order: google (network), whisper or sphinx (offline)
+    SPEECH_CALIBRATION_TTL = float(os.getenv('SPEECH_CALIBRATION_TTL', '300'))
+    SPEECH_PAUSE_THRESHOLD = float(os.getenv('SPEECH_PAUSE_THRESHOLD', '0.5'))  # silence that ends an utterance
+    LISTEN_WAKE_WORDS = [
+        word.strip() for word in os.getenv('LISTEN_WAKE_WORDS', 'jarvis').split(',') if word.strip()
+    ]  # empty = every utterance in hands-free mode is a command
+    LISTEN_ENERGY_RATIO = float(os.getenv('LISTEN_ENERGY_RATIO', '3.0'))  # loudness over the noise floor that counts as speech
+    LISTEN_SAMPLE_RATE = int(os.getenv('LISTEN_SAMPLE_RATE', '16000'))
     
     # Memory Settings
-    SESSION_MEMORY = os.getenv('SESSION_MEMORY', 'true').lower() == 'true'
+    SESSION_MEMORY = os.getenv('SESSION_MEMORY', 'true').lower() == 'true'  # persist memory across restarts
+    SESSION_ID = os.getenv('SESSION_ID', 'default')
+    APP_SHARED_SESSION = os.getenv('APP_SHARED_SESSION', 'false').lower() == 'true'  # every app tab uses SESSION_ID
+    MEMORY_DB_PATH = os.getenv('MEMORY_DB_PATH', '.cache/memory.sqlite3')
     CONTEXT_WINDOW = int(os.getenv('CONTEXT_WINDOW', '10'))
+    CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', '1500'))  # 0 = last CONTEXT_WINDOW messages
+    CONTEXT_SUMMARY = os.getenv('CONTEXT_SUMMARY', 'true').lower() == 'true'
+    CONTEXT_SUMMARY_TOKENS = int(os.getenv('CONTEXT_SUMMARY_TOKENS', '200'))
+    RECALL_ENABLED = os.getenv('RECALL_ENABLED', 'true').lower() == 'true'
+    RECALL_BACKEND = os.getenv('RECALL_BACKEND', 'numpy')  # numpy or chroma
+    RECALL_DIR = os.getenv('RECALL_DIR', '.cache/recall')
+    RECALL_TOP_K = int(os.getenv('RECALL_TOP_K', '3'))
+    RECALL_MIN_SCORE = float(os.getenv('RECALL_MIN_SCORE', '0.3'))
+    RECALL_DIMENSIONS = int(os.getenv('RECALL_DIMENSIONS', '256'))
+    
+    # API Server
+    SERVER_HOST = os.getenv('SERVER_HOST', '127.0.0.1')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', '8765'))
+    SERVER_MAX_SESSIONS = int(os.getenv('SERVER_MAX_SESSIONS', '1000'))
+    SERVER_SESSION_IDLE = float(os.getenv('SERVER_SESSION_IDLE', '900'))  # seconds before an unused session is evicted
+    SERVER_STREAM_WORKERS = int(os.getenv('SERVER_STREAM_WORKERS', '32'))  # threads for streamed WebSocket turns
     
     # UI Settings
+    UI_TRANSCRIPT_LIMIT = int(os.getenv('UI_TRANSCRIPT_LIMIT', '200'))  # messages kept in the page; older ones are read back from memory
+    UI_PAGE_SIZE = int(os.getenv('UI_PAGE_SIZE', '50'))  # messages shown per page of history
     THEME = 'dark'
     PRIMARY_COLOR = '#00D9FF'
     SECONDARY_COLOR = '#FFD700'
@@ -1,18 +1,62 @@
-from typing import Dict, Any, Optional
-from utils.bhindi_client import BhindiClient
-from utils.helpers import detect_intent, extract_agent_needed, parse_time_expression
+import asyncio
+from typing import Dict, Any, Optional, Tuple, Iterator, Callable, List, Set
+from utils.bhindi_client import BhindiClient, AsyncBhindiClient
+from utils.helpers import classify_message
+from utils.resilience import deadline
+from utils.time_parser import Schedule, parse_schedule
 from core.memory import SessionMemory
+from core.memory_store import get_memory_store
+from core.recall import get_recall, release_recall
+from core.scheduler import LocalScheduler
+from core.resources import get_bhindi_client, get_async_bhindi_client, shared, release_shared
 from core.personality import JarvisPersonality
 from config import Config
 
 class JarvisBrain:
-    """Main AI orchestrator - the brain of JARVIS"""
+    """Main AI orchestrator - the brain of JARVIS
     
-    def __init__(self):
-        self.bhindi = BhindiClient()
-        self.memory = SessionMemory(context_window=Config.CONTEXT_WINDOW)
+    Bhindi clients are shared by every brain in the process unless given;
+    what belongs to one conversation lives in its SessionMemory. Brains on
+    the same session id share one LocalScheduler and its task store, so a
+    persisted reminder fires once however many brains restore it; it stops
+    when the last of them closes.
+    """
+    
+    def __init__(self, session_id: Optional[str] = None, bhindi: Optional[BhindiClient] = None,
+                 bhindi_async: Optional[AsyncBhindiClient] = None):
+        self.session_id = session_id or Config.SESSION_ID
+        self.bhindi = bhindi or get_bhindi_client()
+        self.bhindi_async = bhindi_async or get_async_bhindi_client()
+        self.memory = SessionMemory(
+            context_window=Config.CONTEXT_WINDOW,
+            token_budget=Config.CONTEXT_TOKEN_BUDGET,
+            summary_tokens=Config.CONTEXT_SUMMARY_TOKENS if Config.CONTEXT_SUMMARY else 0,
+            store=get_memory_store(Config.MEMORY_DB_PATH) if Config.SESSION_MEMORY else None,
+            session_id=self.session_id,
+            recall=get_recall(
+                self.session_id,
+                backend=Config.RECALL_BACKEND,
+                directory=Config.RECALL_DIR if Config.SESSION_MEMORY else None,
+                dim=Config.RECALL_DIMENSIONS,
+                min_score=Config.RECALL_MIN_SCORE
+            ) if Config.RECALL_ENABLED else None,
+            recall_k=Config.RECALL_TOP_K
+        )
         self.personality = JarvisPersonality()
-        self.active_agents = set()
+        self.scheduler = shared(
+            f'scheduler:{self.session_id}',
+            lambda: LocalScheduler(self.memory, self.bhindi, Config.SCHEDULER_SYNC_INTERVAL)
+        )
+        self.memory.tasks = self.scheduler.memory.tasks
+        self._reminder_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._closed = False
+        if Config.LOCAL_SCHEDULER and self.memory.tasks.active_count:
+            self.scheduler.start()
+    
+    @property
+    def active_agents(self) -> Set[str]:
+        """Agents currently registered with Bhindi"""
+        return self.bhindi.agents.registered()
     
     def process_message(self, message: str) -> Dict[str, Any]:
         """Process user message and generate response"""
@@ -20,94 +64,249 @@ class JarvisBrain:
         # Add to memory
         self.memory.add_message('user', message)
         
-        # Detect intent
-        intent_data = detect_intent(message)
-        intent = intent_data['intent']
+        # Detect intent and needed agents
+        classification = classify_message(message)
+        intent = classification['intent']
+        needed_agents = classification['agents']
+        
+        # Every Bhindi call in the turn shares one deadline
+        with deadline(Config.TURN_DEADLINE):
+            # Add agents if needed
+            for agent in needed_agents:
+                self.bhindi.ensure_agent(agent)
+            
+            # Route to appropriate handler
+            use_cache = intent not in Config.CACHE_DISABLED_INTENTS
+            if intent == 'schedule':
+                response = self._handle_schedule(message)
+            elif intent == 'search':
+                response = self._handle_search(message, use_cache)
+            elif intent == 'time':
+                response = self._handle_time(message)
+            else:
+                response = self._handle_general(message, use_cache)
+        
+        # Add response to memory
+        self.memory.add_message('assistant', response['message'])
+        
+        return response
+    
+    def process_message_stream(self, message: str) -> Iterator[str]:
+        """Process user message, yielding the reply in chunks as they arrive"""
+        
+        # Add to memory
+        self.memory.add_message('user', message)
+        
+        # Detect intent and needed agents
+        classification = classify_message(message)
+        intent = classification['intent']
+        
+        reply = []
+        try:
+            # Every Bhindi call in the turn, streaming included, shares one deadline
+            with deadline(Config.TURN_DEADLINE):
+                # Add agents if needed
+                for agent in classification['agents']:
+                    self.bhindi.ensure_agent(agent)
+                
+                # Only conversational replies stream; the rest answer in one piece
+                use_cache = intent not in Config.CACHE_DISABLED_INTENTS
+                if intent == 'schedule':
+                    chunks = iter([self._handle_schedule(message)['message']])
+                elif intent == 'search':
+                    chunks = self._stream_reply(lambda: self.bhindi.search_web_stream(message, use_cache=use_cache))
+                elif intent == 'time':
+                    chunks = iter([self._handle_time(message)['message']])
+                else:
+                    context = self.memory.get_context(message)
+                    chunks = self._stream_reply(lambda: self.bhindi.chat_stream(message, context, use_cache=use_cache))
+                
+                for chunk in chunks:
+                    reply.append(chunk)
+                    yield chunk
+        finally:
+            # Add response to memory, as far as it got if the caller stopped early
+            self.memory.add_message('assistant', ''.join(reply))
+    
+    def _stream_reply(self, start: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Stream a Bhindi reply, styling its opening the way format_response does"""
+        try:
+            chunks = iter(start())
+            for chunk in chunks:
+                if chunk.strip():
+                    yield self.personality.format_response(chunk)
+                    break
+            yield from chunks
+        
+        except Exception as e:
+            yield self._error_response(e)['message']
+    
+    async def _offload(self, fn: Callable, *args):
+        """Run blocking memory work (SQLite writes, recall search) off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    
+    async def process_message_async(self, message: str) -> Dict[str, Any]:
+        """Process user message, registering agents concurrently with the handler"""
         
-        # Determine needed agents
-        needed_agents = extract_agent_needed(message)
+        # Add to memory
+        await self._offload(self.memory.add_message, 'user', message)
         
-        # Add agents if needed
-        for agent in needed_agents:
-            if agent not in self.active_agents:
-                self.bhindi.add_agent(agent)
-                self.active_agents.add(agent)
+        # Detect intent and needed agents
+        classification = classify_message(message)
+        intent = classification['intent']
+        needed_agents = classification['agents']
         
-        # Route to appropriate handler
+        use_cache = intent not in Config.CACHE_DISABLED_INTENTS
         if intent == 'schedule':
-            response = self._handle_schedule(message)
+            handler = self._handle_schedule_async(message)
         elif intent == 'search':
-            response = self._handle_search(message)
+            handler = self._handle_search_async(message, use_cache)
         elif intent == 'time':
-            response = self._handle_time(message)
+            handler = self._handle_time_async(message)
         else:
-            response = self._handle_general(message)
+            handler = self._handle_general_async(message, use_cache)
+        
+        # Register agents alongside the routed request, all within the turn's deadline
+        with deadline(Config.TURN_DEADLINE):
+            _, response = await asyncio.gather(self.bhindi_async.ensure_agents(needed_agents), handler)
         
         # Add response to memory
-        self.memory.add_message('assistant', response['message'])
+        await self._offload(self.memory.add_message, 'assistant', response['message'])
         
         return response
     
+    def _parse_schedule(self, message: str) -> Tuple[str, Schedule]:
+        """Extract reminder content and schedule from a message"""
+        # Parse time expression
+        schedule = parse_schedule(message)
+        
+        # Extract what to remind about
+        content = message
+        for word in ['remind me to', 'remind me', 'schedule', 'set alarm']:
+            content = content.replace(word, '').strip()
+        
+        return f"Reminder: {content}", schedule
+    
+    def _track_schedule(self, content: str, schedule: Schedule, result: Dict[str, Any]):
+        """Keep the schedule as a local task; without the local scheduler only accepted ones are kept"""
+        if Config.LOCAL_SCHEDULER:
+            result['task'] = self.scheduler.add(content, schedule, result)
+        elif result.get('success'):
+            result['task'] = self.memory.add_task({
+                'description': content,
+                'cron': schedule.cron,
+                'recurring': schedule.recurring,
+                'due_at': schedule.next_run.timestamp() if schedule.next_run else None,
+                'schedule_id': result.get('id')
+            })
+    
+    def _schedule_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the reply for a scheduler result"""
+        if result.get('success'):
+            response = f"{self.personality.acknowledge()} I've scheduled that for you, sir."
+        elif result.get('task'):
+            response = (
+                f"{self.personality.acknowledge()} The Bhindi scheduler is unreachable, "
+                "so I'll keep that reminder myself and sync it once it's back, sir."
+            )
+        else:
+            response = f"{self.personality.error()} {result.get('error', 'Unknown error')}"
+        
+        return {
+            'success': result.get('success', False) or bool(result.get('task')),
+            'message': response,
+            'data': result
+        }
+    
+    def _search_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the reply for a search result"""
+        if result.get('success'):
+            response = self.personality.format_response(
+                result.get('message', 'Here is what I found.')
+            )
+        else:
+            response = f"{self.personality.error()} {result.get('error', 'Search failed')}"
+        
+        return {
+            'success': result.get('success', False),
+            'message': response,
+            'data': result
+        }
+    
+    def _general_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the reply for a general chat result"""
+        if result.get('success'):
+            response = self.personality.format_response(
+                result.get('message', 'I understand, sir.')
+            )
+        else:
+            response = f"{self.personality.error()} {result.get('error', 'I could not process that')}"
+        
+        return {
+            'success': result.get('success', False),
+            'message': response,
+            'data': result
+        }
+    
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        """Build the reply for an unexpected handler failure"""
+        return {
+            'success': False,
+            'message': f"{self.personality.error()} {str(error)}",
+            'data': None
+        }
+    
     def _handle_schedule(self, message: str) -> Dict[str, Any]:
         """Handle scheduling requests"""
         try:
-            # Parse time expression
-            cron, is_recurring = parse_time_expression(message)
-            
-            # Extract what to remind about
-            content = message
-            for word in ['remind me to', 'remind me', 'schedule', 'set alarm']:
-                content = content.replace(word, '').strip()
+            content, schedule = self._parse_schedule(message)
             
             # Create schedule
             result = self.bhindi.create_schedule(
-                content=f"Reminder: {content}",
-                cron=cron,
-                schedule_type='reminder'
+                content=content,
+                cron=schedule.cron,
+                schedule_type='reminder',
+                recurring=schedule.recurring
             )
-            
-            if result.get('success'):
-                response = f"{self.personality.acknowledge()} I've scheduled that for you, sir."
-            else:
-                response = f"{self.personality.error()} {result.get('error', 'Unknown error')}"
-            
-            return {
-                'success': result.get('success', False),
-                'message': response,
-                'data': result
-            }
+            self._track_schedule(content, schedule, result)
+            return self._schedule_response(result)
+        
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def _handle_schedule_async(self, message: str) -> Dict[str, Any]:
+        """Handle scheduling requests without blocking the event loop"""
+        try:
+            content, schedule = self._parse_schedule(message)
+            result = await self.bhindi_async.create_schedule(
+                content=content,
+                cron=schedule.cron,
+                schedule_type='reminder',
+                recurring=schedule.recurring
+            )
+            await self._offload(self._track_schedule, content, schedule, result)
+            return self._schedule_response(result)
         
         except Exception as e:
-            return {
-                'success': False,
-                'message': f"{self.personality.error()} {str(e)}",
-                'data': None
-            }
+            return self._error_response(e)
     
-    def _handle_search(self, message: str) -> Dict[str, Any]:
+    def _handle_search(self, message: str, use_cache: bool = True) -> Dict[str, Any]:
         """Handle search requests"""
         try:
-            result = self.bhindi.search_web(message)
-            
-            if result.get('success'):
-                response = self.personality.format_response(
-                    result.get('message', 'Here is what I found.')
-                )
-            else:
-                response = f"{self.personality.error()} {result.get('error', 'Search failed')}"
-            
-            return {
-                'success': result.get('success', False),
-                'message': response,
-                'data': result
-            }
+            result = self.bhindi.search_web(message, use_cache=use_cache)
+            return self._search_response(result)
+        
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def _handle_search_async(self, message: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Handle search requests without blocking the event loop"""
+        try:
+            result = await self.bhindi_async.search_web(message, use_cache=use_cache)
+            return self._search_response(result)
         
         except Exception as e:
-            return {
-                'success': False,
-                'message': f"{self.personality.error()} {str(e)}",
-                'data': None
-            }
+            return self._error_response(e)
     
     def _handle_time(self, message: str) -> Dict[str, Any]:
         """Handle time/date requests"""
@@ -125,34 +324,63 @@ class JarvisBrain:
             'data': {'timestamp': now.isoformat()}
         }
     
-    def _handle_general(self, message: str) -> Dict[str, Any]:
+    async def _handle_time_async(self, message: str) -> Dict[str, Any]:
+        """Handle time/date requests inside the async pipeline"""
+        return self._handle_time(message)
+    
+    def _handle_general(self, message: str, use_cache: bool = True) -> Dict[str, Any]:
         """Handle general conversation"""
         try:
             # Get conversation context
-            context = self.memory.get_context()
+            context = self.memory.get_context(message)
             
             # Send to Bhindi
-            result = self.bhindi.chat(message, context)
-            
-            if result.get('success'):
-                response = self.personality.format_response(
-                    result.get('message', 'I understand, sir.')
-                )
-            else:
-                response = f"{self.personality.error()} {result.get('error', 'I could not process that')}"
-            
-            return {
-                'success': result.get('success', False),
-                'message': response,
-                'data': result
-            }
+            result = self.bhindi.chat(message, context, use_cache=use_cache)
+            return self._general_response(result)
+        
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def _handle_general_async(self, message: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Handle general conversation without blocking the event loop"""
+        try:
+            context = await self._offload(self.memory.get_context, message)
+            result = await self.bhindi_async.chat(message, context, use_cache=use_cache)
+            return self._general_response(result)
         
         except Exception as e:
-            return {
-                'success': False,
-                'message': f"{self.personality.error()} {str(e)}",
-                'data': None
-            }
+            return self._error_response(e)
+    
+    async def schedule_async(self, message: str) -> Dict[str, Any]:
+        """Schedule a reminder from a natural-language request, outside the conversation"""
+        return await self._handle_schedule_async(message)
+    
+    def close(self):
+        """Detach from the session's scheduler; shared clients stay open
+        
+        The scheduler is stopped and the recall index saved and released
+        when the last brain on the session id closes.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for listener in self._reminder_listeners:
+            self.scheduler.remove_listener(listener)
+        self._reminder_listeners.clear()
+        if release_shared(f'scheduler:{self.session_id}') is not None:
+            self.scheduler.stop()
+            if self.memory.recall is not None:
+                release_recall(self.session_id, Config.RECALL_BACKEND)
+    
+    async def aclose(self):
+        """close() without blocking the event loop"""
+        await self._offload(self.close)
+    
+    def on_reminder(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """Call back with the spoken text and task for each reminder the local scheduler fires, until close()"""
+        listener = lambda task: callback(self.personality.reminder(task['description']), task)
+        self._reminder_listeners.append(listener)
+        self.scheduler.add_listener(listener)
     
     def get_proactive_suggestions(self) -> Optional[str]:
         """Generate proactive suggestions based on context"""
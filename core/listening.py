@@ -0,0 +1,195 @@
+import asyncio
+import queue
+import re
+import threading
+import wave
+from collections import deque
+from typing import List, Optional, Iterator, AsyncIterator, Callable
+
+import numpy as np
+import speech_recognition as sr
+
+from core.recognition import SpeechListener
+
+class MicrophoneStream:
+    """16-bit mono microphone frames from sounddevice
+    
+    The audio callback only copies each frame into a bounded queue; when
+    the consumer falls behind (e.g. during recognition) the oldest frames
+    are dropped, so memory stays flat however long it runs.
+    """
+    
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, max_seconds: float = 10):
+        import sounddevice
+        self.sample_rate = sample_rate
+        self.frame_size = sample_rate * frame_ms // 1000
+        self._frames: queue.Queue = queue.Queue(maxsize=int(max_seconds * 1000 / frame_ms))
+        self._stream = sounddevice.RawInputStream(
+            samplerate=sample_rate, blocksize=self.frame_size, channels=1, dtype='int16',
+            callback=self._callback
+        )
+        self._stream.start()
+    
+    def _callback(self, data, frames, time_info, status):
+        frame = bytes(data)
+        while True:
+            try:
+                self._frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def read(self, timeout: float = 0.5) -> Optional[bytes]:
+        """Next frame, or None if none arrived within timeout"""
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def close(self):
+        self._stream.stop()
+        self._stream.close()
+
+class WavStream:
+    """Frames from a 16-bit mono WAV file, for running the pipeline without a microphone"""
+    
+    def __init__(self, path: str, frame_ms: int = 30):
+        self._wav = wave.open(path, 'rb')
+        if self._wav.getsampwidth() != 2 or self._wav.getnchannels() != 1:
+            raise ValueError(f"{path} must be 16-bit mono")
+        self.sample_rate = self._wav.getframerate()
+        self.frame_size = self.sample_rate * frame_ms // 1000
+        self.finished = False
+    
+    def read(self, timeout: float = 0.5) -> Optional[bytes]:
+        frame = self._wav.readframes(self.frame_size)
+        if len(frame) < self.frame_size * 2:
+            self.finished = True
+            return None
+        return frame
+    
+    def close(self):
+        self._wav.close()
+
+class ContinuousListener:
+    """Turn a stream of audio frames into recognized utterances
+    
+    An energy gate compares each frame's RMS with an adaptive noise
+    floor; only the segments it opens (plus a short pre-roll from a
+    ring buffer, so the first syllable is kept) are sent to recognition.
+    With wake words set, an utterance is only passed on when it starts
+    with one, and the wake word is stripped. Frames are examined with
+    a few numpy operations each, so idle CPU stays low.
+    """
+    
+    def __init__(self, listener: SpeechListener, source, wake_words: Optional[List[str]] = None,
+                 energy_ratio: float = 3.0, pause_ms: int = 600, preroll_ms: int = 300,
+                 max_utterance_s: float = 15, muted: Optional[Callable[[], bool]] = None):
+        self.listener = listener
+        self.muted = muted
+        self.source = source
+        self.energy_ratio = energy_ratio
+        frame_ms = source.frame_size * 1000 // source.sample_rate
+        self._pause_frames = max(1, pause_ms // frame_ms)
+        self._max_frames = int(max_utterance_s * 1000 / frame_ms)
+        self._preroll: deque = deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._noise_floor: Optional[float] = None
+        self._wake = re.compile(
+            r'^\W*(?:hey\s+|ok(?:ay)?\s+)?(?:' + '|'.join(re.escape(w) for w in wake_words) + r')\b[\s,.!?]*',
+            re.IGNORECASE
+        ) if wake_words else None
+        self._running = False
+    
+    def _is_voiced(self, frame: bytes) -> bool:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        energy = float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+        if self._noise_floor is None:
+            self._noise_floor = max(energy, 1.0)
+        voiced = energy > self._noise_floor * self.energy_ratio
+        if not voiced:
+            # Track the room slowly so a fan or traffic does not open the gate
+            self._noise_floor = 0.95 * self._noise_floor + 0.05 * max(energy, 1.0)
+        return voiced
+    
+    def segments(self) -> Iterator[bytes]:
+        """Yield the raw audio of each gated segment"""
+        self._running = True
+        segment: List[bytes] = []
+        silent = 0
+        while self._running:
+            frame = self.source.read()
+            if frame is None:
+                if getattr(self.source, 'finished', False):
+                    break
+                continue
+            if self.muted is not None and self.muted():
+                # Don't transcribe our own voice
+                segment = []
+                self._preroll.clear()
+                continue
+            voiced = self._is_voiced(frame)
+            if not segment:
+                self._preroll.append(frame)
+                if voiced:
+                    segment = list(self._preroll)
+                    self._preroll.clear()
+                    silent = 0
+                continue
+            segment.append(frame)
+            silent = 0 if voiced else silent + 1
+            if silent >= self._pause_frames or len(segment) >= self._max_frames:
+                yield b''.join(segment[:len(segment) - silent] or segment)
+                segment = []
+        if segment:
+            yield b''.join(segment)
+    
+    def _accept(self, text: Optional[str]) -> Optional[str]:
+        if not text:
+            return None
+        if self._wake is None:
+            return text
+        match = self._wake.match(text)
+        if not match:
+            return None
+        return text[match.end():].strip() or None
+    
+    def utterances(self) -> Iterator[str]:
+        """Yield recognized (and, with wake words, addressed) utterances until stop()"""
+        for audio in self.segments():
+            try:
+                text = self.listener.transcribe(sr.AudioData(audio, self.source.sample_rate, 2))
+            except sr.RequestError as e:
+                print(f"❌ Speech recognition error: {e}")
+                continue
+            text = self._accept(text)
+            if text:
+                yield text
+    
+    async def stream(self) -> AsyncIterator[str]:
+        """Async iterator over utterances; capture and recognition run in a worker thread"""
+        loop = asyncio.get_running_loop()
+        utterances = self.utterances()
+        while True:
+            text = await loop.run_in_executor(None, next, utterances, None)
+            if text is None:
+                return
+            yield text
+    
+    def run(self, handle: Callable[[str], None]):
+        """Call handle with each utterance until stop() or the source ends"""
+        for text in self.utterances():
+            handle(text)
+    
+    def start(self, handle: Callable[[str], None]) -> threading.Thread:
+        """run() on a daemon thread"""
+        thread = threading.Thread(target=self.run, args=(handle,), name='jarvis-listen', daemon=True)
+        thread.start()
+        return thread
+    
+    def stop(self):
+        """Stop after the current frame and release the audio source"""
+        self._running = False
+        self.source.close()
\ No newline at end of file
@@ -1,69 +1,244 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from collections import deque
 from datetime import datetime
 import json
+import time
+from core.memory_store import MemoryStore
+from core.recall import SemanticRecall
+from core.tasks import TaskStore
+from utils.helpers import estimate_tokens
+
+class Message:
+    """A single conversation turn"""
+    
+    __slots__ = ('role', 'content', 'created', 'metadata', 'tokens')
+    
+    def __init__(self, role: str, content: str, metadata: Optional[Dict] = None,
+                 created: Optional[float] = None):
+        self.role = role
+        self.content = content
+        self.created = created or time.time()
+        self.metadata = metadata or None
+        self.tokens = estimate_tokens(content)
+    
+    @property
+    def timestamp(self) -> str:
+        """Creation time in ISO format"""
+        return datetime.fromtimestamp(self.created).isoformat()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Full record, as stored before messages had their own type"""
+        return {
+            'role': self.role,
+            'content': self.content,
+            'timestamp': self.timestamp,
+            'metadata': self.metadata or {}
+        }
+
+def _summary_line(message: Message, max_chars: int = 120) -> str:
+    """Condense a turn to its first sentence for the rolling summary"""
+    text = ' '.join(message.content.split())
+    end = min((i for i in (text.find('. '), text.find('? '), text.find('! ')) if i >= 0), default=-1)
+    if 0 <= end < max_chars:
+        text = text[:end + 1]
+    elif len(text) > max_chars:
+        text = text[:max_chars].rsplit(' ', 1)[0] + '...'
+    return f"{message.role}: {text}"
 
 class SessionMemory:
     """Manage conversation context and short-term memory"""
     
-    def __init__(self, context_window: int = 10):
+    def __init__(self, context_window: int = 10, token_budget: int = 0, summary_tokens: int = 0,
+                 store: Optional[MemoryStore] = None, session_id: str = 'default',
+                 recall: Optional[SemanticRecall] = None, recall_k: int = 3):
         self.context_window = context_window
-        self.conversation_history: List[Dict[str, Any]] = []
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.conversation_history: deque = deque(maxlen=context_window * 2)
+        self._summary: deque = deque()
+        self._summary_token_count = 0
+        self._context: Optional[List[Dict[str, str]]] = None
         self.user_preferences: Dict[str, Any] = {}
-        self.active_tasks: List[Dict[str, Any]] = []
+        self.tasks = TaskStore()
         self.session_start = datetime.now()
+        self.store = store
+        self.session_id = session_id
+        self.recall = recall
+        self.recall_k = recall_k
+        
+        if store is not None:
+            self._restore()
+    
+    def _restore(self):
+        """Load recent history, preferences and active tasks; older history stays on disk"""
+        recent = self.store.get_messages(self.session_id, limit=self.conversation_history.maxlen)
+        for row in reversed(recent):
+            self.conversation_history.append(
+                Message(row['role'], row['content'], row['metadata'], created=row['created'])
+            )
+        self.user_preferences = self.store.get_preferences(self.session_id)
+        for task in self.store.get_tasks(self.session_id):
+            self.tasks.add(task)
+    
+    def load_older(self, limit: int = 50) -> List[Message]:
+        """Fetch persisted messages older than the in-memory history, oldest first"""
+        if self.store is None:
+            return []
+        before = self.conversation_history[0].created if self.conversation_history else None
+        rows = self.store.get_messages(self.session_id, before=before, limit=limit)
+        return [
+            Message(row['role'], row['content'], row['metadata'], created=row['created'])
+            for row in reversed(rows)
+        ]
     
     def add_message(self, role: str, content: str, metadata: Dict = None):
         """Add a message to conversation history"""
-        message = {
-            'role': role,
-            'content': content,
-            'timestamp': datetime.now().isoformat(),
-            'metadata': metadata or {}
-        }
-        self.conversation_history.append(message)
+        # The deque drops the oldest message once context_window * 2 is reached
+        history = self.conversation_history
+        if self.summary_tokens and len(history) == history.maxlen:
+            self._fold_into_summary(history[0])
+        message = Message(role, content, metadata)
+        history.append(message)
+        self._context = None
         
-        # Keep only recent messages within context window
-        if len(self.conversation_history) > self.context_window * 2:
-            self.conversation_history = self.conversation_history[-self.context_window * 2:]
+        if self.store is not None:
+            self.store.append_message(self.session_id, role, content, message.created, message.metadata)
+        if self.recall is not None:
+            self.recall.add(role, content, message.created)
     
-    def get_context(self) -> List[Dict[str, str]]:
-        """Get recent conversation context"""
-        return [
-            {'role': msg['role'], 'content': msg['content']}
-            for msg in self.conversation_history[-self.context_window:]
+    def _fold_into_summary(self, message: Message):
+        """Add an evicted turn to the rolling summary, dropping its oldest lines past the budget"""
+        line = _summary_line(message)
+        self._summary.append(line)
+        self._summary_token_count += estimate_tokens(line)
+        while self._summary_token_count > self.summary_tokens and len(self._summary) > 1:
+            self._summary_token_count -= estimate_tokens(self._summary.popleft())
+    
+    def get_context(self, query: Optional[str] = None) -> List[Dict[str, str]]:
+        """Get recent conversation context
+        
+        With a token budget, the newest messages that fit are sent and
+        older turns are folded into a leading summary message (when
+        summary_tokens is set); otherwise the last context_window
+        messages are sent. The list is cached until the next message is
+        added, so callers must treat it as read-only.
+        
+        Given a query and a recall index, earlier messages similar to the
+        query that are not already in the context are prepended as a
+        system message.
+        """
+        context = self._recent_context()
+        if query is None or self.recall is None:
+            return context
+        
+        recalled = self.recall.query(query, self.recall_k, exclude={m['content'] for m in context})
+        if not recalled:
+            return context
+        lines = '\n'.join(f"{r['role']}: {' '.join(r['content'].split())}" for r in recalled)
+        return [{'role': 'system', 'content': 'Relevant earlier messages:\n' + lines}] + context
+    
+    def _recent_context(self) -> List[Dict[str, str]]:
+        """Recent turns and rolling summary, cached until the next message"""
+        if self._context is not None:
+            return self._context
+        
+        history = self.conversation_history
+        if not self.token_budget:
+            start = max(0, len(history) - self.context_window)
+        else:
+            start = len(history)
+            used = 0
+            while start > 0 and (used + history[start - 1].tokens <= self.token_budget or start == len(history)):
+                start -= 1
+                used += history[start].tokens
+        
+        context = [
+            {'role': history[i].role, 'content': history[i].content}
+            for i in range(start, len(history))
         ]
+        
+        if self.token_budget and self.summary_tokens:
+            lines = list(self._summary) + [_summary_line(history[i]) for i in range(start)]
+            kept = []
+            remaining = self.summary_tokens
+            for line in reversed(lines):
+                remaining -= estimate_tokens(line)
+                if remaining < 0 and kept:
+                    break
+                kept.append(line)
+            if kept:
+                summary = 'Summary of earlier conversation:\n' + '\n'.join(reversed(kept))
+                context.insert(0, {'role': 'system', 'content': summary})
+        
+        self._context = context
+        return context
     
     def add_preference(self, key: str, value: Any):
         """Store user preference"""
         self.user_preferences[key] = value
+        if self.store is not None:
+            self.store.set_preference(self.session_id, key, value)
     
     def get_preference(self, key: str, default: Any = None) -> Any:
         """Retrieve user preference"""
         return self.user_preferences.get(key, default)
     
-    def add_task(self, task: Dict[str, Any]):
+    def add_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Add an active task"""
-        task['created_at'] = datetime.now().isoformat()
-        self.active_tasks.append(task)
+        task = self.tasks.add(task)
+        if self.store is not None:
+            self.store.save_task(self.session_id, task['id'], task)
+        return task
     
     def complete_task(self, task_id: str):
         """Mark a task as complete"""
-        self.active_tasks = [t for t in self.active_tasks if t.get('id') != task_id]
+        task = self.tasks.complete(task_id)
+        if task is not None and self.store is not None:
+            self.store.save_task(self.session_id, task_id, task, status='completed')
+    
+    def update_task(self, task_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Change fields of a task other than its status and due time"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        task.update(fields)
+        if self.store is not None:
+            self.store.save_task(self.session_id, task_id, task, status=task['status'])
+        return task
+    
+    def reschedule_task(self, task_id: str, due_at: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Move an active task to a new due time"""
+        task = self.tasks.reschedule(task_id, due_at)
+        if task is not None and self.store is not None:
+            self.store.save_task(self.session_id, task_id, task, status=task['status'])
+        return task
+    
+    @property
+    def active_tasks(self) -> List[Dict[str, Any]]:
+        """Active tasks, oldest first"""
+        return self.tasks.with_status('active')
     
     def get_active_tasks(self) -> List[Dict[str, Any]]:
         """Get all active tasks"""
-        return self.active_tasks
+        return self.tasks.with_status('active')
     
     def get_summary(self) -> Dict[str, Any]:
         """Get session summary"""
         return {
             'session_duration': str(datetime.now() - self.session_start),
             'messages_exchanged': len(self.conversation_history),
-            'active_tasks': len(self.active_tasks),
+            'active_tasks': self.tasks.active_count,
             'preferences_learned': len(self.user_preferences)
         }
     
     def clear(self):
         """Clear session memory"""
         self.conversation_history.clear()
-        self.active_tasks.clear()
\ No newline at end of file
+        self.tasks.clear()
+        self._summary.clear()
+        self._summary_token_count = 0
+        self._context = None
+        if self.store is not None:
+            self.store.clear_session(self.session_id)
+        if self.recall is not None:
+            self.recall.clear()
\ No newline at end of file
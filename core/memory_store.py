@@ -0,0 +1,175 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+class MemoryStore:
+    """SQLite-backed long-term memory shared by all sessions in a process
+    
+    Writes are queued and committed in batches: when batch_size writes
+    are pending, by a timer flush_interval seconds after the first of
+    them was queued, or on flush()/process exit.
+    """
+    
+    def __init__(self, path: str, batch_size: int = 20, flush_interval: float = 2.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, tuple]] = []
+        self._last_flush = time.time()
+        self._timer: Optional[threading.Timer] = None
+        
+        self._conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created REAL NOT NULL,
+                metadata TEXT
+            );
+            CREATE INDEX IF NOT EXISTS messages_session_created ON messages (session_id, created);
+            CREATE INDEX IF NOT EXISTS messages_session_role ON messages (session_id, role, created);
+            CREATE TABLE IF NOT EXISTS preferences (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (session_id, key)
+            );
+            CREATE TABLE IF NOT EXISTS tasks (
+                session_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (session_id, task_id)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_session_status ON tasks (session_id, status);
+        ''')
+        atexit.register(self.flush)
+    
+    def _queue(self, sql: str, params: tuple):
+        with self._lock:
+            self._pending.append((sql, params))
+            due = (len(self._pending) >= self.batch_size
+                   or time.time() - self._last_flush >= self.flush_interval)
+            if not due and self._timer is None:
+                # Commit a lone write even if no further writes arrive to trigger it
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Commit every queued write in one transaction"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+            self._last_flush = time.time()
+            if not pending:
+                return
+            with self._conn:
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+    
+    def append_message(self, session_id: str, role: str, content: str, created: float,
+                       metadata: Optional[Dict] = None):
+        """Queue a message for the session's history"""
+        self._queue(
+            'INSERT INTO messages (session_id, role, content, created, metadata) VALUES (?, ?, ?, ?, ?)',
+            (session_id, role, content, created, json.dumps(metadata) if metadata else None)
+        )
+    
+    def get_messages(self, session_id: str, before: Optional[float] = None, limit: int = 50,
+                     role: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Page through a session's history, newest first, optionally before a timestamp"""
+        self.flush()
+        sql = 'SELECT role, content, created, metadata FROM messages WHERE session_id = ?'
+        params: list = [session_id]
+        if role is not None:
+            sql += ' AND role = ?'
+            params.append(role)
+        if before is not None:
+            sql += ' AND created < ?'
+            params.append(before)
+        sql += ' ORDER BY created DESC, id DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {'role': r[0], 'content': r[1], 'created': r[2], 'metadata': json.loads(r[3]) if r[3] else None}
+            for r in rows
+        ]
+    
+    def count_messages(self, session_id: str) -> int:
+        """Total messages stored for a session"""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM messages WHERE session_id = ?', (session_id,)
+            ).fetchone()[0]
+    
+    def set_preference(self, session_id: str, key: str, value: Any):
+        """Queue a preference update"""
+        self._queue(
+            'INSERT OR REPLACE INTO preferences (session_id, key, value) VALUES (?, ?, ?)',
+            (session_id, key, json.dumps(value))
+        )
+    
+    def get_preferences(self, session_id: str) -> Dict[str, Any]:
+        """Load all preferences for a session"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, value FROM preferences WHERE session_id = ?', (session_id,)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+    
+    def save_task(self, session_id: str, task_id: str, task: Dict[str, Any], status: str = 'active'):
+        """Queue a task insert or status change; an updated task keeps its original created time"""
+        self._queue(
+            'INSERT INTO tasks (session_id, task_id, data, status, created) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (session_id, task_id) DO UPDATE SET data = excluded.data, status = excluded.status',
+            (session_id, task_id, json.dumps(task, default=str), status, time.time())
+        )
+    
+    def get_tasks(self, session_id: str, status: str = 'active') -> List[Dict[str, Any]]:
+        """Load a session's tasks with the given status, oldest first"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data FROM tasks WHERE session_id = ? AND status = ? ORDER BY created',
+                (session_id, status)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def clear_session(self, session_id: str):
+        """Delete a session's history and tasks, keeping its preferences"""
+        self._queue('DELETE FROM messages WHERE session_id = ?', (session_id,))
+        self._queue('DELETE FROM tasks WHERE session_id = ?', (session_id,))
+        self.flush()
+
+_stores: Dict[str, MemoryStore] = {}
+_stores_lock = threading.Lock()
+
+def get_memory_store(path: str) -> MemoryStore:
+    """Get the process-wide store for a database path"""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = MemoryStore(path)
+            _stores[path] = store
+        return store
\ No newline at end of file
@@ -44,6 +44,13 @@ class JarvisPersonality:
         "Completed as requested, sir."
     ]
     
+    REMINDERS = [
+        "Pardon the interruption, sir.",
+        "If I may, sir.",
+        "Sir, it's time.",
+        "As you requested, sir."
+    ]
+    
     @staticmethod
     def greeting() -> str:
         """Get a random greeting"""
@@ -92,4 +99,18 @@ class JarvisPersonality:
             f"Sir, I've noticed {context}. Would you like me to...",
             f"Pardon the interruption, sir, but regarding {context}..."
         ]
-        return random.choice(suggestions)
\ No newline at end of file
+        return random.choice(suggestions)
+    
+    @staticmethod
+    def reminder(content: str) -> str:
+        """Announce a reminder that has come due"""
+        return f"{random.choice(JarvisPersonality.REMINDERS)} {content}"
+    
+    @staticmethod
+    def phrase_bank() -> List[str]:
+        """Every canned line, for pre-rendering speech"""
+        return (
+            JarvisPersonality.GREETINGS + JarvisPersonality.ACKNOWLEDGMENTS
+            + JarvisPersonality.THINKING + JarvisPersonality.ERRORS
+            + JarvisPersonality.COMPLETIONS + JarvisPersonality.REMINDERS
+        )
\ No newline at end of file
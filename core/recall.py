@@ -0,0 +1,259 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r'\w+')
+
+class HashingEmbedder:
+    """Offline text embedding from hashed word unigrams and bigrams
+    
+    No model download and no network: each feature is hashed with crc32
+    (stable across processes) into a fixed number of signed buckets, then
+    the vector is L2-normalised so a dot product is a cosine similarity.
+    """
+    
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+    
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """Chroma embedding-function interface"""
+        return [self.embed(text).tolist() for text in input]
+
+class VectorIndex:
+    """In-memory inverted index over sparse embeddings with exact top-k search
+    
+    Hashed embeddings have only a dozen or so non-zero buckets, so each
+    bucket keeps a growable posting list of (row, weight) pairs. A query
+    only scans the posting lists of its own buckets instead of the whole
+    row-by-dimension matrix, which keeps lookups in the low milliseconds
+    at 100k+ messages while giving the same scores as a dense dot product.
+    """
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._rows = [np.empty(16, dtype=np.int32) for _ in range(dim)]
+        self._weights = [np.empty(16, dtype=np.float32) for _ in range(dim)]
+        self._counts = [0] * dim
+        self.records: List[Dict[str, Any]] = []
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def _append(self, bucket: int, row: int, weight: float):
+        count = self._counts[bucket]
+        if count == len(self._rows[bucket]):
+            self._rows[bucket] = np.resize(self._rows[bucket], count * 2)
+            self._weights[bucket] = np.resize(self._weights[bucket], count * 2)
+        self._rows[bucket][count] = row
+        self._weights[bucket][count] = weight
+        self._counts[bucket] = count + 1
+    
+    def add(self, vector: np.ndarray, record: Dict[str, Any]):
+        """Append one embedding to the posting lists of its non-zero buckets"""
+        row = len(self.records)
+        for bucket in np.flatnonzero(vector):
+            self._append(bucket, row, vector[bucket])
+        self.records.append(record)
+    
+    def search(self, vector: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        """Return the k most similar records with their scores, best first"""
+        size = len(self.records)
+        if not size or k <= 0:
+            return []
+        scores = np.zeros(size, dtype=np.float32)
+        for bucket in np.flatnonzero(vector):
+            count = self._counts[bucket]
+            scores[self._rows[bucket][:count]] += vector[bucket] * self._weights[bucket][:count]
+        k = min(k, size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [dict(self.records[i], score=float(scores[i])) for i in top]
+    
+    def clear(self):
+        """Drop every stored embedding"""
+        self._counts = [0] * self.dim
+        self.records = []
+    
+    def save(self, path: str):
+        """Write posting lists and records to an .npz file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        counts = np.array(self._counts, dtype=np.int64)
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                counts=counts,
+                rows=np.concatenate([r[:n] for r, n in zip(self._rows, self._counts)]),
+                weights=np.concatenate([w[:n] for w, n in zip(self._weights, self._counts)]),
+                records=np.array(json.dumps(self.records))
+            )
+    
+    @classmethod
+    def load(cls, path: str, dim: int) -> 'VectorIndex':
+        """Read an index written by save(), or start empty if it is missing or mismatched"""
+        index = cls(dim)
+        if not os.path.exists(path):
+            return index
+        data = np.load(path)
+        counts = data['counts']
+        if len(counts) != dim:
+            return index
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        rows, weights = data['rows'], data['weights']
+        for bucket in range(dim):
+            start, end = offsets[bucket], offsets[bucket + 1]
+            capacity = max(16, int(end - start) * 2)
+            index._rows[bucket] = np.resize(rows[start:end], capacity)
+            index._weights[bucket] = np.resize(weights[start:end], capacity)
+            index._counts[bucket] = int(end - start)
+        index.records = json.loads(str(data['records']))
+        return index
+
+class ChromaIndex:
+    """Persistent chromadb collection using the same offline embedder"""
+    
+    def __init__(self, path: Optional[str], embedder: HashingEmbedder, collection: str):
+        import chromadb
+        self._client = chromadb.PersistentClient(path=path) if path else chromadb.EphemeralClient()
+        self._name = collection
+        self._embedder = embedder
+        self._open()
+    
+    def _open(self):
+        self._collection = self._client.get_or_create_collection(
+            self._name, embedding_function=self._embedder, metadata={'hnsw:space': 'cosine'}
+        )
+        self._next_id = self._collection.count()
+    
+    def __len__(self) -> int:
+        return self._collection.count()
+    
+    def add(self, vector: np.ndarray, record: Dict[str, Any]):
+        self._collection.add(
+            ids=[str(self._next_id)],
+            embeddings=[vector.tolist()],
+            documents=[record['content']],
+            metadatas=[{'role': record['role'], 'created': record['created']}]
+        )
+        self._next_id += 1
+    
+    def search(self, vector: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        if k <= 0 or not len(self):
+            return []
+        result = self._collection.query(query_embeddings=[vector.tolist()], n_results=k)
+        return [
+            {'role': meta['role'], 'content': doc, 'created': meta['created'], 'score': 1.0 - distance}
+            for doc, meta, distance in zip(result['documents'][0], result['metadatas'][0], result['distances'][0])
+        ]
+    
+    def clear(self):
+        self._client.delete_collection(self._name)
+        self._open()
+    
+    def save(self, path: str):
+        pass  # chromadb persists on write
+
+class SemanticRecall:
+    """Embed past messages and recall the ones most relevant to a new message
+    
+    The numpy backend keeps the index in memory and, given a path, saves it
+    as an .npz file at exit and reloads it on start. The chroma backend
+    stores it in a persistent chromadb collection instead.
+    """
+    
+    def __init__(self, backend: str = 'numpy', path: Optional[str] = None, dim: int = 256,
+                 min_score: float = 0.3, collection: str = 'jarvis_recall'):
+        self.embedder = HashingEmbedder(dim)
+        self.min_score = min_score
+        self.path = path
+        self._lock = threading.Lock()
+        
+        if backend == 'chroma':
+            self.index = ChromaIndex(path, self.embedder, collection)
+        else:
+            self.index = VectorIndex.load(path, dim) if path else VectorIndex(dim)
+            if path:
+                atexit.register(self.save)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def add(self, role: str, content: str, created: Optional[float] = None):
+        """Index one message"""
+        vector = self.embedder.embed(content)
+        if not vector.any():
+            return
+        with self._lock:
+            self.index.add(vector, {'role': role, 'content': content, 'created': created or time.time()})
+    
+    def query(self, text: str, k: int = 3, exclude: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Find up to k stored messages similar to text, skipping any whose content is in exclude"""
+        vector = self.embedder.embed(text)
+        if not vector.any() or k <= 0:
+            return []
+        exclude = exclude or set()
+        with self._lock:
+            candidates = self.index.search(vector, k + len(exclude))
+        return [
+            c for c in candidates
+            if c['score'] >= self.min_score and c['content'] not in exclude
+        ][:k]
+    
+    def clear(self):
+        """Forget every indexed message"""
+        with self._lock:
+            self.index.clear()
+    
+    def save(self):
+        """Persist the index, if it has a path"""
+        if self.path:
+            with self._lock:
+                self.index.save(self.path)
+
+_recalls: Dict[Tuple[str, str], SemanticRecall] = {}
+_recalls_lock = threading.Lock()
+
+def get_recall(session_id: str, backend: str = 'numpy', directory: Optional[str] = None,
+               dim: int = 256, min_score: float = 0.3) -> SemanticRecall:
+    """Get the process-wide recall index for a session; in memory only when directory is None"""
+    if session_id in ('', '.', '..') or os.path.basename(session_id) != session_id:
+        raise ValueError(f"Session id {session_id!r} cannot name a recall index")
+    with _recalls_lock:
+        recall = _recalls.get((backend, session_id))
+        if recall is None:
+            if backend == 'chroma':
+                recall = SemanticRecall(backend, directory, dim, min_score, collection=f"recall_{session_id}")
+            else:
+                path = os.path.join(directory, f"{session_id}.npz") if directory else None
+                recall = SemanticRecall(backend, path, dim, min_score)
+            _recalls[(backend, session_id)] = recall
+        return recall
+
+def release_recall(session_id: str, backend: str = 'numpy'):
+    """Save a session's recall index and drop it from the process-wide registry"""
+    with _recalls_lock:
+        recall = _recalls.pop((backend, session_id), None)
+    if recall is not None:
+        recall.save()
+        atexit.unregister(recall.save)
\ No newline at end of file
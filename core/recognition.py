@@ -0,0 +1,133 @@
+import time
+import speech_recognition as sr
+from typing import List, Dict, Optional, Type
+
+class RecognitionBackend:
+    """Turns captured audio into text
+    
+    transcribe() returns None when no speech was understood and raises
+    sr.RequestError when the backend itself is unusable (offline,
+    missing package or model), so the next backend can be tried.
+    """
+    
+    name = 'base'
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+    
+    def transcribe(self, audio: sr.AudioData) -> Optional[str]:
+        raise NotImplementedError
+
+class GoogleBackend(RecognitionBackend):
+    """Google Web Speech API (network)"""
+    
+    name = 'google'
+    
+    def transcribe(self, audio: sr.AudioData) -> Optional[str]:
+        try:
+            return self.recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            return None
+
+class WhisperBackend(RecognitionBackend):
+    """Local Whisper model (needs openai-whisper); the model loads once and stays cached"""
+    
+    name = 'whisper'
+    def __init__(self, recognizer: sr.Recognizer, model: str = 'base'):
+        super().__init__(recognizer)
+        self.model = model
+    
+    def transcribe(self, audio: sr.AudioData) -> Optional[str]:
+        try:
+            text = self.recognizer.recognize_whisper(audio, model=self.model, language='english')
+        except ImportError as e:
+            raise sr.RequestError(f"whisper is not installed: {e}")
+        except sr.UnknownValueError:
+            return None
+        return text.strip() or None
+
+class SphinxBackend(RecognitionBackend):
+    """CMU PocketSphinx (needs pocketsphinx); fast and fully offline, less accurate"""
+    
+    name = 'sphinx'
+    def transcribe(self, audio: sr.AudioData) -> Optional[str]:
+        try:
+            return self.recognizer.recognize_sphinx(audio) or None
+        except sr.UnknownValueError:
+            return None
+
+BACKENDS: Dict[str, Type[RecognitionBackend]] = {
+    backend.name: backend for backend in (GoogleBackend, WhisperBackend, SphinxBackend)
+}
+
+class SpeechListener:
+    """Capture one utterance and transcribe it with the first working backend
+    
+    A backend that fails is skipped for retry_after seconds. Ambient-noise
+    calibration runs once and is reused for
+    calibration_ttl seconds (or until a capture hears nothing it can
+    understand), instead of costing half a second on every turn. The
+    recognizer's energy-based voice activity detection ends a capture
+    after pause_threshold seconds of silence.
+    """
+    
+    def __init__(self, backends: List[str], calibration_ttl: float = 300, pause_threshold: float = 0.5,
+                 phrase_time_limit: Optional[float] = 15):
+        self.recognizer = sr.Recognizer()
+        self.recognizer.pause_threshold = pause_threshold
+        self.recognizer.non_speaking_duration = min(pause_threshold, self.recognizer.non_speaking_duration)
+        self.calibration_ttl = calibration_ttl
+        self.phrase_time_limit = phrase_time_limit
+        self.backends = [BACKENDS[name](self.recognizer) for name in backends if name in BACKENDS]
+        if not self.backends:
+            raise ValueError(f"No known speech recognition backend in {backends}; choose from {list(BACKENDS)}")
+        self._calibrated_at: Optional[float] = None
+        self._unavailable_until: Dict[str, float] = {}
+        self.retry_after = 60.0
+    
+    def _calibrate(self, source: sr.AudioSource):
+        now = time.time()
+        if self._calibrated_at is None or now - self._calibrated_at > self.calibration_ttl:
+            self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            self._calibrated_at = now
+    
+    def invalidate_calibration(self):
+        """Recalibrate before the next microphone capture"""
+        self._calibrated_at = None
+    
+    def capture(self, source: sr.AudioSource, timeout: Optional[float] = None) -> sr.AudioData:
+        """Record until the speaker pauses; raises sr.WaitTimeoutError if nobody starts talking"""
+        if isinstance(source, sr.Microphone):
+            self._calibrate(source)
+        return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=self.phrase_time_limit)
+    
+    def transcribe(self, audio: sr.AudioData) -> Optional[str]:
+        """Try each backend in order, moving on when one is unreachable or unavailable"""
+        errors = []
+        now = time.time()
+        for backend in self.backends:
+            # Skip a backend that just failed rather than paying its timeout every turn
+            if self._unavailable_until.get(backend.name, 0) > now:
+                continue
+            try:
+                text = backend.transcribe(audio)
+            except sr.RequestError as e:
+                errors.append(f"{backend.name}: {e}")
+                self._unavailable_until[backend.name] = now + self.retry_after
+                continue
+            if text is None:
+                # Noise we could not make sense of; the room may have changed
+                self.invalidate_calibration()
+            return text
+        raise sr.RequestError('; '.join(errors) or 'every speech backend failed recently')
+    
+    def listen(self, timeout: Optional[float] = None, source: Optional[sr.AudioSource] = None) -> Optional[str]:
+        """Capture and transcribe one utterance from the microphone, or from source if given"""
+        if source is not None:
+            return self.transcribe(self.capture(source, timeout))
+        with sr.Microphone() as microphone:
+            return self.transcribe(self.capture(microphone, timeout))
+    
+    def transcribe_file(self, path: str) -> Optional[str]:
+        """Transcribe the first utterance in a WAV, AIFF or FLAC file"""
+        with sr.AudioFile(path) as source:
+            return self.transcribe(self.capture(source))
\ No newline at end of file
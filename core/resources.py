@@ -0,0 +1,74 @@
+import threading
+from typing import Dict, Any, Callable, TypeVar
+from utils.bhindi_client import BhindiClient, AsyncBhindiClient
+
+T = TypeVar('T')
+
+_resources: Dict[str, Any] = {}
+_resources_lock = threading.Lock()
+_creating: Dict[str, threading.Lock] = {}
+_references: Dict[str, int] = {}
+
+def shared(name: str, factory: Callable[[], T]) -> T:
+    """Create a component once per process and return the same instance on every later call
+    
+    Safe to call from any thread. Each name has its own creation lock, so
+    a slow factory only holds up callers asking for the same component.
+    Every call takes a reference; callers that own a component's lifetime
+    hand theirs back with release_shared().
+    """
+    with _resources_lock:
+        resource = _resources.get(name)
+        if resource is not None:
+            _references[name] += 1
+            return resource
+        lock = _creating.setdefault(name, threading.Lock())
+    with lock:
+        with _resources_lock:
+            resource = _resources.get(name)
+            if resource is not None:
+                _references[name] += 1
+                return resource
+        resource = factory()
+        with _resources_lock:
+            _resources[name] = resource
+            _references[name] = 1
+        return resource
+
+def get_bhindi_client() -> BhindiClient:
+    """The process-wide Bhindi client: one HTTP pool, response cache and agent registry for every session"""
+    return shared('bhindi', BhindiClient)
+
+def get_async_bhindi_client() -> AsyncBhindiClient:
+    """The process-wide async Bhindi client, sharing the sync client's agent registry and circuit breaker"""
+    sync = get_bhindi_client()
+    return shared('bhindi_async', lambda: AsyncBhindiClient(agents=sync.agents, breaker=sync.breaker))
+
+def get_voice():
+    """The process-wide VoiceInterface: one speech queue, engine and recognizer for the machine's speakers and microphone"""
+    from core.voice import VoiceInterface
+    return shared('voice', VoiceInterface)
+
+def release_shared(name: str) -> Any:
+    """Drop one reference to a shared component
+    
+    When the last reference goes, the component is forgotten (the next
+    shared() call creates it afresh) and returned so the caller can shut
+    it down; otherwise this returns None.
+    """
+    with _resources_lock:
+        if name not in _resources:
+            return None
+        _references[name] -= 1
+        if _references[name] > 0:
+            return None
+        del _references[name]
+        _creating.pop(name, None)
+        return _resources.pop(name)
+
+def clear_shared():
+    """Forget every shared component, e.g. between benchmark runs"""
+    with _resources_lock:
+        _resources.clear()
+        _creating.clear()
+        _references.clear()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Set
+from core.memory import SessionMemory
+from utils.bhindi_client import BhindiClient
+from utils.time_parser import Schedule, next_cron_time
+
+class LocalScheduler:
+    """Fire reminders in-process from the session's task store
+    
+    One background thread sleeps until the earliest due task (the task
+    store's min-heap), so thousands of pending reminders cost nothing
+    until one comes due. Recurring tasks are moved to their next cron
+    time after firing; one-off tasks are completed. Schedules the Bhindi
+    scheduler could not take are kept locally and re-sent every
+    sync_interval seconds until it accepts them.
+    """
+    
+    def __init__(self, memory: SessionMemory, bhindi: BhindiClient, sync_interval: float = 60):
+        self.memory = memory
+        self.bhindi = bhindi
+        self.sync_interval = sync_interval
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._wakeup = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._next_sync = 0.0
+        self._unsynced: Set[str] = {
+            task['id'] for task in memory.get_active_tasks() if not task.get('synced', True)
+        }
+    
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call back with each task as it fires; callbacks run on the scheduler thread"""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Stop calling back a listener added with add_listener()"""
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+    
+    def add(self, content: str, schedule: Schedule, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Track a schedule as an active task, whether or not Bhindi accepted it"""
+        data = result.get('data') if isinstance(result.get('data'), dict) else {}
+        synced = bool(result.get('success'))
+        with self._wakeup:
+            task = self.memory.add_task({
+                'description': content,
+                'cron': schedule.cron,
+                'recurring': schedule.recurring,
+                'due_at': schedule.next_run.timestamp() if schedule.next_run else None,
+                'schedule_id': result.get('id') or data.get('id'),
+                'synced': synced
+            })
+            if not synced:
+                self._unsynced.add(task['id'])
+                self._next_sync = time.time() + self.sync_interval
+            self._wakeup.notify()
+        self.start()
+        return task
+    
+    def start(self):
+        """Start the firing thread if it is not already running"""
+        with self._wakeup:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='jarvis-scheduler', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the firing thread"""
+        with self._wakeup:
+            self._running = False
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _timeout(self, now: float) -> Optional[float]:
+        """Seconds until the next task is due or the next sync is owed, or None to wait for add()"""
+        deadlines = []
+        task = self.memory.tasks.next_due()
+        if task is not None:
+            deadlines.append(task['due_at'])
+        if self._unsynced:
+            deadlines.append(self._next_sync)
+        return max(0.0, min(deadlines) - now) if deadlines else None
+    
+    def _run(self):
+        while True:
+            with self._wakeup:
+                if not self._running:
+                    return
+                timeout = self._timeout(time.time())
+                if timeout is None or timeout > 0:
+                    self._wakeup.wait(timeout)
+                    continue
+                now = time.time()
+                fired = self.memory.tasks.pop_due(now)
+                for task in fired:
+                    self._advance(task, now)
+                sync = bool(self._unsynced) and now >= self._next_sync
+                if sync:
+                    self._next_sync = now + self.sync_interval
+            
+            for task in fired:
+                self._fire(task)
+            if sync:
+                self.sync()
+    
+    def _advance(self, task: Dict[str, Any], now: float):
+        """Move a fired task to its next cron time, or complete it"""
+        following = None
+        if task.get('recurring') and task.get('cron'):
+            following = next_cron_time(task['cron'], datetime.fromtimestamp(now))
+        if following is not None:
+            self.memory.reschedule_task(task['id'], following.timestamp())
+        else:
+            self.memory.complete_task(task['id'])
+            self._unsynced.discard(task['id'])
+    
+    def _fire(self, task: Dict[str, Any]):
+        for callback in list(self._listeners):
+            try:
+                callback(task)
+            except Exception as e:
+                print(f"❌ Reminder callback error: {e}")
+    
+    def sync(self) -> int:
+        """Send locally kept schedules to Bhindi, returning how many it accepted"""
+        with self._wakeup:
+            pending = [self.memory.tasks.get(task_id) for task_id in self._unsynced]
+            pending = [task for task in pending if task is not None and task['status'] == 'active']
+            self._unsynced = {task['id'] for task in pending}
+        
+        accepted = 0
+        for task in pending:
+            result = self.bhindi.create_schedule(
+                content=task['description'],
+                cron=task['cron'],
+                schedule_type='reminder',
+                recurring=task['recurring']
+            )
+            if not result.get('success'):
+                # Still unreachable; try the rest next interval
+                break
+            data = result.get('data') if isinstance(result.get('data'), dict) else {}
+            with self._wakeup:
+                self.memory.update_task(task['id'], {
+                    'synced': True,
+                    'schedule_id': result.get('id') or data.get('id')
+                })
+                self._unsynced.discard(task['id'])
+            accepted += 1
+        return accepted
+    
+    def pending_sync(self) -> int:
+        """Number of local schedules Bhindi has not accepted yet"""
+        return len(self._unsynced)
\ No newline at end of file
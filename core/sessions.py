@@ -0,0 +1,123 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, Any, Callable, Optional, Set
+
+# Session ids end up in file names (recall indexes) and collection names
+SESSION_ID = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+class Session:
+    """A pooled brain and the state the API server keeps beside it"""
+    
+    def __init__(self, session_id: str, brain):
+        self.session_id = session_id
+        self.brain = brain
+        # One turn at a time per session; different sessions run concurrently
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self.turns = 0
+        self.listeners: Set[asyncio.Queue] = set()
+        self._loop = asyncio.get_running_loop()
+        brain.on_reminder(self._remind)
+    
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked() or bool(self.listeners)
+    
+    def _remind(self, text: str, task: Dict[str, Any]):
+        """Forward a reminder from the scheduler thread to every attached listener"""
+        event = {'type': 'reminder', 'message': text, 'task_id': task['id']}
+        for listener in list(self.listeners):
+            self._loop.call_soon_threadsafe(listener.put_nowait, event)
+    
+    def touch(self):
+        self.last_used = time.monotonic()
+
+class SessionPool:
+    """Brains keyed by session id, created on first use and evicted when idle
+    
+    Sessions unused for idle_timeout seconds are closed by evict_idle();
+    past max_sessions, the least recently used idle session is closed to
+    make room. A session in the middle of a turn, or with a WebSocket
+    attached, is never evicted. Brains are built on executor (opening the
+    memory store and recall index blocks), never on the event loop.
+    """
+    
+    def __init__(self, brain_factory: Callable[[str], Any], max_sessions: int = 1000, idle_timeout: float = 900,
+                 executor: Optional[Executor] = None):
+        self.brain_factory = brain_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.executor = executor
+        self._sessions: 'OrderedDict[str, Session]' = OrderedDict()
+        self._opening: Dict[str, asyncio.Future] = {}
+        self.created = 0
+        self.evicted = 0
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    async def get(self, session_id: str) -> Session:
+        """The session's pooled brain, created (and room made for it) if needed"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            # Requests for a session that is still opening wait for the same brain
+            opening = self._opening.get(session_id)
+            if opening is None:
+                opening = self._opening[session_id] = asyncio.ensure_future(self._open(session_id))
+                opening.add_done_callback(lambda _: self._opening.pop(session_id, None))
+            session = await asyncio.shield(opening)
+        self._sessions.move_to_end(session_id)
+        session.touch()
+        return session
+    
+    async def _open(self, session_id: str) -> Session:
+        if len(self._sessions) >= self.max_sessions:
+            await self._evict_oldest()
+        loop = asyncio.get_running_loop()
+        brain = await loop.run_in_executor(self.executor, self.brain_factory, session_id)
+        session = Session(session_id, brain)
+        self._sessions[session_id] = session
+        self.created += 1
+        return session
+    
+    async def _close(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        self.evicted += 1
+        try:
+            await session.brain.aclose()
+        except Exception as e:
+            print(f"❌ Error closing session {session_id}: {e}")
+    
+    async def _evict_oldest(self):
+        for session_id, session in self._sessions.items():
+            if not session.busy:
+                await self._close(session_id)
+                return
+    
+    async def evict_idle(self) -> int:
+        """Close sessions idle longer than idle_timeout; returns how many were closed"""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [sid for sid, s in self._sessions.items() if s.last_used < cutoff and not s.busy]
+        for session_id in idle:
+            await self._close(session_id)
+        return len(idle)
+    
+    async def close(self):
+        """Close every session"""
+        for session_id in list(self._sessions):
+            await self._close(session_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'sessions': len(self._sessions),
+            'busy': sum(1 for s in self._sessions.values() if s.busy),
+            'created': self.created,
+            'evicted': self.evicted,
+            'max_sessions': self.max_sessions,
+            'idle_timeout': self.idle_timeout
+        }
\ No newline at end of file
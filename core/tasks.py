@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import uuid
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+class TaskStore:
+    """Tasks indexed by id, status and due time
+    
+    Tasks are plain dicts with at least 'id' and 'status'; scheduled tasks
+    also carry 'due_at' (a Unix timestamp). Completion and lookups are
+    O(1), and a min-heap keyed on due_at finds upcoming tasks without a
+    scan. Each task has at most one live heap entry; entries left behind
+    by completion or rescheduling are dropped lazily, and the heap is
+    rebuilt once most of it is stale.
+    """
+    
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._due: List[Tuple[float, int, str]] = []
+        self._due_entry: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self.active_count = 0
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+    
+    def add(self, task: Dict[str, Any], status: str = 'active') -> Dict[str, Any]:
+        """Index a task, giving it an id and creation time if it has none"""
+        task.setdefault('id', uuid.uuid4().hex[:12])
+        task.setdefault('created_at', datetime.now().isoformat())
+        if task['id'] in self._tasks:
+            self._unindex(self._tasks[task['id']])
+        task['status'] = task.get('status') or status
+        self._tasks[task['id']] = task
+        self._index(task)
+        return task
+    
+    def _index(self, task: Dict[str, Any]):
+        self._by_status.setdefault(task['status'], {})[task['id']] = None
+        if task['status'] == 'active':
+            self.active_count += 1
+            self._push(task)
+    
+    def _unindex(self, task: Dict[str, Any]):
+        self._by_status.get(task['status'], {}).pop(task['id'], None)
+        self._due_entry.pop(task['id'], None)
+        if task['status'] == 'active':
+            self.active_count -= 1
+    
+    def _push(self, task: Dict[str, Any]):
+        """Make a heap entry for the task's due time the only live one"""
+        if task.get('due_at') is None:
+            self._due_entry.pop(task['id'], None)
+            return
+        sequence = next(self._sequence)
+        self._due_entry[task['id']] = sequence
+        heapq.heappush(self._due, (task['due_at'], sequence, task['id']))
+    
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a task by id"""
+        return self._tasks.get(task_id)
+    
+    def set_status(self, task_id: str, status: str) -> Optional[Dict[str, Any]]:
+        """Move a task to another status, returning it or None if it is unknown"""
+        task = self._tasks.get(task_id)
+        if task is None or task['status'] == status:
+            return task
+        self._unindex(task)
+        task['status'] = status
+        self._index(task)
+        self._compact()
+        return task
+    
+    def complete(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a task completed"""
+        return self.set_status(task_id, 'completed')
+    
+    def reschedule(self, task_id: str, due_at: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Change an active task's due time"""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        task['due_at'] = due_at
+        if task['status'] == 'active':
+            self._push(task)
+            self._compact()
+        return task
+    
+    def with_status(self, status: str) -> List[Dict[str, Any]]:
+        """Tasks with a status, oldest first"""
+        # Copy the ids first; the scheduler thread may change the index meanwhile
+        ids = list(self._by_status.get(status, {}))
+        return [self._tasks[task_id] for task_id in ids if task_id in self._tasks]
+    
+    def _live(self, entry: Tuple[float, int, str]) -> bool:
+        return self._due_entry.get(entry[2]) == entry[1]
+    
+    def _compact(self):
+        if len(self._due) > 32 and len(self._due) > 2 * len(self._due_entry):
+            self._due = [entry for entry in self._due if self._live(entry)]
+            heapq.heapify(self._due)
+    
+    def next_due(self) -> Optional[Dict[str, Any]]:
+        """The active task due soonest, or None"""
+        while self._due and not self._live(self._due[0]):
+            heapq.heappop(self._due)
+        return self._tasks[self._due[0][2]] if self._due else None
+    
+    def upcoming(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Up to limit active tasks in due order"""
+        entries = heapq.nsmallest(limit, (entry for entry in self._due if self._live(entry)))
+        return [self._tasks[entry[2]] for entry in entries]
+    
+    def pop_due(self, now: float) -> List[Dict[str, Any]]:
+        """Remove and return active tasks due at or before now from the due heap
+        
+        The tasks stay active; callers complete or reschedule them.
+        """
+        due = []
+        while self._due and self._due[0][0] <= now:
+            entry = heapq.heappop(self._due)
+            if self._live(entry):
+                del self._due_entry[entry[2]]
+                due.append(self._tasks[entry[2]])
+        return due
+    
+    def clear(self):
+        """Drop every task"""
+        self._tasks.clear()
+        self._by_status.clear()
+        self._due.clear()
+        self._due_entry.clear()
+        self.active_count = 0
\ No newline at end of file
@@ -0,0 +1,93 @@
+import hashlib
+import os
+from typing import Dict, Any, Set, Iterable, Tuple
+
+class AudioCache:
+    """Content-addressed store of synthesized speech on disk
+    
+    Files are named by the sha256 of the voice settings and the text, so
+    a phrase is rendered once per voice and never needs invalidating.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def key(self, voice: str, text: str) -> str:
+        return hashlib.sha256(f"{voice}\0{' '.join(text.split())}".encode('utf-8')).hexdigest()
+    
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+class CachedAudioEngine:
+    """Render speech to audio with pyttsx3 and play it with sounddevice
+    
+    Phrases passed to warm() (the personality's canned lines) are kept
+    in the on-disk AudioCache and in memory once loaded, so they play
+    without any synthesis. Other text is rendered fresh each time.
+    Implements the synthesize()/play()/wait()/stop()/warm() interface
+    that SpeechWorker pipelines; like the pyttsx3 engine it wraps, it is
+    only used from the speech worker thread.
+    """
+    
+    def __init__(self, engine, cache: AudioCache, phrases: Iterable[str] = ()):
+        import sounddevice
+        import soundfile
+        self._sd = sounddevice
+        self._sf = soundfile
+        self.engine = engine
+        self.cache = cache
+        self.phrases: Set[str] = {' '.join(p.split()) for p in phrases}
+        self._loaded: Dict[str, Tuple[Any, int]] = {}
+        self._voice = '|'.join(str(engine.getProperty(name)) for name in ('voice', 'rate', 'volume'))
+        self.hits = 0
+        self.misses = 0
+    
+    def warm(self, text: str):
+        """Mark text as cacheable and render it now if it is not on disk yet"""
+        self.phrases.add(' '.join(text.split()))
+        self.synthesize(text)
+    
+    def synthesize(self, text: str) -> Tuple[Any, int]:
+        """Audio samples and sample rate for text, from the cache when possible"""
+        normalized = ' '.join(text.split())
+        key = self.cache.key(self._voice, normalized)
+        audio = self._loaded.get(key)
+        if audio is not None:
+            self.hits += 1
+            return audio
+        
+        path = self.cache.path(key)
+        cacheable = normalized in self.phrases
+        if cacheable and os.path.exists(path):
+            self.hits += 1
+        else:
+            self.misses += 1
+            target = path if cacheable else path + '.tmp'
+            partial = target + '.part'
+            self.engine.save_to_file(normalized, partial)
+            self.engine.runAndWait()
+            os.replace(partial, target)
+            path = target
+        
+        data, samplerate = self._sf.read(path, dtype='float32')
+        if cacheable:
+            self._loaded[key] = (data, samplerate)
+        else:
+            os.remove(path)
+        return data, samplerate
+    
+    def play(self, audio: Tuple[Any, int]):
+        """Start playing without blocking"""
+        data, samplerate = audio
+        self._sd.play(data, samplerate)
+    
+    def wait(self):
+        """Block until playback ends or is stopped"""
+        self._sd.wait()
+    
+    def stop(self):
+        self._sd.stop()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'misses': self.misses, 'phrases': len(self.phrases)}
\ No newline at end of file
@@ -0,0 +1,295 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable, Iterable
+
+# Lower numbers are spoken first
+PRIORITY_URGENT = 0  # reminders, errors
+PRIORITY_NORMAL = 1  # replies
+PRIORITY_LOW = 2     # greetings, suggestions
+
+class Utterance:
+    """A queued piece of speech; wait() blocks until it is spoken, merged away or dropped
+    
+    reply is the first utterance of the reply this one continues (itself
+    when it starts one).
+    """
+    
+    __slots__ = ('text', 'priority', 'reply', 'queued_at', 'done', 'spoken', 'dropped')
+    
+    def __init__(self, text: str, priority: int, reply: Optional['Utterance'] = None):
+        self.text = text
+        self.priority = priority
+        self.reply = reply or self
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.spoken = False
+        self.dropped = False
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until handled; True if it was actually spoken"""
+        self.done.wait(timeout)
+        return self.spoken
+
+class SilentEngine:
+    """Stand-in for a pyttsx3 engine on headless machines
+    
+    Records what it is asked to say and takes seconds_per_char per
+    character to "speak" it, so queueing behaviour can be exercised
+    without audio hardware.
+    """
+    
+    def __init__(self, seconds_per_char: float = 0.0):
+        self.seconds_per_char = seconds_per_char
+        self.spoken: List[str] = []
+        self._pending: List[str] = []
+        self._stopped = threading.Event()
+    
+    def say(self, text: str):
+        self._pending.append(text)
+    
+    def runAndWait(self):
+        self._stopped.clear()
+        pending, self._pending = self._pending, []
+        for text in pending:
+            if self._stopped.wait(len(text) * self.seconds_per_char):
+                return
+            self.spoken.append(text)
+    
+    def stop(self):
+        self._stopped.set()
+
+class SpeechWorker:
+    """Speak queued utterances one at a time on a single long-lived thread
+    
+    The engine is created by engine_factory on the worker thread, since
+    pyttsx3 drivers expect to be driven from the thread that made them.
+    The queue is bounded by replies rather than sentences: when
+    max_queue replies are waiting, a new one replaces the lowest-priority
+    queued reply if it outranks it, and is dropped otherwise. Sentences
+    that continue a reply (say(..., follows=previous)) are always queued
+    behind it, so a long reply is never cut short; they are only dropped
+    along with the rest of their reply. For plain pyttsx3-style engines, adjacent queued
+    utterances of the same priority are merged into one engine call
+    while they fit in merge_chars.
+    """
+    
+    def __init__(self, engine_factory: Callable[[], Any], max_queue: int = 32, merge_chars: int = 120):
+        self.engine_factory = engine_factory
+        self.max_queue = max_queue
+        self.merge_chars = merge_chars
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._ready = threading.Condition()
+        self._engine = None
+        self._current: List[Utterance] = []
+        self._warm: deque = deque()
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+        self._latencies: deque = deque(maxlen=200)
+        self._counts = {'queued': 0, 'spoken': 0, 'merged': 0, 'dropped': 0, 'cancelled': 0, 'errors': 0}
+    
+    @property
+    def speaking(self) -> bool:
+        """Whether the engine is currently speaking"""
+        return bool(self._current)
+    
+    def say(self, text: str, priority: int = PRIORITY_NORMAL, barge_in: bool = False,
+            follows: Optional[Utterance] = None) -> Utterance:
+        """Queue text; with barge_in, cut off current speech and drop everything queued first
+        
+        follows is the previous sentence of the same reply; the text is then
+        queued whatever the queue length, unless that sentence was dropped.
+        """
+        utterance = Utterance(text, priority, follows.reply if follows is not None else None)
+        with self._ready:
+            if barge_in:
+                self._cancel_locked()
+            if follows is not None:
+                if follows.dropped:
+                    self._drop_locked([utterance])
+                    return utterance
+            elif len({id(u.reply) for _, _, u in self._queue}) >= self.max_queue:
+                worst = max(self._queue)
+                if worst[0] <= priority:
+                    self._drop_locked([utterance])
+                    return utterance
+                # The most recently queued of the lowest-priority replies goes, all of it
+                victims = [entry for entry in self._queue if entry[2].reply is worst[2].reply]
+                self._queue = [entry for entry in self._queue if entry[2].reply is not worst[2].reply]
+                heapq.heapify(self._queue)
+                self._drop_locked([u for _, _, u in victims])
+            heapq.heappush(self._queue, (priority, next(self._sequence), utterance))
+            self._counts['queued'] += 1
+            self._ensure_thread()
+            self._ready.notify()
+        return utterance
+    
+    def cancel(self):
+        """Stop the current utterance and drop everything queued"""
+        with self._ready:
+            self._cancel_locked()
+    
+    def _drop_locked(self, utterances: List[Utterance]):
+        for utterance in utterances:
+            utterance.dropped = True
+            utterance.done.set()
+        self._counts['dropped'] += len(utterances)
+    
+    def _cancel_locked(self):
+        self._generation += 1
+        for _, _, utterance in self._queue:
+            utterance.dropped = True
+            utterance.done.set()
+        for utterance in self._current:
+            # Later sentences of a reply that was cut off are not spoken either
+            utterance.dropped = True
+        self._counts['cancelled'] += len(self._queue) + len(self._current)
+        self._queue.clear()
+        if self._current and self._engine is not None:
+            self._engine.stop()
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='jarvis-tts', daemon=True)
+            self._thread.start()
+    
+    def _next_batch(self, merge: bool = True) -> List[Utterance]:
+        """Pop the head utterance plus any same-priority ones that fit alongside it"""
+        priority, _, head = heapq.heappop(self._queue)
+        batch = [head]
+        length = len(head.text)
+        while merge and self._queue and self._queue[0][0] == priority:
+            following = self._queue[0][2]
+            if length + 1 + len(following.text) > self.merge_chars:
+                break
+            heapq.heappop(self._queue)
+            batch.append(following)
+            length += 1 + len(following.text)
+        self._counts['merged'] += len(batch) - 1
+        self._current = self._current + batch
+        return batch
+    
+    def _started(self, batch: List[Utterance]):
+        started = time.perf_counter()
+        for utterance in batch:
+            self._latencies.append(started - utterance.queued_at)
+    
+    def _finish(self, batch: List[Utterance], generation: int):
+        """Mark a batch handled; it only counts as spoken if nothing cancelled it meanwhile"""
+        with self._ready:
+            spoken = generation == self._generation
+            for utterance in batch:
+                utterance.spoken = spoken
+                utterance.done.set()
+            if spoken:
+                self._counts['spoken'] += len(batch)
+            self._current = [u for u in self._current if u not in batch]
+    
+    def warm(self, texts: Iterable[str]):
+        """Have a caching engine pre-synthesize texts while the worker is otherwise idle"""
+        with self._ready:
+            self._warm.extend(texts)
+            self._ensure_thread()
+            self._ready.notify()
+    
+    def _run(self):
+        try:
+            self._engine = self.engine_factory()
+        except Exception as e:
+            print(f"❌ Speech engine error: {e}")
+            with self._ready:
+                self._counts['errors'] += 1
+                self._cancel_locked()
+                self._warm.clear()
+            return
+        
+        if hasattr(self._engine, 'synthesize'):
+            self._run_pipelined()
+        else:
+            self._run_blocking()
+    
+    def _run_blocking(self):
+        """Speak each batch with say()/runAndWait()"""
+        while True:
+            with self._ready:
+                while not self._queue:
+                    self._warm.clear()
+                    self._ready.wait()
+                batch = self._next_batch()
+                generation = self._generation
+                self._started(batch)
+            
+            try:
+                if generation == self._generation:
+                    self._engine.say(' '.join(u.text for u in batch))
+                    self._engine.runAndWait()
+            except Exception as e:
+                self._counts['errors'] += 1
+                print(f"❌ Speech error: {e}")
+            
+            self._finish(batch, generation)
+    
+    def _run_pipelined(self):
+        """Synthesize the next utterance while the previous one plays
+        
+        Engines with synthesize()/play()/wait()/stop()/warm() render
+        audio ahead of playback, so each sentence after the first is usually
+        ready by the time the one before it ends. Utterances are not
+        merged, since that would delay the first sentence.
+        """
+        playing = None
+        while True:
+            warm_text = None
+            with self._ready:
+                while not self._queue and playing is None and not self._warm:
+                    self._ready.wait()
+                if self._queue:
+                    batch = self._next_batch(merge=False)
+                    generation = self._generation
+                elif playing is None:
+                    batch, warm_text = None, self._warm.popleft()
+                else:
+                    batch = None
+            
+            if warm_text is not None:
+                try:
+                    self._engine.warm(warm_text)
+                except Exception as e:
+                    print(f"❌ Speech warm-up error: {e}")
+                continue
+            
+            audio = None
+            if batch is not None and generation == self._generation:
+                try:
+                    audio = self._engine.synthesize(batch[0].text)
+                except Exception as e:
+                    self._counts['errors'] += 1
+                    print(f"❌ Speech error: {e}")
+            
+            if playing is not None:
+                self._engine.wait()
+                self._finish(*playing)
+                playing = None
+            
+            if batch is not None:
+                if audio is not None and generation == self._generation:
+                    self._started(batch)
+                    self._engine.play(audio)
+                    playing = (batch, generation)
+                else:
+                    self._finish(batch, generation)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, counters and queue-to-speech latency in milliseconds"""
+        with self._ready:
+            latencies = sorted(self._latencies)
+            depth = len(self._queue)
+            counts = dict(self._counts)
+        stats = {'queue_depth': depth, 'speaking': self.speaking, **counts}
+        if latencies:
+            stats['latency_p50_ms'] = latencies[len(latencies) // 2] * 1000
+            stats['latency_p95_ms'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+        return stats
\ No newline at end of file
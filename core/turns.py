@@ -0,0 +1,131 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Optional, Callable, Any
+from utils.helpers import pop_sentences
+
+class Turn:
+    """One message being answered in the background
+    
+    status moves from 'queued' to 'running' to 'done', 'cancelled' or
+    'error'. text grows as reply chunks arrive, so a UI can poll it to
+    show progress.
+    """
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, message: str):
+        self.id = next(Turn._ids)
+        self.message = message
+        self.status = 'queued'
+        self.text = ''
+        self.chunks = 0
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+    
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    @property
+    def elapsed(self) -> float:
+        """Seconds since submission, or total time once finished"""
+        return (self.finished or time.time()) - self.submitted
+    
+    def cancel(self):
+        """Drop the turn if it has not started, or stop it after the current chunk"""
+        self._cancelled.set()
+        if self.future is not None and self.future.cancel():
+            self._finish('cancelled')
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the turn finishes; True if it did within timeout"""
+        return self._done.wait(timeout)
+    
+    def _finish(self, status: str):
+        if not self.done:
+            self.status = status
+            self.finished = time.time()
+            self._done.set()
+
+class TurnExecutor:
+    """Answer messages for one session on a background thread
+    
+    Turns run one at a time, in order, so the brain's memory sees them
+    in sequence; a turn submitted while another runs waits its turn.
+    The script thread only submits and polls, so reruns never block on
+    Bhindi and never send a message twice. A second single-thread pool
+    runs blocking voice capture the same way.
+    """
+    
+    def __init__(self, brain):
+        self.brain = brain
+        self._turns = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-turn')
+        self._voice = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-voice')
+        self._pending: List[Turn] = []
+        self._lock = threading.Lock()
+    
+    def submit(self, message: str, on_sentence: Optional[Callable[[str], None]] = None) -> Turn:
+        """Queue a message; on_sentence is called (on the worker) with each finished sentence of the reply"""
+        turn = Turn(message)
+        with self._lock:
+            self._pending = [t for t in self._pending if not t.done] + [turn]
+            turn.future = self._turns.submit(self._run, turn, on_sentence)
+        return turn
+    
+    def _run(self, turn: Turn, on_sentence: Optional[Callable[[str], None]]):
+        if turn.cancelled:
+            turn._finish('cancelled')
+            return
+        turn.status = 'running'
+        turn.started = time.time()
+        chunks = self.brain.process_message_stream(turn.message)
+        pending = ''
+        try:
+            for chunk in chunks:
+                turn.text += chunk
+                turn.chunks += 1
+                if on_sentence is not None:
+                    sentences, pending = pop_sentences(pending + chunk)
+                    for sentence in sentences:
+                        on_sentence(sentence)
+                if turn.cancelled:
+                    break
+            if on_sentence is not None and pending.strip() and not turn.cancelled:
+                on_sentence(pending.strip())
+        except Exception as e:
+            turn.error = str(e)
+            turn._finish('error')
+        finally:
+            # Closing the generator ends any in-flight stream and records what was said
+            chunks.close()
+        turn._finish('cancelled' if turn.cancelled else 'done')
+    
+    def pending(self) -> List[Turn]:
+        """Turns submitted but not yet finished, oldest first"""
+        with self._lock:
+            return [t for t in self._pending if not t.done]
+    
+    def cancel_all(self):
+        """Cancel every unfinished turn"""
+        for turn in self.pending():
+            turn.cancel()
+    
+    def run_blocking(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run a blocking voice call (e.g. listen) off the script thread"""
+        return self._voice.submit(fn, *args, **kwargs)
+    
+    def shutdown(self):
+        self.cancel_all()
+        self._turns.shutdown(wait=False)
+        self._voice.shutdown(wait=False)
\ No newline at end of file
@@ -1,63 +1,164 @@
-import pyttsx3
-import speech_recognition as sr
 import threading
-from typing import Optional, Callable
+import time
+from typing import Optional, Callable, Iterable, Dict, Any
+from core.tts_worker import SpeechWorker, Utterance, PRIORITY_NORMAL
+from core.tts_cache import AudioCache, CachedAudioEngine
+from core.personality import JarvisPersonality
+from utils.helpers import split_sentences
 from config import Config
 
-class VoiceInterface:
-    """Handle voice input and output"""
+# pyttsx3 and speech_recognition are imported on first use, so sessions
+# that never speak or listen (and headless hosts) don't pay for them
+_engine_lock = threading.Lock()
+_voice_id: Optional[str] = None
+_voice_searched = False
+_engine_error: Optional[Exception] = None
+_engine_failed_at = 0.0
+ENGINE_RETRY_AFTER = 60.0
+
+def create_engine():
+    """Create a speech engine: pyttsx3, wrapped for cached, pipelined playback when possible
     
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', Config.VOICE_RATE)
-        self.engine.setProperty('volume', Config.VOICE_VOLUME)
+    Shared by every session and safe to call from any thread; engines are
+    created one at a time and the voice list is only searched once per
+    process. After a failure (no pyttsx3, no audio driver) the same error
+    is raised again without retrying for ENGINE_RETRY_AFTER seconds.
+    """
+    global _voice_id, _voice_searched, _engine_error, _engine_failed_at
+    with _engine_lock:
+        if _engine_error is not None and time.time() - _engine_failed_at < ENGINE_RETRY_AFTER:
+            raise _engine_error
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+        except Exception as e:
+            _engine_error, _engine_failed_at = e, time.time()
+            raise
+        _engine_error = None
+        engine.setProperty('rate', Config.VOICE_RATE)
+        engine.setProperty('volume', Config.VOICE_VOLUME)
         
         # Set voice (try to find a good male voice)
-        voices = self.engine.getProperty('voices')
-        for voice in voices:
-            if 'male' in voice.name.lower() or 'david' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
-                break
+        if not _voice_searched:
+            for voice in engine.getProperty('voices'):
+                if 'male' in voice.name.lower() or 'david' in voice.name.lower():
+                    _voice_id = voice.id
+                    break
+            _voice_searched = True
+        if _voice_id is not None:
+            engine.setProperty('voice', _voice_id)
+    
+    if Config.TTS_AUDIO_CACHE:
+        try:
+            return CachedAudioEngine(engine, AudioCache(Config.TTS_CACHE_DIR))
+        except ImportError as e:
+            print(f"⚠️ Audio cache unavailable ({e}); speaking directly")
+    return engine
+
+class VoiceInterface:
+    """Handle voice input and output
+    
+    Nothing is set up until it is needed: the speech engine is created
+    by the worker thread on the first utterance, and the recognizer on
+    the first listen.
+    """
+    
+    def __init__(self, engine_factory: Optional[Callable[[], Any]] = None):
+        # All speech goes through one worker thread that owns the engine
+        self.speech = SpeechWorker(
+            engine_factory or create_engine,
+            max_queue=Config.TTS_QUEUE_SIZE,
+            merge_chars=Config.TTS_MERGE_CHARS
+        )
+        self.hands_free = None
+        self._hands_free_handle = None
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._warmed = False
+    
+    @property
+    def listener(self):
+        """The SpeechListener, created on first use"""
+        with self._listener_lock:
+            if self._listener is None:
+                from core.recognition import SpeechListener
+                self._listener = SpeechListener(
+                    Config.SPEECH_BACKENDS,
+                    calibration_ttl=Config.SPEECH_CALIBRATION_TTL,
+                    pause_threshold=Config.SPEECH_PAUSE_THRESHOLD
+                )
+            return self._listener
+    
+    def _warm(self):
+        """Render the canned lines in the background once speech is first used, so they play instantly"""
+        if not self._warmed and Config.TTS_AUDIO_CACHE:
+            self.speech.warm(
+                sentence
+                for phrase in JarvisPersonality.phrase_bank()
+                for sentence in split_sentences(phrase)
+            )
+        self._warmed = True
+    
+    @property
+    def is_speaking(self) -> bool:
+        """Whether speech is playing right now"""
+        return self.speech.speaking
+    
+    def speak(self, text: str, async_mode: bool = False, priority: int = PRIORITY_NORMAL,
+              barge_in: bool = False) -> Optional[Utterance]:
+        """Convert text to speech
         
-        self.recognizer = sr.Recognizer()
-        self.is_speaking = False
+        The text is queued sentence by sentence, so the first sentence can
+        play while the rest are synthesized; unless async_mode is set, this
+        waits until all of it has been spoken. barge_in cuts off whatever
+        is being said and drops anything queued before it.
+        """
+        if not Config.VOICE_ENABLED:
+            return None
+        
+        utterance = None
+        for sentence in split_sentences(text) or [text]:
+            utterance = self.speech.say(sentence, priority=priority, barge_in=barge_in, follows=utterance)
+            barge_in = False
+        self._warm()
+        if not async_mode:
+            utterance.wait()
+        return utterance
     
-    def speak(self, text: str, async_mode: bool = False):
-        """Convert text to speech"""
+    def speak_stream(self, sentences: Iterable[str], priority: int = PRIORITY_NORMAL):
+        """Queue sentences in order as the iterable yields them
+        
+        Each sentence is queued as soon as it arrives, so the first is
+        spoken while later ones are still being produced. This iterates
+        on the calling thread; once the reply is cut off (e.g. by a
+        barge-in), the rest of it is not queued.
+        """
         if not Config.VOICE_ENABLED:
             return
         
-        def _speak():
-            self.is_speaking = True
-            try:
-                self.engine.say(text)
-                self.engine.runAndWait()
-            finally:
-                self.is_speaking = False
-        
-        if async_mode:
-            thread = threading.Thread(target=_speak)
-            thread.start()
-        else:
-            _speak()
+        utterance = None
+        for sentence in sentences:
+            utterance = self.speech.say(sentence, priority=priority, follows=utterance)
+            self._warm()
     
-    def listen(self, timeout: int = 5) -> Optional[str]:
-        """Listen for voice input"""
+    def listen(self, timeout: int = 5, source=None) -> Optional[str]:
+        """Listen for voice input, from the microphone or from source (e.g. an sr.AudioFile)"""
+        # Barge in: stop talking so the microphone hears the user, not JARVIS
+        self.stop()
         try:
-            with sr.Microphone() as source:
-                print("🎤 Listening...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                audio = self.recognizer.listen(source, timeout=timeout)
-                
-                print("🔄 Processing...")
-                text = self.recognizer.recognize_google(audio)
+            import speech_recognition as sr
+        except ImportError as e:
+            print(f"❌ Speech recognition unavailable: {e}")
+            return None
+        try:
+            print("🎤 Listening...")
+            text = self.listener.listen(timeout=timeout, source=source)
+            if text:
                 print(f"📝 Heard: {text}")
-                return text
+            return text
         
         except sr.WaitTimeoutError:
             return None
-        except sr.UnknownValueError:
-            return None
         except sr.RequestError as e:
             print(f"❌ Speech recognition error: {e}")
             return None
@@ -65,7 +166,44 @@ class VoiceInterface:
             print(f"❌ Error: {e}")
             return None
     
+    def start_hands_free(self, handle: Callable[[str], None]) -> bool:
+        """Listen continuously in the background, calling handle with each addressed utterance
+        
+        There is one microphone, so while one handle is listening, calls
+        with another are ignored. Returns False (and leaves voice output working) if the microphone
+        or recognizer cannot be set up.
+        """
+        if self.hands_free is not None:
+            return True
+        try:
+            from core.listening import ContinuousListener, MicrophoneStream
+            self.hands_free = ContinuousListener(
+                self.listener,
+                MicrophoneStream(Config.LISTEN_SAMPLE_RATE),
+                wake_words=Config.LISTEN_WAKE_WORDS,
+                energy_ratio=Config.LISTEN_ENERGY_RATIO,
+                pause_ms=int(Config.SPEECH_PAUSE_THRESHOLD * 1000),
+                muted=lambda: self.is_speaking
+            )
+        except Exception as e:
+            print(f"❌ Hands-free listening unavailable: {e}")
+            return False
+        self._hands_free_handle = handle
+        self.hands_free.start(handle)
+        return True
+    
+    def stop_hands_free(self, handle: Optional[Callable[[str], None]] = None):
+        """Stop continuous listening; given a handle, only if that handle started it"""
+        if self.hands_free is None or (handle is not None and handle is not self._hands_free_handle):
+            return
+        self.hands_free.stop()
+        self.hands_free = None
+        self._hands_free_handle = None
+    
     def stop(self):
-        """Stop speaking"""
-        if self.is_speaking:
-            self.engine.stop()
\ No newline at end of file
+        """Stop speaking and drop any queued speech"""
+        self.speech.cancel()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Speech queue depth, counters and latency"""
+        return self.speech.metrics()
\ No newline at end of file
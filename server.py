@@ -0,0 +1,218 @@
+"""Headless JARVIS API server
+
+Serves many concurrent sessions over HTTP and WebSocket, each with its
+own pooled JarvisBrain. Usage: python server.py [--host HOST] [--port PORT]
+
+    GET    /health                           pool statistics
+    POST   /sessions/{session_id}/chat       {"message": ...} -> response
+    GET    /sessions/{session_id}/ws         streamed chat and reminders
+    GET    /sessions/{session_id}/schedule   active tasks
+    POST   /sessions/{session_id}/schedule   {"message": "remind me to ..."}
+    GET    /sessions/{session_id}/memory     summary and recent messages
+    DELETE /sessions/{session_id}/memory     clear the session's memory
+
+Session ids are 1-64 letters, digits, '-' or '_'; anything else is a 400.
+"""
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Callable
+
+from aiohttp import web, WSMsgType
+
+from config import Config
+from core.brain import JarvisBrain
+from core.sessions import SESSION_ID, Session, SessionPool
+from core.resources import get_async_bhindi_client
+
+POOL = web.AppKey('pool', SessionPool)
+EXECUTOR = web.AppKey('executor', ThreadPoolExecutor)
+EVICTOR = web.AppKey('evictor', asyncio.Task)
+
+def _stream_turn(brain: JarvisBrain, message: str, emit: Callable[[Optional[str]], None],
+                 cancelled: threading.Event):
+    """Run one streamed turn on a worker thread, handing each chunk to emit and None at the end"""
+    chunks = brain.process_message_stream(message)
+    try:
+        for chunk in chunks:
+            emit(chunk)
+            if cancelled.is_set():
+                break
+    except Exception as e:
+        print(f"❌ Error streaming turn: {e}")
+    finally:
+        chunks.close()
+        emit(None)
+
+async def _read_message(request: web.Request) -> str:
+    try:
+        payload = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise web.HTTPBadRequest(text=json.dumps({'success': False, 'error': 'Body must be JSON'}),
+                                 content_type='application/json')
+    message = payload.get('message') if isinstance(payload, dict) else None
+    if not isinstance(message, str) or not message.strip():
+        raise web.HTTPBadRequest(text=json.dumps({'success': False, 'error': 'message is required'}),
+                                 content_type='application/json')
+    return message
+
+def _session_id(request: web.Request) -> str:
+    session_id = request.match_info['session_id']
+    if not SESSION_ID.fullmatch(session_id):
+        raise web.HTTPBadRequest(text=json.dumps({'success': False, 'error': 'Invalid session id'}),
+                                 content_type='application/json')
+    return session_id
+
+async def _session(request: web.Request) -> Session:
+    return await request.app[POOL].get(_session_id(request))
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({'success': True, **request.app[POOL].stats()})
+
+async def chat(request: web.Request) -> web.Response:
+    message = await _read_message(request)
+    session = await _session(request)
+    async with session.lock:
+        response = await session.brain.process_message_async(message)
+        session.turns += 1
+    session.touch()
+    return web.json_response(response)
+
+async def get_schedule(request: web.Request) -> web.Response:
+    session = await _session(request)
+    return web.json_response({'success': True, 'tasks': session.brain.memory.get_active_tasks()})
+
+async def create_schedule(request: web.Request) -> web.Response:
+    message = await _read_message(request)
+    session = await _session(request)
+    async with session.lock:
+        response = await session.brain.schedule_async(message)
+    return web.json_response(response)
+
+async def get_memory(request: web.Request) -> web.Response:
+    session = await _session(request)
+    memory = session.brain.memory
+    return web.json_response({
+        'success': True,
+        'summary': memory.get_summary(),
+        'messages': [message.to_dict() for message in memory.conversation_history]
+    })
+
+async def clear_memory(request: web.Request) -> web.Response:
+    session = await _session(request)
+    async with session.lock:
+        await asyncio.get_running_loop().run_in_executor(request.app[EXECUTOR], session.brain.memory.clear)
+    return web.json_response({'success': True})
+
+async def websocket(request: web.Request) -> web.WebSocketResponse:
+    """Chat over a WebSocket
+    
+    Each {"message": ...} sent by the client is answered with
+    {"type": "chunk", "text": ...} events and a final
+    {"type": "done", "message": ...}. Reminders fired for the session
+    arrive as {"type": "reminder", ...} while the socket is open.
+    """
+    _session_id(request)
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+    session = await _session(request)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    session.listeners.add(events)
+    
+    async def forward_events():
+        while True:
+            await ws.send_json(await events.get())
+    
+    forwarder = asyncio.create_task(forward_events())
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            try:
+                message = json.loads(msg.data).get('message')
+            except (json.JSONDecodeError, AttributeError):
+                message = None
+            if not isinstance(message, str) or not message.strip():
+                await ws.send_json({'type': 'error', 'error': 'message is required'})
+                continue
+            
+            async with session.lock:
+                chunks: asyncio.Queue = asyncio.Queue()
+                cancelled = threading.Event()
+                turn = loop.run_in_executor(
+                    request.app[EXECUTOR], _stream_turn, session.brain, message,
+                    lambda chunk: loop.call_soon_threadsafe(chunks.put_nowait, chunk), cancelled
+                )
+                reply = []
+                try:
+                    while (chunk := await chunks.get()) is not None:
+                        reply.append(chunk)
+                        await ws.send_json({'type': 'chunk', 'text': chunk})
+                finally:
+                    # Stop streaming into a socket that went away
+                    cancelled.set()
+                    await turn
+                session.turns += 1
+            session.touch()
+            await ws.send_json({'type': 'done', 'message': ''.join(reply)})
+    finally:
+        forwarder.cancel()
+        session.listeners.discard(events)
+        session.touch()
+    return ws
+
+async def _evict_idle(app: web.Application):
+    pool = app[POOL]
+    while True:
+        await asyncio.sleep(max(1.0, pool.idle_timeout / 4))
+        await pool.evict_idle()
+
+async def _start(app: web.Application):
+    app[EVICTOR] = asyncio.create_task(_evict_idle(app))
+
+async def _cleanup(app: web.Application):
+    app[EVICTOR].cancel()
+    await app[POOL].close()
+    await get_async_bhindi_client().aclose()
+    app[EXECUTOR].shutdown(wait=False)
+
+def create_app(brain_factory: Callable[[str], Any] = JarvisBrain,
+               max_sessions: int = None, idle_timeout: float = None, workers: int = None) -> web.Application:
+    """Build the API application around a pool of brains made by brain_factory(session_id)"""
+    app = web.Application()
+    # Streamed turns use the blocking client, and brains open SQLite and recall
+    # files, so both run here rather than on the event loop
+    app[EXECUTOR] = ThreadPoolExecutor(
+        max_workers=workers or Config.SERVER_STREAM_WORKERS, thread_name_prefix='jarvis-stream'
+    )
+    app[POOL] = SessionPool(
+        brain_factory,
+        max_sessions=max_sessions or Config.SERVER_MAX_SESSIONS,
+        idle_timeout=idle_timeout or Config.SERVER_SESSION_IDLE,
+        executor=app[EXECUTOR]
+    )
+    app.router.add_get('/health', health)
+    app.router.add_post('/sessions/{session_id}/chat', chat)
+    app.router.add_get('/sessions/{session_id}/ws', websocket)
+    app.router.add_get('/sessions/{session_id}/schedule', get_schedule)
+    app.router.add_post('/sessions/{session_id}/schedule', create_schedule)
+    app.router.add_get('/sessions/{session_id}/memory', get_memory)
+    app.router.add_delete('/sessions/{session_id}/memory', clear_memory)
+    app.on_startup.append(_start)
+    app.on_cleanup.append(_cleanup)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=Config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT)
+    args = parser.parse_args()
+    
+    Config.validate()
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
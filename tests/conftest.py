@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.update({'BHINDI_API_KEY': 'test', 'SESSION_MEMORY': 'false', 'LOCAL_SCHEDULER': 'false'})
+
+from benchmarks.stub_server import start_stub_server
+
+@pytest.fixture
+def stub():
+    """A local Bhindi stub; set fail_rate, slow_rate, slow_delay or down on it to inject faults"""
+    server, base_url = start_stub_server()
+    yield server, base_url
+    server.shutdown()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import gc
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from config import Config
+from core.brain import JarvisBrain
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+def open_tab() -> AppTest:
+    app = AppTest.from_file(APP, default_timeout=60).run()
+    assert not app.exception
+    return app
+
+def test_each_browser_session_gets_its_own_conversation(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'VOICE_ENABLED', False)
+    monkeypatch.setattr(Config, 'SESSION_MEMORY', True)
+    monkeypatch.setattr(Config, 'MEMORY_DB_PATH', str(tmp_path / 'memory.db'))
+    monkeypatch.setattr(Config, 'RECALL_DIR', str(tmp_path / 'recall'))
+    first = open_tab().session_state['jarvis']
+    first.memory.add_message('user', 'my private question')
+    
+    second = open_tab().session_state['jarvis']
+    assert second.session_id != first.session_id
+    assert second.session_id != Config.SESSION_ID
+    assert not [m for m in second.memory.conversation_history if m.content == 'my private question']
+
+def test_shared_session_is_opt_in(monkeypatch):
+    monkeypatch.setattr(Config, 'VOICE_ENABLED', False)
+    monkeypatch.setattr(Config, 'APP_SHARED_SESSION', True)
+    assert open_tab().session_state['jarvis'].session_id == Config.SESSION_ID
+
+def test_closed_browser_session_lets_go_of_its_conversation(monkeypatch):
+    monkeypatch.setattr(Config, 'VOICE_ENABLED', False)
+    app = open_tab()
+    jarvis = app.session_state['jarvis']
+    scheduler = jarvis.scheduler
+    assert len(scheduler._listeners) == 2  # the tab's inbox and the shared voice
+    
+    del app
+    gc.collect()
+    assert scheduler._listeners == []
+    fresh = JarvisBrain(session_id=jarvis.session_id)
+    assert fresh.scheduler is not scheduler
+    fresh.close()
\ No newline at end of file
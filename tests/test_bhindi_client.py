@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_server import start_stub_server
+from utils.bhindi_client import AsyncBhindiClient, BhindiClient
+from utils.cache import MemoryCache
+
+def client_for(base_url: str, **kwargs) -> BhindiClient:
+    return BhindiClient(base_url=base_url, cache=MemoryCache(stale_ttl=3600), **kwargs)
+
+def test_streamed_reply_is_cached_and_replayed(stub):
+    server, base_url = stub
+    client = client_for(base_url)
+    first = ''.join(client.chat_stream('hello there'))
+    assert server.request_count == 1
+    
+    assert list(client.chat_stream('hello there')) == [first]
+    assert client.chat('hello there')['message'] == first
+    assert server.request_count == 1
+    
+    assert ''.join(client.chat_stream('hello there', use_cache=False)) == first
+    assert server.request_count == 2
+
+def test_stream_closed_early_is_not_cached(stub):
+    server, base_url = stub
+    client = client_for(base_url)
+    chunks = client.chat_stream('partial')
+    next(chunks)
+    chunks.close()
+    ''.join(client.chat_stream('partial'))
+    assert server.request_count == 2
+
+def test_streamed_search_uses_the_search_cache(stub):
+    server, base_url = stub
+    client = client_for(base_url)
+    answer = client.search_web('weather in paris')['message']
+    calls = server.request_count
+    assert list(client.search_web_stream('weather in paris')) == [answer]
+    assert server.request_count == calls
+
+def test_identical_streamed_searches_share_one_request():
+    server, base_url = start_stub_server(latency=0.2)
+    try:
+        client = client_for(base_url)
+        client.ensure_agent('perplexity')
+        calls = server.request_count
+        barrier = threading.Barrier(5)
+        
+        def search(_):
+            barrier.wait()
+            return ''.join(client.search_web_stream('weather in rome'))
+        
+        with ThreadPoolExecutor(5) as pool:
+            answers = list(pool.map(search, range(5)))
+        assert len(set(answers)) == 1 and 'weather in rome' in answers[0]
+        assert server.request_count - calls == 1
+        assert client.flights.shared == 4
+    finally:
+        server.shutdown()
+
+def test_streamed_search_followers_recover_when_the_leader_stops_early():
+    server, base_url = start_stub_server(latency=0.2)
+    try:
+        client = client_for(base_url)
+        client.ensure_agent('perplexity')
+        leader = client.search_web_stream('weather in oslo')
+        first = next(leader)
+        with ThreadPoolExecutor(1) as pool:
+            follower = pool.submit(lambda: ''.join(client.search_web_stream('weather in oslo')))
+            while not client.flights.shared:
+                time.sleep(0.01)
+            leader.close()
+            assert follower.result(timeout=5).startswith(first)
+    finally:
+        server.shutdown()
+def test_async_client_closes_the_pool_of_a_finished_loop(stub):
+    server, base_url = stub
+    client = AsyncBhindiClient(base_url=base_url, cache=None)
+    
+    async def turn():
+        result = await client.chat('hello', use_cache=False)
+        await asyncio.sleep(0)  # let a scheduled close run
+        return result
+    
+    assert asyncio.run(turn())['success']
+    first = client._client
+    assert asyncio.run(turn())['success']
+    assert client._client is not first and first.is_closed
+    asyncio.run(client.aclose())
+
+def test_non_json_reply_is_reported_not_raised(stub):
+    server, base_url = stub
+    server.not_json = True
+    client = AsyncBhindiClient(base_url=base_url, cache=None)
+    
+    async def turn():
+        try:
+            return await client.chat('hello', use_cache=False)
+        finally:
+            await client.aclose()
+    
+    result = asyncio.run(turn())
+    assert result['success'] is False and 'not JSON' in result['error']
+    assert not BhindiClient(base_url=base_url, cache=None).chat('hello', use_cache=False)['success']
\ No newline at end of file
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+import pytest
+
+from utils.helpers import classify_batch
+
+NOW = datetime(2024, 5, 15, 10, 30)
+
+MESSAGES = [
+    "remind me at 3pm",
+    "remind me every 0 minutes",
+    "search for the best pizza",
+    "every 90 minutes check the oven",
+    "remind me at 3pm",
+]
+
+@pytest.mark.parametrize('workers, chunk_size', [(0, 50000), (2, 1)])
+def test_classify_batch_skips_unparseable_times(workers, chunk_size):
+    frame = classify_batch(MESSAGES, workers=workers, chunk_size=chunk_size, now=NOW)
+    assert len(frame) == len(MESSAGES)
+    assert list(frame['cron']) == ["0 15 15 5 *", None, "35 10 15 5 *", None, "0 15 15 5 *"]
+    assert list(frame['recurring']) == [False, False, False, False, False]
+    assert list(frame['intent'])[:3] == ['schedule', 'schedule', 'search']
\ No newline at end of file
@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from core.memory_store import MemoryStore
+
+def committed_messages(path: str) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0]
+    finally:
+        conn.close()
+
+def test_queued_write_is_committed_after_flush_interval(tmp_path):
+    path = str(tmp_path / 'memory.db')
+    store = MemoryStore(path, batch_size=100, flush_interval=0.2)
+    store.append_message('s1', 'user', 'hello', time.time())
+    store.append_message('s1', 'assistant', 'hi there', time.time())
+    assert committed_messages(path) == 0
+    
+    deadline = time.time() + 5
+    while committed_messages(path) < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    assert committed_messages(path) == 2
+
+def test_full_batch_commits_at_once(tmp_path):
+    path = str(tmp_path / 'memory.db')
+    store = MemoryStore(path, batch_size=3, flush_interval=60)
+    for i in range(3):
+        store.append_message('s1', 'user', f"message {i}", time.time())
+    assert committed_messages(path) == 3
+    assert store._timer is None
+
+def test_updated_task_keeps_its_place(tmp_path):
+    store = MemoryStore(str(tmp_path / 'memory.db'))
+    for task_id in ('first', 'second', 'third'):
+        store.save_task('s1', task_id, {'id': task_id, 'runs': 0})
+        time.sleep(0.01)
+    store.save_task('s1', 'first', {'id': 'first', 'runs': 1})
+    store.save_task('s1', 'second', {'id': 'second', 'runs': 0}, status='done')
+    assert store.get_tasks('s1') == [{'id': 'first', 'runs': 1}, {'id': 'third', 'runs': 0}]
+    assert store.get_tasks('s1', status='done') == [{'id': 'second', 'runs': 0}]
\ No newline at end of file
@@ -0,0 +1,85 @@
+import wave
+
+import numpy as np
+import pytest
+import speech_recognition as sr
+
+from core import recognition
+from core.listening import ContinuousListener, WavStream
+from core.recognition import RecognitionBackend, SpeechListener
+
+RATE = 16000
+
+def write_wav(path, *parts):
+    """parts are (seconds, amplitude) pairs: 0 for silence, else a 440Hz tone"""
+    chunks = []
+    for seconds, amplitude in parts:
+        t = np.arange(int(seconds * RATE)) / RATE
+        chunks.append((amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.int16))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(np.concatenate(chunks).tobytes())
+    return str(path)
+
+class ScriptedBackend(RecognitionBackend):
+    """Answers each transcription with the next scripted text"""
+    
+    name = 'scripted'
+    script = []
+    
+    def transcribe(self, audio: sr.AudioData):
+        self.heard.append(audio)
+        return self.script.pop(0)
+
+class OfflineBackend(RecognitionBackend):
+    name = 'offline'
+    calls = 0
+    
+    def transcribe(self, audio: sr.AudioData):
+        OfflineBackend.calls += 1
+        raise sr.RequestError('no network')
+
+@pytest.fixture
+def backends(monkeypatch):
+    ScriptedBackend.heard = []
+    OfflineBackend.calls = 0
+    monkeypatch.setitem(recognition.BACKENDS, 'scripted', ScriptedBackend)
+    monkeypatch.setitem(recognition.BACKENDS, 'offline', OfflineBackend)
+    return ScriptedBackend
+
+def test_transcribe_file_sends_the_utterance_to_the_backend(tmp_path, backends):
+    path = write_wav(tmp_path / 'turn.wav', (0.3, 0), (0.8, 8000), (1.0, 0))
+    backends.script = ['what time is it']
+    assert SpeechListener(['scripted']).transcribe_file(path) == 'what time is it'
+    audio = backends.heard[0]
+    assert audio.sample_rate == RATE
+    assert 0.5 < len(audio.frame_data) / (2 * RATE) < 2.1
+
+def test_unavailable_backend_is_skipped_until_retry_after(tmp_path, backends):
+    path = write_wav(tmp_path / 'turn.wav', (0.8, 8000), (1.0, 0))
+    backends.script = ['first', 'second']
+    listener = SpeechListener(['offline', 'scripted'])
+    assert listener.transcribe_file(path) == 'first'
+    assert listener.transcribe_file(path) == 'second'
+    assert OfflineBackend.calls == 1
+
+def test_every_backend_failing_raises_request_error(tmp_path, backends):
+    path = write_wav(tmp_path / 'turn.wav', (0.8, 8000), (1.0, 0))
+    with pytest.raises(sr.RequestError, match='no network'):
+        SpeechListener(['offline']).transcribe_file(path)
+
+def test_wav_stream_yields_only_addressed_utterances(tmp_path, backends):
+    path = write_wav(
+        tmp_path / 'session.wav',
+        (0.5, 0), (0.6, 8000), (1.0, 0), (0.6, 8000), (1.0, 0), (0.6, 8000), (1.0, 0)
+    )
+    backends.script = ['Jarvis, what time is it', 'not talking to you', 'hey jarvis stop']
+    source = WavStream(path)
+    try:
+        heard = list(ContinuousListener(SpeechListener(['scripted']), source, wake_words=['jarvis']).utterances())
+    finally:
+        source.close()
+    assert heard == ['what time is it', 'stop']
+    assert len(backends.heard) == 3
\ No newline at end of file
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from benchmarks.stub_server import start_stub_server
+from config import Config
+from utils import bhindi_client
+from utils.bhindi_client import AsyncBhindiClient, BhindiClient
+from utils.cache import MemoryCache
+from utils.resilience import CircuitBreaker, deadline
+
+def test_released_probe_lets_the_next_one_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+def test_cancelled_half_open_probe_does_not_wedge_the_breaker(stub):
+    server, base_url = stub
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = AsyncBhindiClient(base_url=base_url, cache=None, breaker=breaker)
+    
+    async def scenario():
+        server.down = True
+        await client.chat('fail', use_cache=False)
+        assert breaker.state == 'open'
+        await asyncio.sleep(0.06)
+        
+        # The probe is cancelled mid-request
+        server.down, server.slow_rate, server.slow_delay = False, 1.0, 1.0
+        probe = asyncio.ensure_future(client.chat('probe', use_cache=False))
+        await asyncio.sleep(0.1)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        
+        server.slow_rate = 0.0
+        result = await client.chat('recovered', use_cache=False)
+        await client.aclose()
+        return result
+    
+    assert asyncio.run(scenario())['success']
+    assert breaker.state == 'closed'
+
+def test_stream_retries_transient_failures_before_the_first_chunk(stub, monkeypatch):
+    server, base_url = stub
+    monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 2)
+    monkeypatch.setattr(Config, 'RETRY_BACKOFF', 0.01)
+    client = BhindiClient(base_url=base_url, cache=None)
+    server.fail_next = 2
+    assert 'Streamed reply complete' in ''.join(client.chat_stream('flaky'))
+    assert server.request_count == 3
+
+def test_stream_falls_back_to_a_stale_answer(stub, monkeypatch):
+    server, base_url = stub
+    monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 0)
+    monkeypatch.setattr(Config, 'CACHE_TTL_CHAT', 0.01)
+    client = BhindiClient(base_url=base_url, cache=MemoryCache(stale_ttl=3600))
+    answer = ''.join(client.chat_stream('what is new'))
+    time.sleep(0.02)
+    
+    server.down = True
+    assert list(client.chat_stream('what is new')) == [answer]
+    with pytest.raises(requests.exceptions.HTTPError):
+        list(client.chat_stream('never answered'))
+
+def test_chat_retries_transient_failures(stub, monkeypatch):
+    server, base_url = stub
+    monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 2)
+    monkeypatch.setattr(Config, 'RETRY_BACKOFF', 0.01)
+    client = BhindiClient(base_url=base_url, cache=None)
+    server.fail_next = 2
+    assert client.chat('flaky', use_cache=False)['success']
+    assert server.request_count == 3
+    
+    server.fail_next = 3
+    assert not client.chat('flaky', use_cache=False)['success']
+    assert server.request_count == 6
+
+def test_breaker_stops_calls_during_an_outage_and_probes_to_recover(stub, monkeypatch):
+    server, base_url = stub
+    monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 0)
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.1)
+    client = BhindiClient(base_url=base_url, cache=None, breaker=breaker)
+    server.down = True
+    results = [client.chat(f"outage {i}", use_cache=False) for i in range(10)]
+    assert not any(r['success'] for r in results)
+    assert server.request_count == 3
+    assert breaker.state == 'open'
+    
+    server.down = False
+    time.sleep(0.15)
+    assert client.chat('probe', use_cache=False)['success']
+    assert breaker.state == 'closed'
+    assert server.request_count == 4
+
+def test_chat_falls_back_to_a_stale_answer(stub, monkeypatch):
+    server, base_url = stub
+    monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 0)
+    monkeypatch.setattr(Config, 'CACHE_TTL_CHAT', 0.01)
+    client = BhindiClient(base_url=base_url, cache=MemoryCache(stale_ttl=3600))
+    answer = client.chat('what is new')['message']
+    time.sleep(0.02)
+    
+    server.down = True
+    stale = client.chat('what is new')
+    assert stale['message'] == answer and stale['stale']
+    assert not client.chat('never answered')['success']
+
+def test_turn_deadline_bounds_a_stalled_call(stub, monkeypatch):
+    server, base_url = stub
+    monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 2)
+    server.slow_rate, server.slow_delay = 1.0, 2.0
+    client = BhindiClient(base_url=base_url, cache=None)
+    start = time.perf_counter()
+    with deadline(0.3):
+        result = client.chat('stalled', use_cache=False)
+    assert not result['success']
+    assert time.perf_counter() - start < 1.0
+
+def test_hedges_in_flight_are_capped(monkeypatch):
+    server, base_url = start_stub_server(slow_rate=1.0, slow_delay=0.3)
+    try:
+        monkeypatch.setattr(Config, 'RETRY_ATTEMPTS', 0)
+        monkeypatch.setattr(Config, 'HEDGE_CHAT', True)
+        client = BhindiClient(base_url=base_url, cache=None)
+        for _ in range(client.latency.min_samples):
+            client.latency.record(0.01)
+        slots = bhindi_client._hedge_slots._value
+        
+        with ThreadPoolExecutor(slots * 2) as pool:
+            results = list(pool.map(lambda i: client.chat(f"slow {i}", use_cache=False), range(slots * 2)))
+        assert all(r['success'] for r in results)
+        assert client.hedged == slots
+        time.sleep(0.5)  # the losing requests finish and hand back their slots
+        assert bhindi_client._hedge_slots._value == slots
+    finally:
+        server.shutdown()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from config import Config
+from core.brain import JarvisBrain
+from core.memory import SessionMemory
+from core.memory_store import get_memory_store
+
+def scheduler_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'jarvis-scheduler']
+
+def test_brains_on_one_session_share_a_scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SESSION_MEMORY', True)
+    monkeypatch.setattr(Config, 'LOCAL_SCHEDULER', True)
+    monkeypatch.setattr(Config, 'RECALL_ENABLED', False)
+    monkeypatch.setattr(Config, 'MEMORY_DB_PATH', str(tmp_path / 'memory.sqlite3'))
+    
+    # A reminder persisted by an earlier run
+    earlier = SessionMemory(store=get_memory_store(Config.MEMORY_DB_PATH), session_id='shared')
+    task = earlier.add_task({'description': 'stretch', 'due_at': time.time() + 0.3, 'recurring': False})
+    
+    running = len(scheduler_threads())
+    first, second = JarvisBrain(session_id='shared'), JarvisBrain(session_id='shared')
+    assert first.scheduler is second.scheduler
+    assert len(scheduler_threads()) == running + 1
+    
+    fired = []
+    first.scheduler.add_listener(lambda due: fired.append(due['id']))
+    time.sleep(0.6)
+    assert fired == [task['id']]
+    assert second.memory.get_active_tasks() == []
+    
+    other = JarvisBrain(session_id='other')
+    assert other.scheduler is not first.scheduler
+    for brain in (first, second, other):
+        brain.close()
+
+def test_scheduler_stops_when_the_last_brain_closes(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SESSION_MEMORY', True)
+    monkeypatch.setattr(Config, 'LOCAL_SCHEDULER', True)
+    monkeypatch.setattr(Config, 'RECALL_ENABLED', False)
+    monkeypatch.setattr(Config, 'MEMORY_DB_PATH', str(tmp_path / 'memory.sqlite3'))
+    earlier = SessionMemory(store=get_memory_store(Config.MEMORY_DB_PATH), session_id='closing')
+    task = earlier.add_task({'description': 'stretch', 'due_at': time.time() + 0.3, 'recurring': False})
+    
+    running = len(scheduler_threads())
+    first, second = JarvisBrain(session_id='closing'), JarvisBrain(session_id='closing')
+    heard = {'first': [], 'second': []}
+    first.on_reminder(lambda text, due: heard['first'].append(due['id']))
+    second.on_reminder(lambda text, due: heard['second'].append(due['id']))
+    
+    first.close()
+    first.close()  # closing twice gives back one reference only
+    assert len(scheduler_threads()) == running + 1
+    time.sleep(0.6)
+    assert heard == {'first': [], 'second': [task['id']]}
+    
+    second.close()
+    assert len(scheduler_threads()) == running
+    third = JarvisBrain(session_id='closing')
+    assert third.scheduler is not second.scheduler
+    third.close()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from core.brain import JarvisBrain
+from core.sessions import SessionPool
+from server import create_app
+
+def request(method: str, path: str, brain_factory=JarvisBrain):
+    async def scenario():
+        client = TestClient(TestServer(create_app(brain_factory, workers=2)))
+        await client.start_server()
+        try:
+            response = await client.request(method, path)
+            return response.status, await response.json()
+        finally:
+            await client.close()
+    
+    return asyncio.run(scenario())
+
+def test_path_traversal_session_id_is_rejected():
+    created = []
+    factory = lambda session_id: created.append(session_id) or JarvisBrain(session_id)
+    for path in ['/sessions/..%2F..%2Ftmp%2Fevil/memory', '/sessions/a.b/memory', '/sessions/' + 'x' * 65 + '/memory']:
+        status, body = request('GET', path, factory)
+        assert status == 400
+        assert body['error'] == 'Invalid session id'
+    assert created == []
+
+def test_valid_session_id_is_served():
+    status, body = request('GET', '/sessions/user-42_a/memory')
+    assert status == 200
+    assert body['success']
+
+def test_brains_are_built_off_the_event_loop_once_per_session():
+    built = []
+    
+    def factory(session_id):
+        built.append((session_id, threading.current_thread() is threading.main_thread()))
+        time.sleep(0.05)
+        return JarvisBrain(session_id)
+    
+    async def scenario():
+        pool = SessionPool(factory, executor=ThreadPoolExecutor(4))
+        sessions = await asyncio.gather(*(pool.get('same') for _ in range(5)))
+        await pool.close()
+        return sessions
+    
+    sessions = asyncio.run(scenario())
+    assert built == [('same', False)]
+    assert all(session is sessions[0] for session in sessions)
\ No newline at end of file
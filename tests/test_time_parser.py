@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pytest
+
+from utils.time_parser import parse_schedule, next_cron_time
+
+# Wednesday 15 May 2024, 10:30
+NOW = datetime(2024, 5, 15, 10, 30)
+
+# phrase -> (cron, recurring, next_run)
+CASES = {
+    # Clock times today / tomorrow
+    "remind me at 3pm": ("0 15 15 5 *", False, datetime(2024, 5, 15, 15, 0)),
+    "remind me at 3:45 pm": ("45 15 15 5 *", False, datetime(2024, 5, 15, 15, 45)),
+    "call mom at 9am": ("0 9 16 5 *", False, datetime(2024, 5, 16, 9, 0)),
+    "meeting at 10:30": ("30 10 16 5 *", False, datetime(2024, 5, 16, 10, 30)),
+    "meeting at 10:31": ("31 10 15 5 *", False, datetime(2024, 5, 15, 10, 31)),
+    "lunch at noon": ("0 12 15 5 *", False, datetime(2024, 5, 15, 12, 0)),
+    "backup at midnight": ("0 0 16 5 *", False, datetime(2024, 5, 16, 0, 0)),
+    "set alarm for 6:15 a.m.": ("15 6 16 5 *", False, datetime(2024, 5, 16, 6, 15)),
+    "remind me at 12 am": ("0 0 16 5 *", False, datetime(2024, 5, 16, 0, 0)),
+    "remind me at 12 pm": ("0 12 15 5 *", False, datetime(2024, 5, 15, 12, 0)),
+    "at 18:00 check the oven": ("0 18 15 5 *", False, datetime(2024, 5, 15, 18, 0)),
+    "Schedule a meeting tomorrow at 10 AM": ("0 10 16 5 *", False, datetime(2024, 5, 16, 10, 0)),
+    "tomorrow at 8:05pm": ("5 20 16 5 *", False, datetime(2024, 5, 16, 20, 5)),
+    "remind me tomorrow": ("0 9 16 5 *", False, datetime(2024, 5, 16, 9, 0)),
+    "remind me tonight": ("0 20 15 5 *", False, datetime(2024, 5, 15, 20, 0)),
+    # Numbers that are not times
+    "remind me to buy 2 apples": ("35 10 15 5 *", False, datetime(2024, 5, 15, 10, 35)),
+    "remind me about room 42": ("35 10 15 5 *", False, datetime(2024, 5, 15, 10, 35)),
+    "remind me at 25 pm": ("35 10 15 5 *", False, datetime(2024, 5, 15, 10, 35)),
+    # Relative offsets
+    "in 10 minutes": ("40 10 15 5 *", False, datetime(2024, 5, 15, 10, 40)),
+    "remind me in 1 minute": ("31 10 15 5 *", False, datetime(2024, 5, 15, 10, 31)),
+    "in 2 hours": ("30 12 15 5 *", False, datetime(2024, 5, 15, 12, 30)),
+    "in an hour": ("30 11 15 5 *", False, datetime(2024, 5, 15, 11, 30)),
+    "in half an hour": ("0 11 15 5 *", False, datetime(2024, 5, 15, 11, 0)),
+    "in 3 days": ("30 10 18 5 *", False, datetime(2024, 5, 18, 10, 30)),
+    "in a week": ("30 10 22 5 *", False, datetime(2024, 5, 22, 10, 30)),
+    "in 90 mins": ("0 12 15 5 *", False, datetime(2024, 5, 15, 12, 0)),
+    "in 20 days": ("30 10 4 6 *", False, datetime(2024, 6, 4, 10, 30)),
+    # Daily
+    "every day at 7am": ("0 7 * * *", True, datetime(2024, 5, 16, 7, 0)),
+    "daily at 11:15": ("15 11 * * *", True, datetime(2024, 5, 15, 11, 15)),
+    "remind me daily": ("0 9 * * *", True, datetime(2024, 5, 16, 9, 0)),
+    "each day at 6 pm": ("0 18 * * *", True, datetime(2024, 5, 15, 18, 0)),
+    "nightly at 11pm": ("0 23 * * *", True, datetime(2024, 5, 15, 23, 0)),
+    # Intervals
+    "every hour": ("0 * * * *", True, datetime(2024, 5, 15, 11, 0)),
+    "hourly": ("0 * * * *", True, datetime(2024, 5, 15, 11, 0)),
+    "every minute": ("* * * * *", True, datetime(2024, 5, 15, 10, 31)),
+    "every 15 minutes": ("*/15 * * * *", True, datetime(2024, 5, 15, 10, 45)),
+    "every 5 mins": ("*/5 * * * *", True, datetime(2024, 5, 15, 10, 35)),
+    "every 2 hours": ("0 */2 * * *", True, datetime(2024, 5, 15, 12, 0)),
+    "every 3 hrs": ("0 */3 * * *", True, datetime(2024, 5, 15, 12, 0)),
+    "every 59 minutes": ("*/59 * * * *", True, datetime(2024, 5, 15, 10, 59)),
+    "every 60 minutes": ("0 * * * *", True, datetime(2024, 5, 15, 11, 0)),
+    "every 120 minutes": ("0 */2 * * *", True, datetime(2024, 5, 15, 12, 0)),
+    "every 23 hours": ("0 */23 * * *", True, datetime(2024, 5, 15, 23, 0)),
+    # Weekdays
+    "every monday at 9am": ("0 9 * * 1", True, datetime(2024, 5, 20, 9, 0)),
+    "every Friday at 5pm": ("0 17 * * 5", True, datetime(2024, 5, 17, 17, 0)),
+    "every wednesday at 11am": ("0 11 * * 3", True, datetime(2024, 5, 15, 11, 0)),
+    "every wednesday at 10am": ("0 10 * * 3", True, datetime(2024, 5, 22, 10, 0)),
+    "mondays at 8:30": ("30 8 * * 1", True, datetime(2024, 5, 20, 8, 30)),
+    "every sunday": ("0 9 * * 0", True, datetime(2024, 5, 19, 9, 0)),
+    "every saturday at noon": ("0 12 * * 6", True, datetime(2024, 5, 18, 12, 0)),
+    "every monday and thursday at 7pm": ("0 19 * * 1,4", True, datetime(2024, 5, 16, 19, 0)),
+    "every tue and thu at 6am": ("0 6 * * 2,4", True, datetime(2024, 5, 16, 6, 0)),
+    "weekdays at 7am": ("0 7 * * 1-5", True, datetime(2024, 5, 16, 7, 0)),
+    "every weekday at 6:30 pm": ("30 18 * * 1-5", True, datetime(2024, 5, 15, 18, 30)),
+    "weekends at 10am": ("0 10 * * 0,6", True, datetime(2024, 5, 18, 10, 0)),
+    "every weekend": ("0 9 * * 0,6", True, datetime(2024, 5, 18, 9, 0)),
+    "weekly": ("0 9 * * 3", True, datetime(2024, 5, 22, 9, 0)),
+    "every week at 2pm": ("0 14 * * 3", True, datetime(2024, 5, 15, 14, 0)),
+    # One-off weekdays
+    "on monday at 3pm": ("0 15 20 5 *", False, datetime(2024, 5, 20, 15, 0)),
+    "next friday": ("0 9 17 5 *", False, datetime(2024, 5, 17, 9, 0)),
+    "wednesday at 9am": ("0 9 22 5 *", False, datetime(2024, 5, 22, 9, 0)),
+    "wednesday at 4pm": ("0 16 15 5 *", False, datetime(2024, 5, 15, 16, 0)),
+    "on sunday": ("0 9 19 5 *", False, datetime(2024, 5, 19, 9, 0)),
+    "I sat down at 4pm": ("0 16 15 5 *", False, datetime(2024, 5, 15, 16, 0)),
+    # Ranges
+    "monday to friday at 8am": ("0 8 * * 1-5", True, datetime(2024, 5, 16, 8, 0)),
+    "mon-fri at 9:15": ("15 9 * * 1-5", True, datetime(2024, 5, 16, 9, 15)),
+    "friday through monday at 10pm": ("0 22 * * 0,1,5,6", True, datetime(2024, 5, 17, 22, 0)),
+    "every hour from 9am to 5pm": ("0 9-17 * * *", True, datetime(2024, 5, 15, 11, 0)),
+    "every hour from 9 to 5pm": ("0 9-17 * * *", True, datetime(2024, 5, 15, 11, 0)),
+    "every 30 minutes between 1pm and 3pm": ("*/30 13-15 * * *", True, datetime(2024, 5, 15, 13, 0)),
+    "every 2 hours from 8am to 8pm": ("0 8-20/2 * * *", True, datetime(2024, 5, 15, 12, 0)),
+    "every hour from 9am to 5pm on weekdays": ("0 9-17 * * 1-5", True, datetime(2024, 5, 15, 11, 0)),
+    "every 10 minutes from 1 to 2pm": ("*/10 13-14 * * *", True, datetime(2024, 5, 15, 13, 0)),
+    # Fallback
+    "remind me": ("35 10 15 5 *", False, datetime(2024, 5, 15, 10, 35)),
+    "schedule something": ("35 10 15 5 *", False, datetime(2024, 5, 15, 10, 35)),
+}
+
+# Repeat intervals a cron step cannot express
+BAD_INTERVALS = [
+    "every 0 minutes",
+    "every 0 hours",
+    "every 90 minutes",
+    "every 1000 minutes",
+    "every 24 hours",
+    "every 30 hours",
+]
+
+# cron -> after -> expected next fire time
+CRON_CASES = [
+    ("0 9 * * 1", datetime(2024, 5, 15, 10, 30), datetime(2024, 5, 20, 9, 0)),
+    ("*/15 * * * *", datetime(2024, 5, 15, 10, 59), datetime(2024, 5, 15, 11, 0)),
+    ("0 0 1 * *", datetime(2024, 5, 15, 10, 30), datetime(2024, 6, 1, 0, 0)),
+    ("0 0 29 2 *", datetime(2024, 3, 1), datetime(2028, 2, 29, 0, 0)),
+    ("30 23 31 12 *", datetime(2024, 12, 31, 23, 30), datetime(2025, 12, 31, 23, 30)),
+    ("0 12 1 * 1", datetime(2024, 5, 15), datetime(2024, 5, 20, 12, 0)),
+    ("0 9 * * 7", datetime(2024, 5, 15), datetime(2024, 5, 19, 9, 0)),
+]
+
+@pytest.mark.parametrize('phrase, expected', list(CASES.items()))
+def test_parse_schedule(phrase, expected):
+    schedule = parse_schedule(phrase, NOW)
+    assert (schedule.cron, schedule.recurring, schedule.next_run) == expected
+
+@pytest.mark.parametrize('phrase', BAD_INTERVALS)
+def test_bad_interval_raises_value_error(phrase):
+    with pytest.raises(ValueError):
+        parse_schedule(phrase, NOW)
+
+@pytest.mark.parametrize('cron, after, expected', CRON_CASES)
+def test_next_cron_time(cron, after, expected):
+    assert next_cron_time(cron, after) == expected
\ No newline at end of file
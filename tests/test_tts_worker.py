@@ -0,0 +1,68 @@
+import time
+
+from core.tts_worker import SpeechWorker, SilentEngine, PRIORITY_URGENT, PRIORITY_NORMAL, PRIORITY_LOW
+
+def silent_worker(seconds_per_char: float = 0.0, **kwargs):
+    engine = SilentEngine(seconds_per_char)
+    return SpeechWorker(lambda: engine, **kwargs), engine
+
+def say_reply(worker: SpeechWorker, sentences, priority: int = PRIORITY_NORMAL):
+    utterance = None
+    for sentence in sentences:
+        utterance = worker.say(sentence, priority=priority, follows=utterance)
+    return utterance
+
+def hold(worker: SpeechWorker):
+    """Keep the engine busy so the next utterances wait in the queue together"""
+    utterance = worker.say('Holding the engine for a moment.')
+    while not worker.speaking:
+        time.sleep(0.001)
+    return utterance
+
+def test_higher_priority_is_spoken_first():
+    worker, engine = silent_worker(0.005, merge_chars=0)
+    hold(worker)
+    low = worker.say('Low.', PRIORITY_LOW)
+    worker.say('Normal.', PRIORITY_NORMAL)
+    worker.say('Urgent.', PRIORITY_URGENT)
+    assert low.wait(timeout=10)
+    assert engine.spoken[1:] == ['Urgent.', 'Normal.', 'Low.']
+
+def test_barge_in_cuts_off_speech_and_drops_the_queue():
+    worker, engine = silent_worker(0.01)
+    held = hold(worker)
+    queued = worker.say('Queued behind it.')
+    interruption = worker.say('Stop.', barge_in=True)
+    assert interruption.wait(timeout=10)
+    assert not held.wait(timeout=10) and not queued.wait(timeout=10)
+    assert engine.spoken == ['Stop.']
+    assert worker.metrics()['cancelled'] == 2
+
+def test_short_utterances_of_one_priority_are_merged():
+    worker, engine = silent_worker(0.005, merge_chars=20)
+    hold(worker)
+    utterances = [worker.say(text) for text in ('One.', 'Two.', 'Three.', 'Four is too long.')]
+    utterances.append(worker.say('Later.', PRIORITY_LOW))
+    assert all(u.wait(timeout=10) for u in utterances)
+    assert engine.spoken[1:] == ['One. Two. Three.', 'Four is too long.', 'Later.']
+    assert worker.metrics()['merged'] == 2
+
+def test_long_reply_is_spoken_to_the_end():
+    worker, engine = silent_worker(0.0005, max_queue=4, merge_chars=0)
+    sentences = [f"Sentence number {i}." for i in range(40)]
+    assert say_reply(worker, sentences).wait(timeout=10)
+    assert engine.spoken == sentences
+    assert worker.metrics()['dropped'] == 0
+
+def test_queue_bound_drops_whole_replies():
+    worker, engine = silent_worker(0.01, max_queue=2, merge_chars=0)
+    hold(worker)
+    first = say_reply(worker, ['First reply.', 'Still first.'], PRIORITY_LOW)
+    second = say_reply(worker, ['Second reply.', 'Still second.'], PRIORITY_LOW)
+    assert say_reply(worker, ['Third reply.'], PRIORITY_LOW).dropped
+    
+    urgent = say_reply(worker, ['Reminder!', 'Call mom.'], PRIORITY_URGENT)
+    assert second.dropped and not first.dropped
+    assert worker.say('A late sentence.', PRIORITY_LOW, follows=second).dropped
+    assert first.wait(timeout=10) and urgent.wait(timeout=10)
+    assert engine.spoken[1:] == ['Reminder!', 'Call mom.', 'First reply.', 'Still first.']
\ No newline at end of file
@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Dict, Any, Optional, Set
+from config import Config
+
+class AgentRegistry:
+    """Track which Bhindi agents are registered in the current server session"""
+    
+    def __init__(self, ttl: float = None, retry_backoff: float = None):
+        self.ttl = Config.AGENT_REGISTRATION_TTL if ttl is None else ttl
+        self.retry_backoff = Config.AGENT_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self._agents: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def is_registered(self, agent_id: str) -> bool:
+        """Check whether an agent is registered and its registration is still fresh"""
+        with self._lock:
+            state = self._agents.get(agent_id)
+            return bool(state and state['registered'] and state['expires_at'] > time.time())
+    
+    def retry_after(self, agent_id: str) -> float:
+        """Seconds to wait before registering a recently failed agent again"""
+        with self._lock:
+            state = self._agents.get(agent_id)
+            if not state or state['registered']:
+                return 0.0
+            return max(0.0, state['retry_at'] - time.time())
+    
+    def record_success(self, agent_id: str):
+        """Mark an agent as registered until the server session would expire it"""
+        now = time.time()
+        with self._lock:
+            self._agents[agent_id] = {
+                'registered': True,
+                'expires_at': now + self.ttl,
+                'failures': 0,
+                'retry_at': now,
+                'error': None
+            }
+    
+    def record_failure(self, agent_id: str, error: str) -> float:
+        """Record a failed registration and return the backoff before the next attempt"""
+        now = time.time()
+        with self._lock:
+            state = self._agents.get(agent_id) or {'failures': 0}
+            failures = state['failures'] + 1
+            backoff = self.retry_backoff * (2 ** (failures - 1))
+            self._agents[agent_id] = {
+                'registered': False,
+                'expires_at': now,
+                'failures': failures,
+                'retry_at': now + backoff,
+                'error': error
+            }
+            return backoff
+    
+    def invalidate(self, agent_id: Optional[str] = None):
+        """Forget one registration, or all of them when the server session resets"""
+        with self._lock:
+            if agent_id is None:
+                self._agents.clear()
+            else:
+                self._agents.pop(agent_id, None)
+    
+    def registered(self) -> Set[str]:
+        """Get the agents with a fresh registration"""
+        now = time.time()
+        with self._lock:
+            return {
+                agent_id for agent_id, state in self._agents.items()
+                if state['registered'] and state['expires_at'] > now
+            }
+    
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get a snapshot of every tracked agent"""
+        with self._lock:
+            return {agent_id: dict(state) for agent_id, state in self._agents.items()}
\ No newline at end of file
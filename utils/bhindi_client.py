@@ -1,95 +1,704 @@
+import asyncio
+import contextvars
 import requests
 import json
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, List, Iterator, Callable, Set
 from config import Config
+from utils.agent_registry import AgentRegistry
+from utils.cache import ResponseCache, get_default_cache, make_cache_key
+from utils.singleflight import SingleFlight, AsyncSingleFlight
+from utils.resilience import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, LatencyTracker,
+    backoff_delay, call_timeout, remaining, within_deadline
+)
+
+_session_lock = threading.Lock()
+_shared_sessions: Dict[int, requests.Session] = {}
+
+def get_shared_session(pool_size: int = None) -> requests.Session:
+    """Get a process-wide keep-alive session with a pool of the given size"""
+    pool_size = pool_size or Config.HTTP_POOL_SIZE
+    with _session_lock:
+        session = _shared_sessions.get(pool_size)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _shared_sessions[pool_size] = session
+        return session
+
+def _endpoint_timeouts() -> Dict[str, float]:
+    """Read timeout per Bhindi endpoint"""
+    return {
+        'chat': Config.CHAT_TIMEOUT,
+        'agents/add': Config.AGENT_TIMEOUT,
+        'scheduler/create': Config.SCHEDULER_TIMEOUT,
+    }
+
+def _decode_stream_line(line: str) -> Optional[str]:
+    """Extract the text from one streamed line, or None at end of stream"""
+    if not line:
+        return ''
+    if line.startswith('data:'):
+        line = line[5:].strip()
+    elif line.startswith(('event:', 'id:', 'retry:', ':')):
+        return ''
+    if line == '[DONE]':
+        return None
+    
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return line
+    
+    if not isinstance(data, dict):
+        return str(data)
+    if data.get('done'):
+        return None
+    return data.get('delta') or data.get('content') or data.get('message') or ''
+
+def _cache_lookup(cache: Optional[ResponseCache], key: str, use_cache: bool) -> Optional[Dict[str, Any]]:
+    """Return a cached response when caching applies to this call"""
+    if cache is None or not use_cache:
+        return None
+    return cache.get(key)
+
+def _cache_store(cache: Optional[ResponseCache], key: str, result: Dict[str, Any], ttl: float, use_cache: bool):
+    """Cache a successful response when caching applies to this call"""
+    if cache is not None and use_cache and result.get('success', True):
+        cache.set(key, result, ttl)
+
+def _stale_lookup(cache: Optional[ResponseCache], key: str, use_cache: bool) -> Optional[Dict[str, Any]]:
+    """An expired cached response, marked stale, to answer with while Bhindi is failing"""
+    if cache is None or not use_cache:
+        return None
+    value = cache.get_stale(key)
+    return dict(value, stale=True) if value is not None else None
+
+def _is_transient(error: Exception, transport_errors: tuple) -> bool:
+    """Whether a failed call is worth retrying and counts against the circuit breaker"""
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    if isinstance(error, transport_errors):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status is not None and (status >= 500 or status == 429)
+
+def _record_failure(breaker: CircuitBreaker, error: BaseException, transport_errors: tuple, http_errors: tuple):
+    """Tell the breaker how a failed call ended
+    
+    Transient failures count against it and other HTTP errors show Bhindi
+    is reachable. Anything else, such as a cancelled task, leaves no verdict
+    but still frees the half-open probe slot.
+    """
+    if _is_transient(error, transport_errors):
+        breaker.record_failure()
+    elif isinstance(error, http_errors):
+        breaker.record_success()
+    else:
+        breaker.release()
+
+def _circuit_open(breaker: CircuitBreaker) -> CircuitOpenError:
+    return CircuitOpenError(f"Bhindi API is unavailable; trying again in {breaker.retry_after():.0f}s")
+
+_REQUESTS_TRANSPORT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+# Hedged chat requests run here so the caller can wait on whichever answers first
+_hedge_pool = ThreadPoolExecutor(max_workers=Config.HTTP_POOL_SIZE, thread_name_prefix='bhindi-hedge')
+# A losing request cannot be interrupted, so its thread and connection stay busy until it
+# ends; cap the extra requests in flight so hedging cannot tie up the pools under load
+_hedge_slots = threading.BoundedSemaphore(max(1, Config.HTTP_POOL_SIZE // 2))
 
 class BhindiClient:
-    """Wrapper for Bhindi API interactions"""
+    """Wrapper for Bhindi API interactions
+    
+    Every call is bounded by the current turn's deadline (see
+    utils.resilience.deadline) and refused while the circuit breaker is
+    open. Chat calls are retried with jittered backoff on transient
+    failures and, with HEDGE_CHAT, hedged with a second request once
+    they run past the HEDGE_PERCENTILE latency. When chat fails, an
+    expired cached answer is served if there is one. Identical searches
+    and agent registrations already in flight share one request.
+    """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 session: Optional[requests.Session] = None,
+                 cache: Optional[ResponseCache] = None,
+                 agents: Optional[AgentRegistry] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         self.api_key = api_key or Config.BHINDI_API_KEY
-        self.base_url = Config.BHINDI_BASE_URL
+        self.base_url = base_url or Config.BHINDI_BASE_URL
         self.headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
+        self.session = session or get_shared_session()
+        self.cache = cache if cache is not None else get_default_cache()
+        self.agents = agents or AgentRegistry()
+        self.breaker = breaker or CircuitBreaker(Config.BREAKER_FAILURES, Config.BREAKER_RESET)
+        self.latency = LatencyTracker()
+        self.timeouts = _endpoint_timeouts()
+        self.hedged = 0
+        self.flights = SingleFlight()
+    
+    def _post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST once to an endpoint over the pooled session and decode the JSON body"""
+        timeout = call_timeout(self.timeouts[endpoint])
+        if not self.breaker.allow():
+            raise _circuit_open(self.breaker)
+        
+        start = time.perf_counter()
+        try:
+            response = self.session.post(
+                f'{self.base_url}/{endpoint}',
+                headers=self.headers,
+                json=payload,
+                timeout=(min(Config.HTTP_CONNECT_TIMEOUT, timeout), timeout)
+            )
+            response.raise_for_status()
+        except BaseException as e:
+            _record_failure(self.breaker, e, _REQUESTS_TRANSPORT_ERRORS, (requests.exceptions.RequestException,))
+            raise
+        self.breaker.record_success()
+        if endpoint == 'chat':
+            self.latency.record(time.perf_counter() - start)
+        return response.json()
+    
+    def _post_hedged(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST, sending a second identical request if the first is slower than usual; first answer wins"""
+        delay = self.latency.percentile(Config.HEDGE_PERCENTILE)
+        if delay is None:
+            return self._post(endpoint, payload)
+        
+        # Copy the context so the turn's deadline applies on the pool threads too
+        first = _hedge_pool.submit(contextvars.copy_context().run, self._post, endpoint, payload)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        
+        if not _hedge_slots.acquire(blocking=False):
+            return first.result()
+        self.hedged += 1
+        second = _hedge_pool.submit(contextvars.copy_context().run, self._post, endpoint, payload)
+        second.add_done_callback(lambda _: _hedge_slots.release())
+        pending = {first, second}
+        try:
+            error = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    error = future.exception()
+            raise error
+        finally:
+            # Drops a loser still queued for a thread; a running one ends at its timeout or the turn deadline
+            for future in pending:
+                future.cancel()
     
-    def chat(self, message: str, context: List[Dict] = None) -> Dict[str, Any]:
+    def _request(self, endpoint: str, payload: Dict[str, Any], retries: int = 0, hedge: bool = False) -> Dict[str, Any]:
+        """POST with jittered retries on transient failures, optionally hedged"""
+        for attempt in range(retries + 1):
+            try:
+                return self._post_hedged(endpoint, payload) if hedge else self._post(endpoint, payload)
+            except requests.exceptions.RequestException as e:
+                if attempt == retries or not _is_transient(e, _REQUESTS_TRANSPORT_ERRORS):
+                    raise
+                time.sleep(backoff_delay(attempt, Config.RETRY_BACKOFF))
+    
+    def chat(self, message: str, context: List[Dict] = None, use_cache: bool = True) -> Dict[str, Any]:
         """Send a chat message to Bhindi"""
+        key = make_cache_key('chat', message, context)
+        cached = _cache_lookup(self.cache, key, use_cache)
+        if cached is not None:
+            return cached
+        
         try:
             payload = {
                 'message': message,
                 'context': context or []
             }
-            
-            response = requests.post(
-                f'{self.base_url}/chat',
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
+            result = self._request('chat', payload, retries=Config.RETRY_ATTEMPTS, hedge=Config.HEDGE_CHAT)
+            _cache_store(self.cache, key, result, Config.CACHE_TTL_CHAT, use_cache)
+            return result
         
         except requests.exceptions.RequestException as e:
+            stale = _stale_lookup(self.cache, key, use_cache)
+            if stale is not None:
+                return stale
             return {
                 'success': False,
                 'error': str(e),
                 'message': 'Failed to communicate with Bhindi API'
             }
     
-    def add_agent(self, agent_id: str) -> Dict[str, Any]:
-        """Add an agent to the current session"""
+    def chat_stream(self, message: str, context: List[Dict] = None, use_cache: bool = True) -> Iterator[str]:
+        """Send a chat message to Bhindi and yield the reply as it arrives
+        
+        Accepts server-sent events, newline-delimited JSON or a plain JSON
+        body. A cached reply is replayed as a single chunk, and a reply
+        streamed to the end is cached like chat() would. Transient failures
+        before the first chunk are retried, then answered from the stale
+        cache if possible; otherwise requests.exceptions.RequestException
+        is raised. Streams are not hedged.
+        """
+        key = make_cache_key('chat', message, context)
+        return self._cached_stream(key, Config.CACHE_TTL_CHAT, use_cache, lambda: self._chat_stream(message, context))
+    
+    def _cached_stream(self, key: str, ttl: float, use_cache: bool,
+                       open_stream: Callable[[], Iterator[str]], coalesce: bool = False) -> Iterator[str]:
+        """Replay a cached reply, or stream a fresh one under the request policy and cache it once complete
+        
+        With coalesce, callers asking while the same stream is in flight
+        wait for it and get its whole reply as one chunk.
+        """
+        cached = _cache_lookup(self.cache, key, use_cache)
+        if cached is not None:
+            yield cached.get('message', '')
+            return
+        if not coalesce:
+            yield from self._policy_stream(key, ttl, use_cache, open_stream)
+            return
+        
+        future, leader = self.flights.claim(key)
+        if not leader:
+            try:
+                shared = self.flights.wait(future)
+            except DeadlineExceeded:
+                raise
+            except Exception:
+                shared = None
+            if shared is None or not shared.get('success', True):
+                # The shared call failed or its reader stopped early; try our own
+                yield from self._policy_stream(key, ttl, use_cache, open_stream)
+                return
+            yield shared.get('message', '')
+            return
+        
+        reply = []
         try:
-            response = requests.post(
-                f'{self.base_url}/agents/add',
-                headers=self.headers,
-                json={'agentId': agent_id},
-                timeout=10
+            for chunk in self._policy_stream(key, ttl, use_cache, open_stream):
+                reply.append(chunk)
+                yield chunk
+        except Exception as e:
+            self.flights.settle(key, future, error=e)
+            raise
+        except BaseException:
+            # Closed early or interrupted: the reply is incomplete
+            self.flights.settle(key, future, error=requests.exceptions.RequestException('Shared stream was abandoned'))
+            raise
+        self.flights.settle(key, future, {'success': True, 'message': ''.join(reply)})
+    
+    def _policy_stream(self, key: str, ttl: float, use_cache: bool,
+                       open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Stream a reply with retries before the first chunk and a stale fallback"""
+        reply = []
+        for attempt in range(Config.RETRY_ATTEMPTS + 1):
+            try:
+                for chunk in open_stream():
+                    reply.append(chunk)
+                    yield chunk
+                break
+            except requests.exceptions.RequestException as e:
+                if reply:
+                    # Part of the answer is already out; it cannot be taken back
+                    raise
+                if attempt < Config.RETRY_ATTEMPTS and _is_transient(e, _REQUESTS_TRANSPORT_ERRORS):
+                    time.sleep(backoff_delay(attempt, Config.RETRY_BACKOFF))
+                    continue
+                stale = _stale_lookup(self.cache, key, use_cache)
+                if stale is None:
+                    raise
+                yield stale.get('message', '')
+                return
+        _cache_store(self.cache, key, {'success': True, 'message': ''.join(reply)}, ttl, use_cache)
+    
+    def _chat_stream(self, message: str, context: List[Dict] = None) -> Iterator[str]:
+        """Stream one chat request"""
+        payload = {
+            'message': message,
+            'context': context or [],
+            'stream': True
+        }
+        timeout = call_timeout(self.timeouts['chat'])
+        if not self.breaker.allow():
+            raise _circuit_open(self.breaker)
+        try:
+            response = self.session.post(
+                f'{self.base_url}/chat',
+                headers={**self.headers, 'Accept': 'text/event-stream'},
+                json=payload,
+                timeout=(min(Config.HTTP_CONNECT_TIMEOUT, timeout), timeout),
+                stream=True
             )
             response.raise_for_status()
-            return response.json()
+        except BaseException as e:
+            _record_failure(self.breaker, e, _REQUESTS_TRANSPORT_ERRORS, (requests.exceptions.RequestException,))
+            raise
+        self.breaker.record_success()
+        
+        with response:
+            
+            if 'text/event-stream' not in response.headers.get('Content-Type', '') \
+                    and 'ndjson' not in response.headers.get('Content-Type', ''):
+                # Server does not stream; hand back the whole reply at once
+                data = response.json()
+                if not data.get('success', True):
+                    raise requests.exceptions.RequestException(data.get('error', 'Chat failed'))
+                yield data.get('message', '')
+                return
+            
+            for line in response.iter_lines(decode_unicode=True):
+                chunk = _decode_stream_line(line)
+                if chunk is None:
+                    break
+                if chunk:
+                    yield chunk
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded('Turn deadline exceeded while streaming')
+    
+    def add_agent(self, agent_id: str) -> Dict[str, Any]:
+        """Add an agent to the current session"""
+        try:
+            return self.flights.do(f'agents/add:{agent_id}', lambda: self._post('agents/add', {'agentId': agent_id}))
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def create_schedule(self, content: str, cron: str, schedule_type: str = 'reminder') -> Dict[str, Any]:
+    def ensure_agent(self, agent_id: str) -> Dict[str, Any]:
+        """Add an agent unless it is already registered, retrying with backoff on failure"""
+        if self.agents.is_registered(agent_id):
+            return {'success': True, 'agentId': agent_id}
+        
+        wait = self.agents.retry_after(agent_id)
+        if wait > 0:
+            return {'success': False, 'error': f"Registration of {agent_id} is backing off for {wait:.1f}s"}
+        
+        for attempt in range(Config.AGENT_MAX_RETRIES + 1):
+            result = self.add_agent(agent_id)
+            if result.get('success') is not False:
+                self.agents.record_success(agent_id)
+                return result
+            
+            backoff = self.agents.record_failure(agent_id, result.get('error', 'Unknown error'))
+            if attempt == Config.AGENT_MAX_RETRIES or self.breaker.state != 'closed':
+                break
+            time.sleep(within_deadline(backoff))
+        
+        return result
+    
+    def create_schedule(self, content: str, cron: str, schedule_type: str = 'reminder',
+                        recurring: bool = False) -> Dict[str, Any]:
         """Create a schedule using Bhindi Scheduler"""
         try:
             payload = {
                 'content': content,
                 'cronExpression': cron,
                 'type': schedule_type,
-                'recurring': False
+                'recurring': recurring
             }
+            return self._post('scheduler/create', payload)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def search_web(self, query: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Search the web using Bhindi agents"""
+        key = make_cache_key('search', query)
+        cached = _cache_lookup(self.cache, key, use_cache)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Identical searches already in flight share one request
+            return self.flights.do(key, lambda: self._search_web(query, key, use_cache))
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def _search_web(self, query: str, key: str, use_cache: bool) -> Dict[str, Any]:
+        # First make sure perplexity is registered
+        self.ensure_agent('perplexity')
+        
+        # Then perform search
+        result = self.chat(f"Search for: {query}", use_cache=False)
+        if not result.get('success', True):
+            return _stale_lookup(self.cache, key, use_cache) or result
+        _cache_store(self.cache, key, result, Config.CACHE_TTL_SEARCH, use_cache)
+        return result
+    
+    def search_web_stream(self, query: str, use_cache: bool = True) -> Iterator[str]:
+        """Search the web using Bhindi agents, yielding the answer as it arrives"""
+        key = make_cache_key('search', query)
+        return self._cached_stream(key, Config.CACHE_TTL_SEARCH, use_cache, lambda: self._search_stream(query), coalesce=True)
+    
+    def _search_stream(self, query: str) -> Iterator[str]:
+        self.ensure_agent('perplexity')
+        yield from self._chat_stream(f"Search for: {query}")
+    
+    def execute_task(self, task: str, agent_id: str = None) -> Dict[str, Any]:
+        """Execute a task using appropriate Bhindi agent"""
+        try:
+            if agent_id:
+                self.ensure_agent(agent_id)
             
-            response = requests.post(
-                f'{self.base_url}/scheduler/create',
+            return self.chat(task, use_cache=False)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+async def _close_quietly(client: 'httpx.AsyncClient'):
+    try:
+        await client.aclose()
+    except Exception:
+        pass  # connections tied to a closed event loop cannot be shut down cleanly
+
+class AsyncBhindiClient:
+    """Asyncio wrapper for Bhindi API interactions
+    
+    httpx is imported on first request, since only the async paths need it
+    and importing it roughly doubles start-up time. Requests follow the
+    same deadline, retry, hedging and circuit breaker policy as
+    BhindiClient; a losing hedged request is cancelled. Identical
+    searches and agent registrations already in flight on the same event
+    loop share one request.
+    """
+    
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 cache: Optional[ResponseCache] = None,
+                 agents: Optional[AgentRegistry] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.api_key = api_key or Config.BHINDI_API_KEY
+        self.base_url = base_url or Config.BHINDI_BASE_URL
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+        self.cache = cache if cache is not None else get_default_cache()
+        self.agents = agents or AgentRegistry()
+        self.breaker = breaker or CircuitBreaker(Config.BREAKER_FAILURES, Config.BREAKER_RESET)
+        self.latency = LatencyTracker()
+        self.timeouts = _endpoint_timeouts()
+        self.hedged = 0
+        self.flights = AsyncSingleFlight()
+        self._client: Optional['httpx.AsyncClient'] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Future] = set()
+    
+    def _get_client(self) -> 'httpx.AsyncClient':
+        """Get the pooled client, recreating it when called from a new event loop"""
+        import httpx
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                self._discard_client(self._client, self._loop, loop)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
                 headers=self.headers,
+                limits=httpx.Limits(
+                    max_connections=Config.HTTP_POOL_SIZE,
+                    max_keepalive_connections=Config.HTTP_POOL_SIZE
+                )
+            )
+            self._loop = loop
+        return self._client
+    
+    def _discard_client(self, client: 'httpx.AsyncClient', old_loop: asyncio.AbstractEventLoop,
+                        loop: asyncio.AbstractEventLoop):
+        """Close a client left behind by another event loop, on that loop while it still runs"""
+        if old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), old_loop)
+            return
+        # Its loop is gone, so its connections are dead; closing still drops them from the pool
+        closing = loop.create_task(_close_quietly(client))
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+    
+    async def _post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST once to an endpoint over the pooled client and decode the JSON body"""
+        import httpx
+        timeout = call_timeout(self.timeouts[endpoint])
+        if not self.breaker.allow():
+            raise _circuit_open(self.breaker)
+        
+        start = time.perf_counter()
+        try:
+            response = await self._get_client().post(
+                f'/{endpoint}',
                 json=payload,
-                timeout=10
+                timeout=httpx.Timeout(timeout, connect=min(Config.HTTP_CONNECT_TIMEOUT, timeout))
             )
             response.raise_for_status()
+        except BaseException as e:
+            _record_failure(self.breaker, e, (httpx.TransportError,), (httpx.HTTPError,))
+            raise
+        self.breaker.record_success()
+        if endpoint == 'chat':
+            self.latency.record(time.perf_counter() - start)
+        try:
             return response.json()
+        except ValueError as e:
+            # Same family as the other HTTP failures, so callers report it instead of raising
+            raise httpx.DecodingError(f"Response from /{endpoint} is not JSON: {e}", request=response.request)
+    
+    async def _post_hedged(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST, sending a second identical request if the first is slower than usual; first answer wins"""
+        delay = self.latency.percentile(Config.HEDGE_PERCENTILE)
+        if delay is None:
+            return await self._post(endpoint, payload)
+        
+        pending = {asyncio.ensure_future(self._post(endpoint, payload))}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                self.hedged += 1
+                pending.add(asyncio.ensure_future(self._post(endpoint, payload)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _request(self, endpoint: str, payload: Dict[str, Any], retries: int = 0, hedge: bool = False) -> Dict[str, Any]:
+        """POST with jittered retries on transient failures, optionally hedged"""
+        import httpx
+        for attempt in range(retries + 1):
+            try:
+                return await (self._post_hedged(endpoint, payload) if hedge else self._post(endpoint, payload))
+            except (httpx.HTTPError, requests.exceptions.RequestException) as e:
+                if attempt == retries or not _is_transient(e, (httpx.TransportError,)):
+                    raise
+                await asyncio.sleep(backoff_delay(attempt, Config.RETRY_BACKOFF))
+    
+    async def chat(self, message: str, context: List[Dict] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Send a chat message to Bhindi"""
+        import httpx
+        key = make_cache_key('chat', message, context)
+        cached = _cache_lookup(self.cache, key, use_cache)
+        if cached is not None:
+            return cached
+        
+        try:
+            payload = {
+                'message': message,
+                'context': context or []
+            }
+            result = await self._request('chat', payload, retries=Config.RETRY_ATTEMPTS, hedge=Config.HEDGE_CHAT)
+            _cache_store(self.cache, key, result, Config.CACHE_TTL_CHAT, use_cache)
+            return result
+        
+        except (httpx.HTTPError, requests.exceptions.RequestException) as e:
+            stale = _stale_lookup(self.cache, key, use_cache)
+            if stale is not None:
+                return stale
+            return {
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to communicate with Bhindi API'
+            }
+    
+    async def add_agent(self, agent_id: str) -> Dict[str, Any]:
+        """Add an agent to the current session"""
+        try:
+            return await self.flights.do(f'agents/add:{agent_id}', lambda: self._post('agents/add', {'agentId': agent_id}))
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def search_web(self, query: str) -> Dict[str, Any]:
+    async def ensure_agent(self, agent_id: str) -> Dict[str, Any]:
+        """Add an agent unless it is already registered, retrying with backoff on failure"""
+        if self.agents.is_registered(agent_id):
+            return {'success': True, 'agentId': agent_id}
+        
+        wait = self.agents.retry_after(agent_id)
+        if wait > 0:
+            return {'success': False, 'error': f"Registration of {agent_id} is backing off for {wait:.1f}s"}
+        
+        for attempt in range(Config.AGENT_MAX_RETRIES + 1):
+            result = await self.add_agent(agent_id)
+            if result.get('success') is not False:
+                self.agents.record_success(agent_id)
+                return result
+            
+            backoff = self.agents.record_failure(agent_id, result.get('error', 'Unknown error'))
+            if attempt == Config.AGENT_MAX_RETRIES or self.breaker.state != 'closed':
+                break
+            await asyncio.sleep(within_deadline(backoff))
+        
+        return result
+    
+    async def ensure_agents(self, agent_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Ensure several agents concurrently, keyed by agent ID"""
+        results = await asyncio.gather(*(self.ensure_agent(agent_id) for agent_id in agent_ids))
+        return dict(zip(agent_ids, results))
+    
+    async def create_schedule(self, content: str, cron: str, schedule_type: str = 'reminder',
+                              recurring: bool = False) -> Dict[str, Any]:
+        """Create a schedule using Bhindi Scheduler"""
+        try:
+            payload = {
+                'content': content,
+                'cronExpression': cron,
+                'type': schedule_type,
+                'recurring': recurring
+            }
+            return await self._post('scheduler/create', payload)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    async def search_web(self, query: str, use_cache: bool = True) -> Dict[str, Any]:
         """Search the web using Bhindi agents"""
+        key = make_cache_key('search', query)
+        cached = _cache_lookup(self.cache, key, use_cache)
+        if cached is not None:
+            return cached
+        
         try:
-            # First add perplexity agent
-            self.add_agent('perplexity')
-            
-            # Then perform search
-            return self.chat(f"Search for: {query}")
+            # Identical searches already in flight share one request
+            return await self.flights.do(key, lambda: self._search_web(query, key, use_cache))
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def execute_task(self, task: str, agent_id: str = None) -> Dict[str, Any]:
+    async def _search_web(self, query: str, key: str, use_cache: bool) -> Dict[str, Any]:
+        # Register perplexity alongside the search itself
+        _, result = await asyncio.gather(
+            self.ensure_agent('perplexity'),
+            self.chat(f"Search for: {query}", use_cache=False)
+        )
+        if not result.get('success', True):
+            return _stale_lookup(self.cache, key, use_cache) or result
+        _cache_store(self.cache, key, result, Config.CACHE_TTL_SEARCH, use_cache)
+        return result
+    
+    async def execute_task(self, task: str, agent_id: str = None) -> Dict[str, Any]:
         """Execute a task using appropriate Bhindi agent"""
         try:
             if agent_id:
-                self.add_agent(agent_id)
+                _, result = await asyncio.gather(
+                    self.ensure_agent(agent_id),
+                    self.chat(task, use_cache=False)
+                )
+                return result
             
-            return self.chat(task)
+            return await self.chat(task, use_cache=False)
         except Exception as e:
-            return {'success': False, 'error': str(e)}
\ No newline at end of file
+            return {'success': False, 'error': str(e)}
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            if self._loop is asyncio.get_running_loop():
+                await self._client.aclose()
+            else:
+                await _close_quietly(self._client)
+            self._client = None
+            self._loop = None
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(closing for closing in self._closing if closing.get_loop() is loop))
\ No newline at end of file
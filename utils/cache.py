@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+from config import Config
+
+def make_cache_key(kind: str, message: str, context: List[Dict] = None) -> str:
+    """Build a cache key from a normalized message and a hash of its context"""
+    normalized = re.sub(r'\s+', ' ', message.strip().lower())
+    context_hash = hashlib.sha256(
+        json.dumps(context or [], sort_keys=True).encode('utf-8')
+    ).hexdigest()[:16]
+    return f"{kind}:{context_hash}:{normalized}"
+
+class ResponseCache:
+    """Base class for Bhindi response caches with hit/miss counters
+    
+    Expired entries are kept for a further stale_ttl seconds, so
+    get_stale() can still answer while Bhindi is unreachable.
+    """
+    
+    def __init__(self, max_entries: int = 512, stale_ttl: float = 0):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None if absent or expired"""
+        with self._lock:
+            value = self._get(key, time.time())
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+    
+    def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response even if expired, as long as it is within stale_ttl"""
+        with self._lock:
+            value = self._get(key, time.time(), stale=True)
+            if value is not None:
+                self.stale_hits += 1
+            return value
+    
+    def set(self, key: str, value: Dict[str, Any], ttl: float):
+        """Store a response for ttl seconds"""
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._set(key, value, time.time() + ttl)
+    
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'stale_hits': self.stale_hits,
+                'entries': len(self)
+            }
+    
+    def _get(self, key: str, now: float, stale: bool = False) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def _set(self, key: str, value: Dict[str, Any], expires_at: float):
+        raise NotImplementedError
+    
+    def _clear(self):
+        raise NotImplementedError
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+class MemoryCache(ResponseCache):
+    """In-process LRU cache with per-entry expiry"""
+    
+    def __init__(self, max_entries: int = 512, stale_ttl: float = 0):
+        super().__init__(max_entries, stale_ttl)
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+    
+    def _get(self, key: str, now: float, stale: bool = False) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at + self.stale_ttl <= now:
+            del self._entries[key]
+            return None
+        if expires_at <= now and not stale:
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def _set(self, key: str, value: Dict[str, Any], expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _clear(self):
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache(ResponseCache):
+    """On-disk LRU cache that survives restarts"""
+    
+    def __init__(self, path: str, max_entries: int = 512, stale_ttl: float = 0):
+        super().__init__(max_entries, stale_ttl)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time() - stale_ttl,))
+        self._conn.commit()
+    
+    def _get(self, key: str, now: float, stale: bool = False) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            'SELECT value, expires_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] + self.stale_ttl <= now:
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._conn.commit()
+            return None
+        if row[1] <= now and not stale:
+            return None
+        self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        self._conn.commit()
+        return json.loads(row[0])
+    
+    def _set(self, key: str, value: Dict[str, Any], expires_at: float):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+            (key, json.dumps(value), expires_at, time.time())
+        )
+        self._conn.execute(
+            'DELETE FROM responses WHERE key IN ('
+            'SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+        self._conn.commit()
+    
+    def _clear(self):
+        self._conn.execute('DELETE FROM responses')
+        self._conn.commit()
+    
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+def create_cache(backend: str = None) -> Optional[ResponseCache]:
+    """Create a response cache for the configured backend, or None if disabled"""
+    backend = (backend or Config.CACHE_BACKEND).lower()
+    if backend == 'memory':
+        return MemoryCache(Config.CACHE_MAX_ENTRIES, Config.CACHE_STALE_TTL)
+    if backend == 'sqlite':
+        return SQLiteCache(Config.CACHE_PATH, Config.CACHE_MAX_ENTRIES, Config.CACHE_STALE_TTL)
+    return None
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = create_cache()
+        return _default_cache
\ No newline at end of file
@@ -1,74 +1,193 @@
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from typing import Dict, Any, List, Tuple, Iterable, Optional
+from utils.time_parser import parse_schedule
 
-def parse_time_expression(text: str) -> Tuple[str, bool]:
+def parse_time_expression(text: str, now: Optional[datetime] = None) -> Tuple[str, bool]:
     """Parse natural language time expressions into cron format"""
-    text = text.lower()
-    now = datetime.now()
+    schedule = parse_schedule(text, now)
+    return schedule.cron, schedule.recurring
+
+INTENT_KEYWORDS = {
+    'schedule': ['remind', 'schedule', 'set alarm', 'wake me', 'meeting'],
+    'search': ['search', 'find', 'look up', 'what is', 'who is', 'google'],
+    'weather': ['weather', 'temperature', 'forecast'],
+    'time': ['time', 'date', 'what day'],
+    'task': ['do', 'execute', 'perform', 'run', 'create'],
+    'question': ['?', 'how', 'why', 'when', 'where', 'what', 'who'],
+}
+
+AGENT_KEYWORDS = {
+    'perplexity': ['search', 'find', 'look up', 'google'],
+    'bhindi-scheduler-v2': ['remind', 'schedule', 'alarm', 'meeting'],
+    'open-weather': ['weather', 'temperature', 'forecast'],
+    'google-gmail': ['email', 'send mail', 'gmail'],
+    'calculator': ['calculate', 'math', 'compute'],
+    'time': ['time', 'date', 'timezone'],
+}
+
+def _inflections(word: str) -> List[str]:
+    """Common inflected forms of a keyword ("remind" -> "reminder", "run" -> "running")"""
+    if not word.isalpha():
+        return [word]
+    if word.endswith('e'):
+        return [word, word + 's', word + 'd', word + 'r', word + 'rs', word[:-1] + 'ing']
+    forms = [word + suffix for suffix in ('', 's', 'es', 'ed', 'er', 'ers', 'ing')]
+    return forms + [word + word[-1] + suffix for suffix in ('ed', 'er', 'ing')]
+
+def _compile_classifier() -> Tuple[Dict[str, Tuple[frozenset, frozenset]], Dict[Tuple[str, str], Tuple[frozenset, frozenset]]]:
+    """Map every keyword form, and every two-word phrase, to the intents and agents it implies"""
+    labels: Dict[str, Tuple[set, set]] = {}
+    for intent, keywords in INTENT_KEYWORDS.items():
+        for keyword in keywords:
+            labels.setdefault(keyword, (set(), set()))[0].add(intent)
+    for agent, keywords in AGENT_KEYWORDS.items():
+        for keyword in keywords:
+            labels.setdefault(keyword, (set(), set()))[1].add(agent)
     
-    # Daily patterns
-    if 'every day' in text or 'daily' in text:
-        time_match = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm)?', text)
-        if time_match:
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2) or 0)
-            period = time_match.group(3)
-            
-            if period == 'pm' and hour != 12:
-                hour += 12
-            elif period == 'am' and hour == 12:
-                hour = 0
-            
-            return f"{minute} {hour} * * *", True
+    words: Dict[str, Tuple[set, set]] = {}
+    phrases: Dict[Tuple[str, str], Tuple[set, set]] = {}
+    for keyword, (intents, agents) in labels.items():
+        parts = keyword.split()
+        for form in _inflections(parts[-1]):
+            if len(parts) == 1:
+                entry = words.setdefault(form, (set(), set()))
+            else:
+                entry = phrases.setdefault((parts[0], form), (set(), set()))
+            entry[0].update(intents)
+            entry[1].update(agents)
     
-    # Hourly patterns
-    if 'every hour' in text or 'hourly' in text:
-        return "0 * * * *", True
+    freeze = lambda table: {key: (frozenset(i), frozenset(a)) for key, (i, a) in table.items()}
+    return freeze(words), freeze(phrases)
+
+_TOKEN_PATTERN = re.compile(r'\w+|\?')
+_WORD_LABELS, _PHRASE_LABELS = _compile_classifier()
+_PHRASE_HEADS = frozenset(head for head, _ in _PHRASE_LABELS)
+_INTENT_ORDER = list(INTENT_KEYWORDS)
+_AGENT_ORDER = list(AGENT_KEYWORDS)
+
+def classify_message(message: str) -> Dict[str, Any]:
+    """Detect intent and needed agents in a single pass over the message
     
-    # Specific time today/tomorrow
-    time_match = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm)?', text)
-    if time_match:
-        hour = int(time_match.group(1))
-        minute = int(time_match.group(2) or 0)
-        period = time_match.group(3)
-        
-        if period == 'pm' and hour != 12:
-            hour += 12
-        elif period == 'am' and hour == 12:
-            hour = 0
-        
-        target_time = now.replace(hour=hour, minute=minute, second=0)
-        
-        if 'tomorrow' in text:
-            target_time += timedelta(days=1)
-        elif target_time <= now:
-            target_time += timedelta(days=1)
-        
-        return f"{target_time.minute} {target_time.hour} {target_time.day} {target_time.month} *", False
+    Intents keep their priority order; confidence starts at 0.7 for one
+    keyword hit, gains 0.1 per extra hit on the chosen intent and loses 0.1
+    per competing intent, within 0.55-0.95. Messages with no hits are
+    'general' at 0.5.
+    """
+    tokens = _TOKEN_PATTERN.findall(message.lower())
+    intent_hits: Dict[str, int] = {}
+    agents = set()
+    last = len(tokens) - 1
     
-    # Default: 5 minutes from now
-    future_time = now + timedelta(minutes=5)
-    return f"{future_time.minute} {future_time.hour} {future_time.day} {future_time.month} *", False
-
-def detect_intent(message: str) -> Dict[str, any]:
-    """Detect user intent from message"""
-    message_lower = message.lower()
+    for i, token in enumerate(tokens):
+        found = _WORD_LABELS.get(token)
+        if token in _PHRASE_HEADS and i < last:
+            phrase = _PHRASE_LABELS.get((token, tokens[i + 1]))
+            if phrase:
+                found = (found[0] | phrase[0], found[1] | phrase[1]) if found else phrase
+        if found:
+            for intent in found[0]:
+                intent_hits[intent] = intent_hits.get(intent, 0) + 1
+            agents |= found[1]
     
-    intents = {
-        'schedule': ['remind', 'schedule', 'set alarm', 'wake me', 'meeting'],
-        'search': ['search', 'find', 'look up', 'what is', 'who is', 'google'],
-        'weather': ['weather', 'temperature', 'forecast'],
-        'time': ['time', 'date', 'what day'],
-        'task': ['do', 'execute', 'perform', 'run', 'create'],
-        'question': ['?', 'how', 'why', 'when', 'where', 'what', 'who'],
+    needed_agents = [agent for agent in _AGENT_ORDER if agent in agents]
+    if not intent_hits:
+        return {'intent': 'general', 'confidence': 0.5, 'agents': needed_agents}
+    
+    intent = next(i for i in _INTENT_ORDER if i in intent_hits)
+    confidence = 0.7 + 0.1 * (intent_hits[intent] - 1) - 0.1 * (len(intent_hits) - 1)
+    return {
+        'intent': intent,
+        'confidence': round(min(0.95, max(0.55, confidence)), 2),
+        'agents': needed_agents
     }
+
+def _classify_chunk(messages: List[str], parse_times: bool, now: Optional[datetime] = None) -> Tuple[List[str], List[float], List[List[str]], List[str], List[bool]]:
+    """Classify a list of messages into column lists"""
+    intents, confidences, agents, crons, recurring = [], [], [], [], []
+    for message in messages:
+        result = classify_message(message)
+        intents.append(result['intent'])
+        confidences.append(result['confidence'])
+        agents.append(result['agents'])
+        if parse_times:
+            try:
+                cron, is_recurring = parse_time_expression(message, now)
+            except ValueError:
+                cron, is_recurring = None, False
+            crons.append(cron)
+            recurring.append(is_recurring)
+    return intents, confidences, agents, crons, recurring
+
+def classify_batch(messages: Iterable[str], workers: int = 0, parse_times: bool = True,
+                   chunk_size: int = 50000, now: Optional[datetime] = None) -> 'pandas.DataFrame':
+    """Classify many messages at once into a DataFrame with one row per message
     
-    for intent, keywords in intents.items():
-        if any(keyword in message_lower for keyword in keywords):
-            return {'intent': intent, 'confidence': 0.8}
+    Columns are intent (categorical), confidence, one boolean ``agent_<id>``
+    column per agent and, with parse_times, cron and recurring resolved
+    against one reference time (default: now). Each distinct
+    message is classified once; with workers > 1 and more than chunk_size
+    distinct messages, chunks are spread over a process pool.
+    """
+    import numpy as np
+    import pandas as pd
     
-    return {'intent': 'general', 'confidence': 0.5}
+    now = now or datetime.now()
+    if not isinstance(messages, (list, np.ndarray, pd.Series)):
+        messages = list(messages)
+    codes, uniques = pd.factorize(pd.Series(messages, dtype=object).fillna('').astype(str))
+    uniques = list(uniques)
+    
+    if workers > 1 and len(uniques) > chunk_size:
+        chunks = [uniques[i:i + chunk_size] for i in range(0, len(uniques), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_classify_chunk, chunks, repeat(parse_times), repeat(now)))
+    else:
+        parts = [_classify_chunk(uniques, parse_times, now)]
+    
+    intents, confidences, agents, crons, recurring = ([x for part in parts for x in part[i]] for i in range(5))
+    
+    columns = {
+        'intent': pd.Categorical(np.array(intents, dtype=object)[codes], categories=_INTENT_ORDER + ['general']),
+        'confidence': np.array(confidences, dtype=np.float32)[codes],
+    }
+    for agent in _AGENT_ORDER:
+        flags = np.fromiter((agent in needed for needed in agents), dtype=bool, count=len(agents))
+        columns[f'agent_{agent}'] = flags[codes]
+    if parse_times:
+        columns['cron'] = np.array(crons, dtype=object)[codes]
+        columns['recurring'] = np.array(recurring, dtype=bool)[codes]
+    
+    return pd.DataFrame(columns, index=messages.index if isinstance(messages, pd.Series) else None)
+
+def detect_intent(message: str) -> Dict[str, Any]:
+    """Detect user intent from message"""
+    result = classify_message(message)
+    return {'intent': result['intent'], 'confidence': result['confidence']}
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token, plus per-message overhead)"""
+    return len(text) // 4 + 4
+
+def pop_sentences(text: str) -> Tuple[List[str], str]:
+    """Split complete sentences off the front of streamed text, returning them and the remainder"""
+    sentences = []
+    start = 0
+    for match in re.finditer(r'[.!?]+["\')\]]*\s+', text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, text[start:]
+
+def split_sentences(text: str) -> List[str]:
+    """Split finished text into sentences, keeping a trailing fragment as the last one"""
+    sentences, remainder = pop_sentences(text)
+    if remainder.strip():
+        sentences.append(remainder.strip())
+    return sentences
 
 def format_response(response: str, style: str = 'jarvis') -> str:
     """Format response in JARVIS style"""
@@ -90,20 +209,4 @@ def format_response(response: str, style: str = 'jarvis') -> str:
 
 def extract_agent_needed(message: str) -> List[str]:
     """Determine which Bhindi agents are needed for a task"""
-    message_lower = message.lower()
-    agents = []
-    
-    agent_keywords = {
-        'perplexity': ['search', 'find', 'look up', 'google'],
-        'bhindi-scheduler-v2': ['remind', 'schedule', 'alarm', 'meeting'],
-        'open-weather': ['weather', 'temperature', 'forecast'],
-        'google-gmail': ['email', 'send mail', 'gmail'],
-        'calculator': ['calculate', 'math', 'compute'],
-        'time': ['time', 'date', 'timezone'],
-    }
-    
-    for agent, keywords in agent_keywords.items():
-        if any(keyword in message_lower for keyword in keywords):
-            agents.append(agent)
-    
-    return agents
\ No newline at end of file
+    return classify_message(message)['agents']
\ No newline at end of file
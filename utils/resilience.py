@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Optional, Iterator
+import requests
+
+_deadline: ContextVar[Optional[float]] = ContextVar('bhindi_deadline', default=None)
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The turn ran out of time before (or while) calling Bhindi"""
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Bhindi has been failing; calls are refused until the breaker's reset timeout passes"""
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound every Bhindi call made inside the block (in this thread or task) to finish within seconds
+    
+    Nested deadlines keep the earlier one. seconds <= 0 means no deadline.
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+    current = _deadline.get()
+    token = _deadline.set(min(current, time.time() + seconds) if current else time.time() + seconds)
+    try:
+        yield
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # A generator finished in a different context than it started
+            _deadline.set(None if token.old_value is Token.MISSING else token.old_value)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.time()
+
+def call_timeout(timeout: float) -> float:
+    """Shorten a per-call timeout to the time left in the turn, raising DeadlineExceeded if there is none"""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded('Turn deadline exceeded')
+    return min(timeout, left)
+
+def within_deadline(delay: float) -> float:
+    """Shorten a sleep so it ends by the current deadline"""
+    left = remaining()
+    return delay if left is None else max(0.0, min(delay, left))
+
+def backoff_delay(attempt: int, base: float) -> float:
+    """Full-jitter exponential backoff: uniform between 0 and base * 2^attempt, within the deadline"""
+    return within_deadline(random.uniform(0, base * (2 ** attempt)))
+
+class LatencyTracker:
+    """Recent call latencies, for deciding when a request is slow enough to hedge"""
+    
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """The pct-th percentile in seconds, or None until min_samples have been seen"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class CircuitBreaker:
+    """Stop calling an upstream that keeps failing
+    
+    After failure_threshold consecutive failures the breaker opens and
+    allow() refuses calls for reset_timeout seconds. Then one probe call
+    is let through (half-open): success closes the breaker, failure
+    opens it again.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            return 'half_open' if time.time() - self.opened_at >= self.reset_timeout else 'open'
+    
+    def retry_after(self) -> float:
+        """Seconds until a probe call will be allowed"""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_timeout - time.time())
+    
+    def allow(self) -> bool:
+        """Whether a call may go ahead now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+    
+    def release(self):
+        """A call let through by allow() ended without success or failure (e.g. it was cancelled)"""
+        with self._lock:
+            self._probing = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+            self._probing = False
\ No newline at end of file
@@ -0,0 +1,99 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, Callable, Awaitable, Tuple, TypeVar
+from utils.resilience import DeadlineExceeded, remaining
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """Coalesce concurrent identical calls across threads
+    
+    The first caller for a key runs the call; callers arriving with the
+    same key while it is in flight wait for it and get the same result
+    (or exception). Waiters give up at their own turn deadline.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # calls answered by another caller's request
+    
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        future, leader = self.claim(key)
+        if not leader:
+            return self.wait(future)
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            self.settle(key, future, error=e)
+            raise
+        self.settle(key, future, result)
+        return result
+    
+    def claim(self, key: str) -> Tuple[Future, bool]:
+        """The call in flight for key, and whether this caller has to run it
+        
+        For calls that cannot be wrapped in one function, such as a reply
+        read chunk by chunk. The leader must settle() the future however
+        the call ends.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+    
+    def wait(self, future: Future) -> T:
+        try:
+            return future.result(timeout=remaining())
+        except FutureTimeout:
+            raise DeadlineExceeded('Turn deadline exceeded waiting for a shared call')
+    
+    def settle(self, key: str, future: Future, result: T = None, error: BaseException = None):
+        # Forget the call before publishing its result, so later callers start a fresh one
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+class AsyncSingleFlight:
+    """Coalesce concurrent identical calls on an event loop
+    
+    The call runs as its own task, so a caller that is cancelled or hits
+    its deadline does not cancel it for the others. Calls are only
+    shared between callers on the same loop.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.shared = 0  # calls answered by another caller's request
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(functools.partial(self._finish, key))
+        else:
+            self.shared += 1
+        
+        left = remaining()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), left)
+        except asyncio.TimeoutError:
+            if left is None:
+                raise
+            raise DeadlineExceeded('Turn deadline exceeded waiting for a shared call')
+    
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller gave up waiting
\ No newline at end of file
@@ -0,0 +1,287 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple, FrozenSet
+
+class Schedule(NamedTuple):
+    """A parsed time expression"""
+    cron: str
+    recurring: bool
+    next_run: datetime
+    kind: str  # 'relative', 'once', 'recurring' or 'default'
+
+class _TimeSpec(NamedTuple):
+    """Reference-independent result of parsing a phrase, safe to cache"""
+    kind: str
+    time: Optional[Tuple[int, int]] = None
+    seconds: int = 0
+    minute_interval: int = 0
+    hour_interval: int = 0
+    hour_range: Optional[Tuple[int, int]] = None
+    weekdays: Optional[FrozenSet[int]] = None
+    day_offset: Optional[int] = None
+    same_weekday: bool = False
+
+DEFAULT_TIME = (9, 0)
+DEFAULT_DELAY = timedelta(minutes=5)
+
+# Cron day-of-week numbers (Sunday = 0); "sat", "sun" and "wed" are
+# left out because they are ordinary words too
+WEEKDAYS = {
+    'sunday': 0,
+    'monday': 1, 'mon': 1,
+    'tuesday': 2, 'tue': 2, 'tues': 2,
+    'wednesday': 3,
+    'thursday': 4, 'thu': 4, 'thur': 4, 'thurs': 4,
+    'friday': 5, 'fri': 5,
+    'saturday': 6,
+}
+
+UNIT_SECONDS = {'minute': 60, 'min': 60, 'hour': 3600, 'hr': 3600, 'day': 86400, 'week': 604800}
+
+_CLOCK = r'(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?'
+_DAY = r'(' + '|'.join(sorted(WEEKDAYS, key=len, reverse=True)) + r')'
+
+_TIME_RE = re.compile(r'\b(at\s+)?' + _CLOCK + r'(?!\w)|\b(noon|midnight)\b')
+_TIME_RANGE_RE = re.compile(r'\b(?:from|between)\s+' + _CLOCK + r'\s*(?:to|and|until|till|-)\s*' + _CLOCK + r'(?!\w)')
+_RELATIVE_RE = re.compile(r'\bin\s+(\d+|an?|half an?)\s*(minute|min|hour|hr|day|week)s?\b')
+_EVERY_RE = re.compile(r'\bevery\s+(\d+\s*)?(minute|min|hour|hr)s?\b|\b(hourly)\b')
+_DAY_RANGE_RE = re.compile(r'\b' + _DAY + r's?\s*(?:to|through|thru|-)\s*' + _DAY + r's?\b')
+_DAY_RE = re.compile(r'\b' + _DAY + r'(s)?\b')
+_RECURRING_RE = re.compile(r'\b(?:every|each|daily|weekly|weekdays|weekends|nightly)\b')
+_WEEKDAY_SET_RE = re.compile(r'\b(weekdays?|weekends?)\b')
+
+def _to_24h(hour: int, minute: int, period: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Convert a clock reading to 24-hour form, or None if it is not a valid time"""
+    if period:
+        if not 1 <= hour <= 12:
+            return None
+        if period.startswith('p') and hour != 12:
+            hour += 12
+        elif period.startswith('a') and hour == 12:
+            hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+def _find_time(text: str) -> Optional[Tuple[int, int]]:
+    """Find a clock time; bare numbers only count after 'at' or with a colon or am/pm"""
+    for match in _TIME_RE.finditer(text):
+        if match.group(5):
+            return (12, 0) if match.group(5) == 'noon' else (0, 0)
+        at, hour, minute, period = match.group(1, 2, 3, 4)
+        if not (at or minute or period):
+            continue
+        parsed = _to_24h(int(hour), int(minute or 0), period)
+        if parsed:
+            return parsed
+    return None
+
+def _find_hour_range(text: str) -> Optional[Tuple[int, int]]:
+    """Find 'from 9am to 5pm' style hour ranges"""
+    match = _TIME_RANGE_RE.search(text)
+    if not match:
+        return None
+    start_hour, start_min, start_period, end_hour, end_min, end_period = match.groups()
+    end = _to_24h(int(end_hour), int(end_min or 0), end_period)
+    if start_period is None and end_period is not None:
+        # "from 9 to 5pm" means 9am; "from 1 to 5pm" means 1pm
+        start_period = end_period if int(start_hour) % 12 <= int(end_hour) % 12 else 'am'
+    start = _to_24h(int(start_hour), int(start_min or 0), start_period)
+    if not start or not end:
+        return None
+    return start[0], end[0]
+
+def _find_weekdays(text: str) -> Tuple[Optional[FrozenSet[int]], bool]:
+    """Find the days a phrase refers to, and whether a plural ('mondays') implies recurrence"""
+    match = _WEEKDAY_SET_RE.search(text)
+    if match:
+        days = frozenset(range(1, 6)) if match.group(1).startswith('weekday') else frozenset({0, 6})
+        return days, match.group(1).endswith('s')
+    
+    match = _DAY_RANGE_RE.search(text)
+    if match:
+        start, end = WEEKDAYS[match.group(1)], WEEKDAYS[match.group(2)]
+        days = range(start, end + 1) if start <= end else list(range(start, 7)) + list(range(0, end + 1))
+        return frozenset(days), True
+    
+    days = set()
+    plural = False
+    for match in _DAY_RE.finditer(text):
+        days.add(WEEKDAYS[match.group(1)])
+        plural = plural or bool(match.group(2))
+    return (frozenset(days) if days else None), plural
+
+@lru_cache(maxsize=4096)
+def _parse_spec(text: str) -> _TimeSpec:
+    """Parse a normalized phrase into a spec that does not depend on the current time"""
+    match = _RELATIVE_RE.search(text)
+    if match and 'every' not in text:
+        amount = match.group(1)
+        if amount.startswith('half'):
+            count = 0.5
+        elif amount in ('a', 'an'):
+            count = 1
+        else:
+            count = int(amount)
+        return _TimeSpec('relative', seconds=int(count * UNIT_SECONDS[match.group(2)]))
+    
+    time_of_day = _find_time(text)
+    hour_range = _find_hour_range(text)
+    weekdays, plural_days = _find_weekdays(text)
+    
+    match = _EVERY_RE.search(text)
+    if match:
+        count = int(match.group(1)) if match.group(1) else 1
+        hourly = bool(match.group(3)) or match.group(2) in ('hour', 'hr')
+        if not hourly and count >= 60 and count % 60 == 0:
+            # "every 120 minutes" is "every 2 hours"
+            count, hourly = count // 60, True
+        # A cron step only repeats evenly inside its field, so "*/90" would fire hourly
+        if hourly and not 0 < count < 24:
+            raise ValueError(f"Cannot repeat every {count} hours; use 1 to 23")
+        if not hourly and not 0 < count < 60:
+            raise ValueError(f"Cannot repeat every {count} minutes; use 1 to 59 or whole hours")
+        if hourly:
+            return _TimeSpec('recurring', hour_interval=count, hour_range=hour_range, weekdays=weekdays)
+        return _TimeSpec('recurring', minute_interval=count, hour_range=hour_range, weekdays=weekdays)
+    
+    if _RECURRING_RE.search(text) or plural_days:
+        return _TimeSpec(
+            'recurring',
+            time=time_of_day or DEFAULT_TIME,
+            weekdays=weekdays,
+            same_weekday=weekdays is None and ('weekly' in text or 'every week' in text)
+        )
+    
+    if 'tomorrow' in text:
+        return _TimeSpec('once', time=time_of_day or DEFAULT_TIME, day_offset=1)
+    if weekdays:
+        return _TimeSpec('once', time=time_of_day or DEFAULT_TIME, weekdays=weekdays)
+    if time_of_day:
+        return _TimeSpec('once', time=time_of_day)
+    if 'tonight' in text:
+        return _TimeSpec('once', time=(20, 0))
+    
+    return _TimeSpec('default')
+
+def _cron_days(weekdays: Optional[FrozenSet[int]]) -> str:
+    """Format a weekday set as a cron day-of-week field"""
+    if not weekdays:
+        return '*'
+    days = sorted(weekdays)
+    if len(days) > 2 and days == list(range(days[0], days[-1] + 1)):
+        return f"{days[0]}-{days[-1]}"
+    return ','.join(str(d) for d in days)
+
+def _one_shot(target: datetime, kind: str) -> Schedule:
+    return Schedule(f"{target.minute} {target.hour} {target.day} {target.month} *", False, target, kind)
+
+def parse_schedule(text: str, now: Optional[datetime] = None) -> Schedule:
+    """Parse a natural language time expression relative to a reference time
+    
+    Raises ValueError for a repeat interval cron cannot express, such as
+    "every 0 minutes" or "every 90 minutes".
+    """
+    now = (now or datetime.now()).replace(second=0, microsecond=0)
+    spec = _parse_spec(' '.join(text.lower().split()))
+    
+    if spec.kind == 'relative':
+        return _one_shot(now + timedelta(seconds=spec.seconds), spec.kind)
+    
+    if spec.kind == 'recurring':
+        weekdays = frozenset({(now.weekday() + 1) % 7}) if spec.same_weekday else spec.weekdays
+        hours = f"{spec.hour_range[0]}-{spec.hour_range[1]}" if spec.hour_range else '*'
+        if spec.minute_interval:
+            minutes = '*' if spec.minute_interval == 1 else f"*/{spec.minute_interval}"
+        elif spec.hour_interval:
+            minutes = '0'
+            if spec.hour_interval > 1:
+                hours = f"{hours}/{spec.hour_interval}" if spec.hour_range else f"*/{spec.hour_interval}"
+        else:
+            minutes, hours = str(spec.time[1]), str(spec.time[0])
+        cron = f"{minutes} {hours} * * {_cron_days(weekdays)}"
+        return Schedule(cron, True, next_cron_time(cron, now), spec.kind)
+    
+    if spec.kind == 'once':
+        target = now.replace(hour=spec.time[0], minute=spec.time[1])
+        if spec.day_offset:
+            target += timedelta(days=spec.day_offset)
+        elif spec.weekdays:
+            while (target.weekday() + 1) % 7 not in spec.weekdays or target <= now:
+                target += timedelta(days=1)
+        elif target <= now:
+            target += timedelta(days=1)
+        return _one_shot(target, spec.kind)
+    
+    return _one_shot(now + DEFAULT_DELAY, spec.kind)
+
+def _parse_cron_field(field: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/')
+            step = int(step_text)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(x) for x in part.split('-'))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+@lru_cache(maxsize=1024)
+def parse_cron(cron: str) -> Tuple[FrozenSet[int], FrozenSet[int], FrozenSet[int], FrozenSet[int], FrozenSet[int], bool, bool]:
+    """Expand a five-field cron string into value sets, plus whether day-of-month/week are restricted"""
+    fields = cron.split()
+    if len(fields) != 5:
+        raise ValueError(f"Expected 5 cron fields, got {len(fields)}: {cron!r}")
+    minute, hour, day, month, weekday = fields
+    weekdays = frozenset(d % 7 for d in _parse_cron_field(weekday, 0, 7 if weekday != '*' else 6))
+    return (
+        _parse_cron_field(minute, 0, 59),
+        _parse_cron_field(hour, 0, 23),
+        _parse_cron_field(day, 1, 31),
+        _parse_cron_field(month, 1, 12),
+        weekdays,
+        day != '*',
+        weekday != '*'
+    )
+
+def next_cron_time(cron: str, after: datetime) -> Optional[datetime]:
+    """First time strictly after `after` that matches a cron string, or None within five years"""
+    minutes, hours, days, months, weekdays, day_restricted, weekday_restricted = parse_cron(cron)
+    sorted_hours, sorted_minutes = sorted(hours), sorted(minutes)
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limit = after + timedelta(days=366 * 5)
+    
+    while t <= limit:
+        if t.month not in months:
+            t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            continue
+        day_ok = t.day in days
+        weekday_ok = (t.weekday() + 1) % 7 in weekdays
+        if day_restricted and weekday_restricted:
+            matches_day = day_ok or weekday_ok
+        else:
+            matches_day = day_ok and weekday_ok
+        if not matches_day:
+            t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            continue
+        if t.hour not in hours:
+            later = [h for h in sorted_hours if h > t.hour]
+            if not later:
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            t = t.replace(hour=later[0], minute=0)
+        if t.minute not in minutes:
+            later = [m for m in sorted_minutes if m > t.minute]
+            if not later:
+                t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+            t = t.replace(minute=later[0])
+        return t
+    return None
\ No newline at end of file
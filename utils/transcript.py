@@ -0,0 +1,85 @@
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+class Transcript:
+    """Chat messages for display, each rendered to HTML once
+    
+    Only the newest limit messages are kept in memory. Older history is
+    read back a page at a time through archive(before, count), which
+    returns stored messages created before a timestamp, newest first
+    (MemoryStore.get_messages has this shape). Without an archive,
+    messages past the limit are simply dropped from the display.
+    """
+    
+    def __init__(self, render: Callable[[Dict[str, Any]], str], limit: int = 200, page_size: int = 50,
+                 archive: Optional[Callable[[float, int], List[Dict[str, Any]]]] = None):
+        self.render = render
+        self.page_size = page_size
+        self.archive = archive
+        self._recent: deque = deque(maxlen=limit)
+        self._earlier: List[Tuple[Dict[str, Any], str]] = []
+        self._archive_exhausted = archive is None
+        self._before: Optional[float] = None
+        self.visible = page_size
+    
+    def __len__(self) -> int:
+        return len(self._recent)
+    
+    def append(self, message: Dict[str, Any]):
+        """Add a message and render it now; reruns reuse the HTML"""
+        if len(self._recent) == self._recent.maxlen and self._earlier:
+            # The oldest in-memory message is about to leave; drop fetched pages too so no gap opens
+            self._earlier = []
+            self._archive_exhausted = self.archive is None
+            self._before = None
+            self.visible = min(self.visible, self._recent.maxlen)
+        self._recent.append((message, self.render(message)))
+    
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+    
+    def clear(self):
+        self._recent.clear()
+        self._earlier = []
+        self._archive_exhausted = self.archive is None
+        self._before = None
+        self.visible = self.page_size
+    
+    def _fetch(self):
+        """Keep one page beyond what is visible loaded, so has_earlier is known without asking again"""
+        missing = self.visible + self.page_size - len(self._earlier) - len(self._recent)
+        if missing <= 0 or self._archive_exhausted:
+            return
+        if self._before is None:
+            self._before = self._recent[0][0]['timestamp'].timestamp() if self._recent else time.time()
+        rows = self.archive(self._before, missing)
+        self._archive_exhausted = len(rows) < missing
+        if rows:
+            # Page on the stored time itself; a datetime round trip can shift it by a microsecond
+            self._before = rows[-1]['created']
+        older = [
+            {'role': row['role'], 'content': row['content'], 'timestamp': datetime.fromtimestamp(row['created'])}
+            for row in reversed(rows)
+        ]
+        self._earlier = [(message, self.render(message)) for message in older] + self._earlier
+    
+    @property
+    def has_earlier(self) -> bool:
+        """Whether show_earlier() would reveal more"""
+        self._fetch()
+        return self.visible < len(self._earlier) + len(self._recent)
+    
+    def show_earlier(self):
+        """Reveal another page of older messages"""
+        self.visible += self.page_size
+        self._fetch()
+    
+    def html(self) -> str:
+        """HTML of the visible messages, oldest first"""
+        shown = list(self._recent)[-self.visible:]
+        if len(shown) < self.visible and self._earlier:
+            shown = self._earlier[-(self.visible - len(shown)):] + shown
+        return ''.join(html for _, html in shown)
\ No newline at end of file